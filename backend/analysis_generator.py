@@ -6,7 +6,10 @@ from typing import Any, Dict
 
 import boto3
 
-from ml.types import AnalysisResult
+from dynamo_batch_writer import BufferedBatchWriter
+from ml.game_context import GameContext
+from ml.models.base import BaseModel
+from ml.types import AnalysisResult, analysis_game_index
 from ml.model_factory import ModelFactory
 
 
@@ -158,6 +161,22 @@ def generate_game_analysis(sport: str, model, limit: int = None) -> int:
         count = 0
         games_to_process = list(games.items())[:limit] if limit else list(games.items())
 
+        # Load shared team/game facts once so models (and ensemble sub-models)
+        # don't each re-query the same Elo, fatigue and weather records
+        if isinstance(model, BaseModel):
+            context = GameContext(table)
+            model.set_context(context)
+            context.prefetch([
+                {
+                    "game_id": game_id,
+                    "sport": game_data["items"][0].get("sport", sport),
+                    "home_team": game_data["items"][0].get("home_team"),
+                    "away_team": game_data["items"][0].get("away_team"),
+                    "commence_time": game_data["items"][0].get("commence_time"),
+                }
+                for game_id, game_data in games_to_process
+            ])
+
         # Process games in parallel
         def process_game(game_item):
             game_id, game_data = game_item
@@ -198,11 +217,14 @@ def generate_game_analysis(sport: str, model, limit: int = None) -> int:
                     if bookmaker_item and "outcomes" in bookmaker_item:
                         analysis_dict["all_outcomes"] = bookmaker_item["outcomes"]
                     
-                    store_analysis(analysis_dict)
+                    store_analysis(analysis_dict, writer)
                     game_count += 1
             
             return game_count
 
+        # Analyses are buffered and written in batch_write_item chunks
+        writer = BufferedBatchWriter(table, metric_namespace="SportsAnalytics/AnalysisGenerator")
+
         # Use ThreadPoolExecutor for parallel processing
         error_count = 0
         with ThreadPoolExecutor(max_workers=10) as executor:
@@ -216,6 +238,12 @@ def generate_game_analysis(sport: str, model, limit: int = None) -> int:
                     import traceback
                     traceback.print_exc()
 
+        writer.flush()
+        writer.emit_metrics([
+            {"Name": "Sport", "Value": sport},
+            {"Name": "Model", "Value": model.__class__.__name__},
+        ])
+
         # Emit metric if we had errors
         if error_count > 0:
             try:
@@ -349,11 +377,14 @@ def generate_prop_analysis(sport: str, model, limit: int = None) -> int:
                     if "outcomes" in grouped_prop:
                         analysis_dict["all_outcomes"] = grouped_prop["outcomes"]
                     
-                    store_analysis(analysis_dict)
+                    store_analysis(analysis_dict, writer)
                     prop_count += 1
             
             return prop_count
 
+        # Analyses are buffered and written in batch_write_item chunks
+        writer = BufferedBatchWriter(table, metric_namespace="SportsAnalytics/AnalysisGenerator")
+
         # Use ThreadPoolExecutor for parallel processing
         error_count = 0
         with ThreadPoolExecutor(max_workers=10) as executor:
@@ -367,6 +398,12 @@ def generate_prop_analysis(sport: str, model, limit: int = None) -> int:
                     import traceback
                     traceback.print_exc()
 
+        writer.flush()
+        writer.emit_metrics([
+            {"Name": "Sport", "Value": sport},
+            {"Name": "Model", "Value": model.__class__.__name__},
+        ])
+
         # Emit metric if we had errors
         if error_count > 0:
             try:
@@ -397,14 +434,19 @@ def generate_prop_analysis(sport: str, model, limit: int = None) -> int:
         raise
 
 
-def store_analysis(analysis_item: Dict[str, Any]):
-    """Store analysis in DynamoDB with inverse prediction"""
+def store_analysis(analysis_item: Dict[str, Any], writer: BufferedBatchWriter = None):
+    """Store analysis in DynamoDB with inverse prediction.
+
+    With a writer, both items are queued for batched writes; otherwise they
+    are written immediately with put_item.
+    """
     try:
         # Convert floats to Decimals for DynamoDB
         analysis_item = float_to_decimal(analysis_item)
+        put = writer.put if writer else (lambda item: table.put_item(Item=item))
 
         # Store original prediction
-        table.put_item(Item=analysis_item)
+        put(analysis_item)
         print(
             f"Stored: {analysis_item['pk']} {analysis_item['sk']} - {analysis_item['prediction']}"
         )
@@ -412,7 +454,7 @@ def store_analysis(analysis_item: Dict[str, Any]):
         # Store inverse prediction
         inverse_item = create_inverse_prediction(analysis_item)
         if inverse_item:
-            table.put_item(Item=inverse_item)
+            put(inverse_item)
             print(
                 f"Stored inverse: {inverse_item['pk']} {inverse_item['sk']} - {inverse_item['prediction']}"
             )
@@ -482,6 +524,8 @@ def create_inverse_prediction(analysis_item: Dict[str, Any]) -> Dict[str, Any]:
         # Create inverse item with INVERSE suffix in SK
         inverse_item = analysis_item.copy()
         inverse_item["sk"] = analysis_item["sk"].replace("#LATEST", "#INVERSE")
+        if "game_index_pk" in analysis_item:
+            inverse_item.update(analysis_game_index(inverse_item))
         inverse_item["prediction"] = inverse_prediction
         inverse_item["confidence"] = Decimal(str(inverse_confidence))
         inverse_item["is_inverse"] = True
@@ -3,12 +3,19 @@ Games and odds API handler
 """
 
 import json
+import time
 from datetime import datetime, timedelta
 from typing import Any, Dict
 
 import boto3
 
 from api.utils import BaseAPIHandler, decimal_to_float
+from constants import CATALOG_KEY, SUPPORTED_BOOKMAKERS, SUPPORTED_SPORTS
+
+CATALOG_CACHE_SECONDS = 300
+
+# Catalog cached per Lambda container: {"expires_at": float, "item": dict}
+_catalog_cache = {}
 
 
 class GamesHandler(BaseAPIHandler):
@@ -200,29 +207,30 @@ class GamesHandler(BaseAPIHandler):
         except Exception as e:
             return self.error_response(f"Error fetching player props: {str(e)}", 500)
 
+    def _get_catalog(self) -> Dict[str, Any]:
+        """Read the sports/bookmakers catalog maintained by the odds collector"""
+        now = time.monotonic()
+        if _catalog_cache.get("expires_at", 0) > now:
+            return _catalog_cache["item"]
+
+        item = self.table.get_item(Key=CATALOG_KEY).get("Item") or {}
+        _catalog_cache["item"] = item
+        _catalog_cache["expires_at"] = now + CATALOG_CACHE_SECONDS
+        return item
+
     def get_sports(self) -> Dict[str, Any]:
         """Get list of available sports"""
         try:
-            response = self.table.scan(ProjectionExpression="sport")
-            sports = set()
-            for item in response.get("Items", []):
-                if "sport" in item:
-                    sports.add(item["sport"])
-
-            return self.success_response({"sports": sorted(list(sports)), "count": len(sports)})
+            sports = self._get_catalog().get("sports") or SUPPORTED_SPORTS
+            return self.success_response({"sports": sorted(sports), "count": len(sports)})
         except Exception as e:
             return self.error_response(f"Error fetching sports: {str(e)}", 500)
 
     def get_bookmakers(self) -> Dict[str, Any]:
         """Get list of available bookmakers"""
         try:
-            response = self.table.scan(ProjectionExpression="bookmaker")
-            bookmakers = set()
-            for item in response.get("Items", []):
-                if "bookmaker" in item:
-                    bookmakers.add(item["bookmaker"])
-
-            return self.success_response({"bookmakers": sorted(list(bookmakers))})
+            bookmakers = self._get_catalog().get("bookmakers") or SUPPORTED_BOOKMAKERS
+            return self.success_response({"bookmakers": sorted(bookmakers)})
         except Exception as e:
             return self.error_response(f"Error fetching bookmakers: {str(e)}", 500)
 
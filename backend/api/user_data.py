@@ -197,7 +197,7 @@ class UserDataHandler(BaseAPIHandler):
     def create_backtest(self, model_id: str, body: Dict[str, Any]) -> Dict[str, Any]:
         """Create a backtest for a user model"""
         try:
-            from backtest_engine import BacktestEngine
+            from backtest_engine import SWEEP_CONFIGURATIONS, BacktestEngine
 
             user_id = body.get("user_id")
             start_date = body.get("start_date")
@@ -211,7 +211,18 @@ class UserDataHandler(BaseAPIHandler):
                 return self.error_response("Model not found", 404)
 
             engine = BacktestEngine()
-            result = engine.run_backtest(user_id, model_id, model.to_dynamodb(), start_date, end_date)
+            if body.get("mode") == "sweep":
+                # Many weight/min_confidence configurations in one pass over the data
+                result = engine.run_weight_sweep(
+                    user_id,
+                    model_id,
+                    model.to_dynamodb(),
+                    start_date,
+                    end_date,
+                    configurations=int(body.get("configurations", SWEEP_CONFIGURATIONS)),
+                )
+            else:
+                result = engine.run_backtest(user_id, model_id, model.to_dynamodb(), start_date, end_date)
 
             return self.success_response(decimal_to_float(result))
         except Exception as e:
@@ -367,6 +378,8 @@ class UserDataHandler(BaseAPIHandler):
             s3 = boto3.client("s3", region_name="us-east-1")
             bucket = os.environ.get("CUSTOM_DATA_BUCKET", "dev-custom-data-bucket")
             s3.put_object(Bucket=bucket, Key=dataset.s3_key, Body=json.dumps(data).encode("utf-8"))
+            # Indexed form read by model evaluation (user_model_executor)
+            dataset.store_compiled(data)
 
             dataset.save()
 
@@ -12,6 +12,9 @@ from typing import Any, Dict, List, Optional
 import boto3
 from boto3.dynamodb.conditions import Key
 
+import weight_sweep
+from backtest_features import FeatureSnapshotStore
+from dao import iter_query
 from user_model_executor import (
     evaluate_head_to_head,
     evaluate_odds_movement,
@@ -26,6 +29,13 @@ user_models_table = dynamodb.Table(
     os.environ.get("USER_MODELS_TABLE", "Dev-UserModels-UserModels")
 )
 
+SWEEP_CONFIGURATIONS = 5000  # Weight vectors per sweep, each tried at every min_confidence
+FALLBACK_SWEEP_CONFIGURATIONS = 500  # Without NumPy
+MAX_SWEEP_CONFIGURATIONS = 20000
+MIN_RECOMMENDED_VOLUME = 20  # Fewer bets than this are too noisy to recommend
+HOLDOUT_FRACTION = 0.3  # Most recent games kept back to validate the recommendation
+MIN_HOLDOUT_VOLUME = 10
+
 
 class BacktestEngine:
     """Engine for backtesting user models against historical data"""
@@ -38,6 +48,7 @@ class BacktestEngine:
             "rest_schedule": evaluate_rest_schedule,
             "head_to_head": evaluate_head_to_head,
         }
+        self.snapshots = FeatureSnapshotStore(self.evaluators)
 
     def run_backtest(
         self,
@@ -55,10 +66,13 @@ class BacktestEngine:
             model_config["sport"], start_date, end_date
         )
 
+        # Scores as of each game's commence_time, built once and reused across backtests
+        features = self.snapshots.load(model_config["sport"], games)
+
         # Run model on each game
         predictions = []
         for game in games:
-            prediction = self._evaluate_game(game, model_config)
+            prediction = self._evaluate_game(game, model_config, features.get(game["game_id"]))
             if prediction:
                 predictions.append(prediction)
 
@@ -81,11 +95,164 @@ class BacktestEngine:
         self._store_backtest(result)
         return result
 
+    def run_weight_sweep(
+        self,
+        user_id: str,
+        model_id: str,
+        model_config: Dict[str, Any],
+        start_date: str,
+        end_date: str,
+        configurations: int = SWEEP_CONFIGURATIONS,
+        thresholds: Optional[List[float]] = None,
+        seed: Optional[int] = None,
+        store: bool = True,
+    ) -> Dict[str, Any]:
+        """
+        Backtest many weight and min_confidence configurations at once
+
+        Reads the games and their snapshot scores once, then scores the
+        model's current weights plus `configurations` random weightings of its
+        enabled sources at every min_confidence. The Pareto front of
+        accuracy, ROI and volume is found on the earlier games; the most
+        recent HOLDOUT_FRACTION are kept back to score the front and the
+        current configuration out of sample. The highest-ROI front point with
+        at least MIN_RECOMMENDED_VOLUME bets is recommended only if it also
+        beats the current configuration on the holdout games.
+        """
+        backtest_id = str(uuid.uuid4())
+        sport = model_config["sport"]
+        data_sources = model_config.get("data_sources", {})
+        sources = [
+            name for name, config in data_sources.items()
+            if config.get("enabled", False) and name in self.evaluators
+        ]
+        if not sources:
+            raise ValueError("Model has no enabled data sources to sweep")
+
+        games = self._fetch_historical_games(sport, start_date, end_date)
+        games.sort(key=lambda game: game.get("commence_time") or "")
+        features = self.snapshots.load(sport, games)
+        split = len(games) - int(len(games) * HOLDOUT_FRACTION)
+
+        def matrix(window):
+            scores, home_won, away_won = [], [], []
+            for game in window:
+                game_scores = features.get(game["game_id"], {})
+                winner = (game.get("outcome") or {}).get("winner")
+                scores.append([float(game_scores.get(name, 0.5)) for name in sources])
+                home_won.append(winner == game.get("home_team"))
+                away_won.append(winner == game.get("away_team"))
+            return scores, home_won, away_won
+
+        if not weight_sweep.HAS_NUMPY:
+            configurations = min(configurations, FALLBACK_SWEEP_CONFIGURATIONS)
+        configurations = max(1, min(configurations, MAX_SWEEP_CONFIGURATIONS))
+
+        current_weights = [float(data_sources[name].get("weight", 0)) for name in sources]
+        if sum(current_weights) <= 0:
+            current_weights = [1.0] * len(sources)
+        weights = [current_weights] + weight_sweep.random_weights(len(sources), configurations, seed)
+
+        current_confidence = float(model_config.get("min_confidence", 0.6))
+        thresholds = sorted(
+            set(thresholds or weight_sweep.MIN_CONFIDENCE_GRID) | {current_confidence}
+        )
+
+        def run(window, vectors):
+            if not window:
+                return {name: [] for name in weight_sweep.RESULT_COLUMNS}
+            return weight_sweep.sweep(*matrix(window), vectors, thresholds)
+
+        def metrics(results, row):
+            return {
+                "accuracy": round(results["accuracy"][row], 4),
+                "roi": round(results["roi"][row], 4),
+                "volume": int(results["volume"][row]),
+                "correct": int(results["correct"][row]),
+            }
+
+        # Choose on the earlier games
+        train = run(games[:split], weights)
+        front_rows = weight_sweep.pareto_front(train)
+        current_row = next(
+            (
+                row for row in range(len(train["config"]))
+                if train["config"][row] == 0 and train["min_confidence"][row] == current_confidence
+            ),
+            None,
+        )
+
+        # Score the front and the current configuration on the holdout games
+        picked = sorted({0} | {train["config"][row] for row in front_rows})
+        holdout = run(games[split:], [weights[config] for config in picked])
+        holdout_rows = {
+            (picked[holdout["config"][row]], holdout["min_confidence"][row]): row
+            for row in range(len(holdout["config"]))
+        }
+
+        def point(row: int) -> Dict[str, Any]:
+            config, confidence = train["config"][row], train["min_confidence"][row]
+            vector = weights[config]
+            total = sum(vector)
+            holdout_row = holdout_rows.get((config, confidence))
+            return {
+                "weights": {name: round(w / total, 4) for name, w in zip(sources, vector)},
+                "min_confidence": confidence,
+                **metrics(train, row),
+                "holdout": metrics(holdout, holdout_row) if holdout_row is not None else None,
+            }
+
+        front = [point(row) for row in front_rows]
+        current = point(current_row) if current_row is not None else None
+        current_holdout = (current or {}).get("holdout") or {}
+        candidates = [p for p in front if p["volume"] >= MIN_RECOMMENDED_VOLUME]
+        best = max(candidates, key=lambda p: (p["roi"], p["volume"])) if candidates else None
+        recommended = None
+        if (
+            best
+            and best["holdout"]
+            and best["holdout"]["volume"] >= MIN_HOLDOUT_VOLUME
+            and best["holdout"]["roi"] > current_holdout.get("roi", 0.0)
+        ):
+            recommended = best
+
+        result = {
+            "backtest_id": backtest_id,
+            "user_id": user_id,
+            "model_id": model_id,
+            "mode": "sweep",
+            "start_date": start_date,
+            "end_date": end_date,
+            "total_predictions": current["volume"] if current else 0,
+            "total_games": len(games),
+            "holdout_games": len(games) - split,
+            "sources": sources,
+            "configurations_evaluated": len(weights) * len(thresholds),
+            "engine": "numpy" if weight_sweep.HAS_NUMPY else "python",
+            "metrics": self._point_metrics(current),
+            "current": current,
+            "best": best,
+            "recommended": recommended,
+            "pareto_front": front,
+            "predictions": [],
+            "created_at": datetime.utcnow().isoformat(),
+        }
+        print(
+            f"Weight sweep for {model_id}: {result['configurations_evaluated']} configurations "
+            f"over {len(games)} games ({len(games) - split} held out), {len(front)} on the "
+            f"Pareto front, {'a' if recommended else 'no'} validated recommendation"
+        )
+
+        if store:
+            self._store_backtest(result)
+        return result
+
     def _fetch_historical_games(
         self, sport: str, start_date: str, end_date: str
     ) -> List[Dict[str, Any]]:
         """Fetch historical games with outcomes"""
-        response = bets_table.query(
+        items = iter_query(
+            bets_table,
             IndexName="AnalysisTimeGSI",
             KeyConditionExpression=Key("analysis_time_pk").eq(f"HISTORICAL#{sport}")
             & Key("commence_time").between(start_date, end_date),
@@ -93,7 +260,7 @@ class BacktestEngine:
 
         # Group by game_id
         games_dict = {}
-        for item in response.get("Items", []):
+        for item in items:
             game_id = item.get("game_id")
             if game_id not in games_dict:
                 games_dict[game_id] = {
@@ -115,9 +282,17 @@ class BacktestEngine:
         return [g for g in games_dict.values() if g["outcome"]]
 
     def _evaluate_game(
-        self, game: Dict[str, Any], model_config: Dict[str, Any]
+        self,
+        game: Dict[str, Any],
+        model_config: Dict[str, Any],
+        features: Optional[Dict[str, float]] = None,
     ) -> Optional[Dict[str, Any]]:
-        """Evaluate a single game using model config"""
+        """
+        Evaluate a single game using model config
+
+        `features` are the game's snapshot scores; without them the evaluators
+        run directly, still as of commence_time.
+        """
         try:
             scores = {}
             data_sources = model_config.get("data_sources", {})
@@ -131,7 +306,10 @@ class BacktestEngine:
                 if not evaluator:
                     continue
 
-                score = evaluator(game)
+                if features is not None and source_name in features:
+                    score = features[source_name]
+                else:
+                    score = evaluator({**game, "as_of": game.get("commence_time")})
                 weight = source_config.get("weight", 0)
                 scores[source_name] = score * weight
 
@@ -198,6 +376,17 @@ class BacktestEngine:
             "avg_confidence": round(avg_confidence, 4),
         }
 
+    def _point_metrics(self, point: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """_calculate_metrics-shaped summary of one sweep configuration"""
+        if not point:
+            return self._calculate_metrics([])
+        return {
+            "accuracy": point["accuracy"],
+            "total_predictions": point["volume"],
+            "correct_predictions": point["correct"],
+            "roi": point["roi"],
+        }
+
     def _store_backtest(self, result: Dict[str, Any]):
         """Store backtest results in DynamoDB"""
         from decimal import Decimal
@@ -226,6 +415,9 @@ class BacktestEngine:
             "predictions": convert_floats(result["predictions"]),
             "created_at": result["created_at"],
         }
+        for key in ("mode", "sources", "current", "best", "recommended", "pareto_front"):
+            if result.get(key) is not None:
+                item[key] = convert_floats(result[key])
 
         user_models_table.put_item(Item=item)
 
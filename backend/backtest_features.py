@@ -0,0 +1,153 @@
+"""
+Point-in-time feature snapshots for backtesting
+
+Materializes each historical game's data-source scores as of its commence_time
+so backtests evaluate in memory and never see data collected after kickoff.
+"""
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import boto3
+
+SNAPSHOT_DIR = os.environ.get("FEATURE_SNAPSHOT_DIR", "/tmp/feature_snapshots")
+SNAPSHOT_BUCKET = os.environ.get("FEATURE_SNAPSHOT_BUCKET")  # Optional shared copy in S3
+SNAPSHOT_VERSION = 1  # Bump when an evaluator changes so stale scores are rebuilt
+SNAPSHOT_WORKERS = 8
+
+
+class FeatureSnapshotStore:
+    """
+    Per-sport table of game_id -> {as_of, scores}, kept in /tmp and optionally S3.
+
+    A game's scores depend only on data from before its commence_time, so once
+    built they never change; later backtests only evaluate games not yet in
+    the table. Games where an evaluator failed (e.g. a throttled read) are
+    used for the current backtest but not saved, so they are rebuilt next time.
+
+    One store can be shared by concurrent backtests: loads for the same sport
+    take turns, so each game is built once and every build is saved.
+    """
+
+    def __init__(self, evaluators: Dict[str, Callable[[Dict], float]], bucket: Optional[str] = None):
+        self.evaluators = evaluators
+        self.bucket = bucket if bucket is not None else SNAPSHOT_BUCKET
+        self._tables: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._sport_locks: Dict[str, threading.Lock] = {}
+        self.built = 0
+
+    def load(self, sport: str, games: List[Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+        """Scores for every game, building and persisting any that are missing"""
+        games = [game for game in games if game.get("game_id")]
+        with self._sport_lock(sport):
+            return self._load(sport, games)
+
+    def _load(self, sport: str, games: List[Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+        table = self._table(sport)
+        missing = [
+            game for game in games
+            if self._entry_stale(table.get(game.get("game_id")), game)
+        ]
+
+        unsaved = {}
+        if missing:
+            with ThreadPoolExecutor(max_workers=SNAPSHOT_WORKERS) as executor:
+                for game, (scores, failed) in zip(missing, executor.map(self._score_game, missing)):
+                    if failed:
+                        unsaved[game["game_id"]] = scores
+                    else:
+                        table[game["game_id"]] = {"as_of": game.get("commence_time"), "scores": scores}
+            self.built += len(missing) - len(unsaved)
+            if len(unsaved) < len(missing):
+                self._save(sport, table)
+            print(
+                f"Built feature snapshots for {len(missing)}/{len(games)} {sport} games "
+                f"({len(unsaved)} with failed sources left unsaved)"
+            )
+
+        return {
+            game["game_id"]: unsaved[game["game_id"]] if game["game_id"] in unsaved
+            else table[game["game_id"]]["scores"]
+            for game in games
+        }
+
+    def _entry_stale(self, entry: Optional[Dict[str, Any]], game: Dict[str, Any]) -> bool:
+        return (
+            entry is None
+            or entry.get("as_of") != game.get("commence_time")
+            or set(entry.get("scores", {})) != set(self.evaluators)
+        )
+
+    def _score_game(self, game: Dict[str, Any]) -> Tuple[Dict[str, float], List[str]]:
+        """(scores, names of sources whose evaluation failed)"""
+        scores, failed = {}, []
+        for name, evaluator in self.evaluators.items():
+            # Evaluators report swallowed errors into `errors`
+            as_of_game = {**game, "as_of": game.get("commence_time"), "errors": []}
+            try:
+                scores[name] = float(evaluator(as_of_game))
+            except Exception as e:
+                print(f"Error scoring {name} for {game.get('game_id')}: {e}")
+                as_of_game["errors"].append(str(e))
+                scores[name] = 0.5
+            if as_of_game["errors"]:
+                failed.append(name)
+        return scores, failed
+
+    def _sport_lock(self, sport: str) -> threading.Lock:
+        with self._lock:
+            return self._sport_locks.setdefault(sport, threading.Lock())
+
+    def _table(self, sport: str) -> Dict[str, Any]:
+        with self._lock:
+            if sport not in self._tables:
+                self._tables[sport] = self._read(sport)
+            return self._tables[sport]
+
+    def _path(self, sport: str) -> str:
+        return os.path.join(SNAPSHOT_DIR, f"{sport}.v{SNAPSHOT_VERSION}.json")
+
+    def _s3_key(self, sport: str) -> str:
+        return f"feature-snapshots/{sport}.v{SNAPSHOT_VERSION}.json"
+
+    def _read(self, sport: str) -> Dict[str, Any]:
+        try:
+            with open(self._path(sport)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            pass
+        if not self.bucket:
+            return {}
+        try:
+            s3 = boto3.client("s3", region_name="us-east-1")
+            response = s3.get_object(Bucket=self.bucket, Key=self._s3_key(sport))
+            return json.loads(response["Body"].read().decode("utf-8"))
+        except Exception as e:
+            print(f"No feature snapshot for {sport} in S3: {e}")
+            return {}
+
+    def _save(self, sport: str, table: Dict[str, Any]):
+        body = json.dumps(table, separators=(",", ":"))
+        try:
+            os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+            partial = f"{self._path(sport)}.{threading.get_ident()}.tmp"
+            with open(partial, "w") as f:
+                f.write(body)
+            os.replace(partial, self._path(sport))
+        except OSError as e:
+            print(f"Error writing feature snapshot: {e}")
+        if not self.bucket:
+            return
+        try:
+            s3 = boto3.client("s3", region_name="us-east-1")
+            s3.put_object(
+                Bucket=self.bucket,
+                Key=self._s3_key(sport),
+                Body=body.encode("utf-8"),
+                ContentType="application/json",
+            )
+        except Exception as e:
+            print(f"Error uploading feature snapshot: {e}")
@@ -1,20 +1,22 @@
 """Coaching Agent — generates a periodic LLM coaching memo from performance data."""
 
-import json
 from datetime import datetime, timedelta
 from decimal import Decimal
 from typing import Any, Dict
 
 import boto3
-from boto3.dynamodb.conditions import Key
+
+from benny.llm_executor import LLMExecutor
+from benny.settled_bets import get_settled_bets
 
 bedrock = boto3.client("bedrock-runtime", region_name="us-east-1")
 
 
 class CoachingAgent:
-    def __init__(self, table, pk="BENNY"):
+    def __init__(self, table, pk="BENNY", llm: LLMExecutor = None):
         self.table = table
         self.pk = pk
+        self.llm = llm or LLMExecutor(bedrock)
 
     def generate_memo(self) -> str:
         """Gather all learning data, send to Claude, store memo. Returns memo text."""
@@ -59,18 +61,7 @@ class CoachingAgent:
     def _get_settled_bets(self, days=30) -> list:
         cutoff = (datetime.utcnow() - timedelta(days=days)).isoformat()
         try:
-            resp = self.table.query(
-                KeyConditionExpression=Key("pk").eq(self.pk)
-                & Key("sk").begins_with("BET#"),
-                FilterExpression="settled_at > :cutoff AND #s IN (:w, :l)",
-                ExpressionAttributeNames={"#s": "status"},
-                ExpressionAttributeValues={
-                    ":cutoff": cutoff,
-                    ":w": "won",
-                    ":l": "lost",
-                },
-            )
-            return resp.get("Items", [])
+            return get_settled_bets(self.table, self.pk).since("settled_at", cutoff).rows()
         except Exception:
             return []
 
@@ -165,7 +156,7 @@ class CoachingAgent:
             for b in high_conf_losses[:5]:
                 lines.append(
                     f"  {b.get('prediction', '?')} @ {float(b.get('confidence', 0)):.0%} "
-                    f"— {b.get('ai_reasoning', 'no reasoning')[:80]}"
+                    f"— {(b.get('ai_reasoning') or 'no reasoning')[:80]}"
                 )
 
         # Winning examples with reasoning
@@ -175,14 +166,14 @@ class CoachingAgent:
             for b in recent_wins:
                 lines.append(
                     f"  {b.get('prediction', '?')} @ {float(b.get('confidence', 0)):.0%} "
-                    f"— {b.get('ai_reasoning', '')[:80]}"
+                    f"— {(b.get('ai_reasoning') or '')[:80]}"
                 )
 
         # Factor analysis
         factor_perf = {}
         for b in bets:
             won = b.get("status") == "won"
-            for f in b.get("ai_key_factors", []):
+            for f in b.get("ai_key_factors") or []:
                 factor_perf.setdefault(f, {"w": 0, "t": 0})
                 factor_perf[f]["t"] += 1
                 if won:
@@ -336,18 +327,7 @@ Tone: encouraging but honest. Benny should finish reading this and feel confiden
 
     def _call_llm(self, prompt: str) -> str:
         try:
-            resp = bedrock.invoke_model(
-                modelId="us.anthropic.claude-sonnet-4-5-20250929-v1:0",
-                body=json.dumps(
-                    {
-                        "anthropic_version": "bedrock-2023-05-31",
-                        "max_tokens": 1100,
-                        "messages": [{"role": "user", "content": prompt}],
-                    }
-                ),
-            )
-            result = json.loads(resp["body"].read())
-            return result["content"][0]["text"]
+            return self.llm.invoke(prompt, 1100)
         except Exception as e:
             print(f"[COACH] LLM error: {e}")
             return ""
@@ -0,0 +1,88 @@
+"""Content-addressed cache of parsed LLM responses, keyed on the prompt hash"""
+import hashlib
+import json
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+
+class LLMResponseCache:
+    """
+    Stores parsed Bedrock answers under LLM_CACHE#{sha256(model, max_tokens, prompt)}.
+
+    A prompt only hashes the same when every input rendered into it (odds,
+    injuries, form, bankroll) is unchanged, so a hit is safe to reuse. Entries
+    expire shortly after the game starts; a local dict avoids repeat reads
+    within one run.
+    """
+
+    GRACE_PERIOD = timedelta(hours=1)
+
+    def __init__(self, table):
+        self.table = table
+        self._local: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(prompt: str, model_id: str, max_tokens: int) -> str:
+        canonical = json.dumps(
+            {"model_id": model_id, "max_tokens": max_tokens, "prompt": prompt.strip()},
+            sort_keys=True,
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            if key in self._local:
+                self.hits += 1
+                return self._local[key]
+
+        result = None
+        try:
+            response = self.table.get_item(Key={"pk": f"LLM_CACHE#{key}", "sk": "RESPONSE"})
+            item = response.get("Item")
+            if item and item.get("expires_at", "") > datetime.now(timezone.utc).isoformat():
+                result = json.loads(item["result"])
+        except Exception as e:
+            print(f"LLM cache read failed: {e}")
+            result = None
+
+        with self._lock:
+            if result is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._local[key] = result
+        return result
+
+    def put(self, key: str, result: Dict, commence_time: Optional[str]):
+        """Store a parsed result until GRACE_PERIOD after commence_time"""
+        with self._lock:
+            self._local[key] = result
+
+        expires = self._expiry(commence_time)
+        try:
+            self.table.put_item(
+                Item={
+                    "pk": f"LLM_CACHE#{key}",
+                    "sk": "RESPONSE",
+                    "result": json.dumps(result, default=str),
+                    "expires_at": expires.isoformat(),
+                    "ttl": int(expires.timestamp()),
+                    "created_at": datetime.now(timezone.utc).isoformat(),
+                }
+            )
+        except Exception as e:
+            print(f"LLM cache write failed: {e}")
+
+    def _expiry(self, commence_time: Optional[str]) -> datetime:
+        try:
+            start = datetime.fromisoformat(commence_time.replace("Z", "+00:00"))
+            if not start.tzinfo:
+                start = start.replace(tzinfo=timezone.utc)
+        except Exception:
+            start = datetime.now(timezone.utc) + timedelta(hours=6)
+        return start + self.GRACE_PERIOD
@@ -0,0 +1,165 @@
+"""Shared Bedrock executor: bounded concurrency, rate limiting and throttling retries"""
+import io
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Optional
+
+DEFAULT_MODEL_ID = "us.anthropic.claude-sonnet-4-5-20250929-v1:0"
+
+RETRYABLE_ERRORS = {
+    "ThrottlingException",
+    "TooManyRequestsException",
+    "ServiceUnavailableException",
+    "ModelNotReadyException",
+    "ServiceQuotaExceededException",
+}
+
+
+class TokenBucket:
+    """Allow `rate` acquisitions per second with bursts up to `capacity`"""
+
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class StubBedrockClient:
+    """Local stand-in for bedrock-runtime that answers after a fixed latency"""
+
+    def __init__(self, response_text: str = '{"prediction": "skip", "confidence": 0.5, '
+                 '"reasoning": "stub", "key_factors": []}', latency: float = 0.0):
+        self.response_text = response_text
+        self.latency = latency
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def invoke_model(self, modelId: str, body: str):
+        with self._lock:
+            self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        payload = json.dumps({"content": [{"type": "text", "text": self.response_text}]})
+        return {"body": io.BytesIO(payload.encode())}
+
+
+def _error_code(error: Exception) -> Optional[str]:
+    response = getattr(error, "response", None)
+    if isinstance(response, dict):
+        return response.get("Error", {}).get("Code")
+    return None
+
+
+class LLMExecutor:
+    """
+    Runs Bedrock prompts with a concurrency limit, a token-bucket rate limit and
+    jittered exponential backoff on throttling. Benny, PositionManager and
+    CoachingAgent share one executor so their calls respect a single budget.
+    """
+
+    def __init__(
+        self,
+        client=None,
+        max_concurrency: int = None,
+        requests_per_second: float = None,
+        max_retries: int = 4,
+        base_delay: float = 1.0,
+        max_delay: float = 20.0,
+    ):
+        # The stub backend replaces whatever client the caller built, so it
+        # can be switched on for deployed and local runs alike
+        if os.environ.get("BENNY_LLM_BACKEND") == "stub":
+            client = StubBedrockClient()
+        elif client is None:
+            import boto3
+
+            client = boto3.client("bedrock-runtime", region_name="us-east-1")
+        self.client = client
+        self.max_concurrency = max_concurrency or int(os.environ.get("BENNY_LLM_CONCURRENCY", "4"))
+        rate = requests_per_second or float(os.environ.get("BENNY_LLM_RPS", "2"))
+        self.bucket = TokenBucket(rate, capacity=self.max_concurrency)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._slots = threading.BoundedSemaphore(self.max_concurrency)
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        self.stats = {"calls": 0, "retries": 0, "failures": 0, "seconds": 0.0}
+        self._stats_lock = threading.Lock()
+
+    def _count(self, key: str, amount=1):
+        with self._stats_lock:
+            self.stats[key] += amount
+
+    def invoke(self, prompt: str, max_tokens: int, model_id: str = DEFAULT_MODEL_ID) -> str:
+        """Send one prompt and return the text of the first content block"""
+        body = json.dumps({
+            "anthropic_version": "bedrock-2023-05-31",
+            "max_tokens": max_tokens,
+            "messages": [{"role": "user", "content": prompt}],
+        })
+
+        attempt = 0
+        while True:
+            self.bucket.acquire()
+            start = time.perf_counter()
+            try:
+                with self._slots:
+                    response = self.client.invoke_model(modelId=model_id, body=body)
+                    result = json.loads(response["body"].read())
+                self._count("calls")
+                self._count("seconds", time.perf_counter() - start)
+                return result["content"][0]["text"]
+            except Exception as e:
+                if _error_code(e) not in RETRYABLE_ERRORS or attempt >= self.max_retries:
+                    self._count("failures")
+                    raise
+                delay = min(self.max_delay, self.base_delay * (2 ** attempt))
+                delay = random.uniform(delay / 2, delay)
+                attempt += 1
+                self._count("retries")
+                print(f"Bedrock throttled ({_error_code(e)}), retry {attempt} in {delay:.1f}s")
+                time.sleep(delay)
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        """Run fn (which may call invoke) on the executor's worker pool"""
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_concurrency)
+        return self._pool.submit(fn, *args, **kwargs)
+
+    def map_prompts(self, prompts: List[str], max_tokens: int, model_id: str = DEFAULT_MODEL_ID) -> List[Optional[str]]:
+        """Invoke many prompts concurrently; failed prompts come back as None"""
+        futures = [self.submit(self.invoke, prompt, max_tokens, model_id) for prompt in prompts]
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                print(f"LLM call failed: {e}")
+                results.append(None)
+        return results
+
+    def shutdown(self):
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True)
+                self._pool = None
@@ -13,9 +13,8 @@ from datetime import datetime, timedelta
 from decimal import Decimal
 from typing import Dict, Any
 
-from boto3.dynamodb.conditions import Key
-
 from benny.models.base import BennyModelBase
+from benny.settled_bets import get_settled_bets
 from benny.variance_tracker import VarianceTracker
 
 
@@ -241,24 +240,16 @@ JSON only:
         self._roi_cache = {}
         try:
             cutoff = (datetime.utcnow() - timedelta(days=60)).isoformat()
-            response = self.table.query(
-                KeyConditionExpression=Key("pk").eq(self.pk)
-                & Key("sk").begins_with("BET#"),
-                FilterExpression="settled_at > :cutoff AND #s IN (:w, :l)",
-                ExpressionAttributeNames={"#s": "status"},
-                ExpressionAttributeValues={
-                    ":cutoff": cutoff,
-                    ":w": "won",
-                    ":l": "lost",
-                },
-            )
-            for b in response.get("Items", []):
-                key = f"{b.get('sport', '?')}|{b.get('market_key', '?')}"
+            recent = get_settled_bets(self.table, self.pk).since("settled_at", cutoff)
+            for sport, market, amount, profit in zip(
+                recent["sport"], recent["market_key"], recent["bet_amount"], recent["profit"]
+            ):
+                key = f"{sport or '?'}|{market or '?'}"
                 if key not in self._roi_cache:
                     self._roi_cache[key] = {"total": 0, "wagered": 0.0, "profit": 0.0}
                 self._roi_cache[key]["total"] += 1
-                self._roi_cache[key]["wagered"] += float(b.get("bet_amount", 0))
-                self._roi_cache[key]["profit"] += float(b.get("profit", 0))
+                self._roi_cache[key]["wagered"] += amount
+                self._roi_cache[key]["profit"] += profit
 
             for key, data in self._roi_cache.items():
                 data["roi"] = (
@@ -278,18 +269,10 @@ JSON only:
     def _build_calibration_table(self) -> dict:
         """Build confidence → actual win rate from settled bets."""
         try:
-            response = self.table.query(
-                KeyConditionExpression=Key("pk").eq(self.pk)
-                & Key("sk").begins_with("BET#"),
-                FilterExpression="#s IN (:w, :l)",
-                ExpressionAttributeNames={"#s": "status"},
-                ExpressionAttributeValues={":w": "won", ":l": "lost"},
-                ProjectionExpression="confidence, #s",
-            )
+            settled = get_settled_bets(self.table, self.pk)
             buckets = {}
-            for b in response.get("Items", []):
-                conf = round(float(b.get("confidence", 0)), 1)
-                won = b.get("status") == "won"
+            for confidence, won in zip(settled["confidence"], settled.won):
+                conf = round(confidence, 1)
                 if conf not in buckets:
                     buckets[conf] = {"wins": 0, "total": 0}
                 buckets[conf]["total"] += 1
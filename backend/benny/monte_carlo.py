@@ -0,0 +1,125 @@
+"""Bankroll-path Monte Carlo engine used by VarianceTracker"""
+import random
+from typing import Dict, List, Optional
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy ships in the Lambda bundle
+    np = None
+
+HAS_NUMPY = np is not None
+PERCENTILES = (5, 25, 50, 75, 95)
+PATH_STATS = ("final_profit", "max_drawdown", "ruined", "bets_under_water", "longest_under_water")
+
+
+def simulate_paths(
+    stakes: List[float],
+    win_multipliers: List[float],
+    win_rate: float,
+    num_bets: int,
+    simulations: int,
+    bankroll: float,
+    seed: Optional[int] = None,
+    chunk_paths: int = 5_000,
+) -> Dict[str, List[float]]:
+    """
+    Simulate `simulations` bankroll paths of `num_bets` bets each.
+
+    Every simulated bet draws a win with probability `win_rate`, a stake
+    resampled from the actual stakes and, when it wins, a payout multiplier
+    (payout / stake) resampled from the actual winning bets. Returns one value
+    per path for final profit, max drawdown, whether the bankroll hit zero,
+    bets spent below the running peak and the longest such stretch.
+
+    Uses NumPy in chunks of `chunk_paths` paths when available, otherwise a
+    pure-Python loop with the same statistics.
+    """
+    engine = _simulate_numpy if HAS_NUMPY else _simulate_python
+    return engine(stakes, win_multipliers, win_rate, num_bets, simulations, bankroll, seed, chunk_paths)
+
+
+def percentiles(values, points=PERCENTILES) -> Dict[str, float]:
+    """Nearest-rank percentiles keyed p5, p25, ..."""
+    ordered = np.sort(values) if HAS_NUMPY else sorted(values)
+    n = len(ordered)
+    return {f"p{p}": float(ordered[min(int(n * p / 100), n - 1)]) for p in points}
+
+
+def share_at_most(values, threshold: float) -> float:
+    """Fraction of values <= threshold"""
+    if HAS_NUMPY:
+        return float((np.asarray(values) <= threshold).mean())
+    return sum(1 for v in values if v <= threshold) / len(values)
+
+
+def share_true(values) -> float:
+    """Fraction of truthy values"""
+    if HAS_NUMPY:
+        return float(np.asarray(values, dtype=bool).mean())
+    return sum(1 for v in values if v) / len(values)
+
+
+def _simulate_numpy(stakes, win_multipliers, win_rate, num_bets, simulations, bankroll, seed, chunk_paths):
+    rng = np.random.default_rng(seed)
+    stakes = np.asarray(stakes, dtype=np.float64)
+    multipliers = np.asarray(win_multipliers or [1.9], dtype=np.float64)
+    steps = np.arange(1, num_bets + 1)
+
+    results = {name: [] for name in PATH_STATS}
+    for start in range(0, simulations, chunk_paths):
+        size = min(chunk_paths, simulations - start)
+
+        wins = rng.random((size, num_bets)) < win_rate
+        stake = stakes[rng.integers(0, len(stakes), (size, num_bets))]
+        multiplier = multipliers[rng.integers(0, len(multipliers), (size, num_bets))]
+        profit = np.where(wins, stake * (multiplier - 1), -stake)
+
+        equity = bankroll + np.cumsum(profit, axis=1)
+        peak = np.maximum(np.maximum.accumulate(equity, axis=1), bankroll)
+        under_water = equity < peak
+
+        # Index of the most recent bet at a new peak (0 = the starting bankroll)
+        last_peak = np.maximum.accumulate(np.where(under_water, 0, steps), axis=1)
+
+        results["final_profit"].append(equity[:, -1] - bankroll)
+        results["max_drawdown"].append((peak - equity).max(axis=1))
+        results["ruined"].append((equity <= 0).any(axis=1))
+        results["bets_under_water"].append(under_water.sum(axis=1))
+        results["longest_under_water"].append((steps - last_peak).max(axis=1))
+
+    return {name: np.concatenate(chunks) for name, chunks in results.items()}
+
+
+def _simulate_python(stakes, win_multipliers, win_rate, num_bets, simulations, bankroll, seed, chunk_paths):
+    rng = random.Random(seed)
+    multipliers = win_multipliers or [1.9]
+
+    results = {name: [] for name in PATH_STATS}
+    for _ in range(simulations):
+        equity = peak = bankroll
+        max_drawdown = 0.0
+        ruined = False
+        under = longest = streak = 0
+        for _ in range(num_bets):
+            stake = rng.choice(stakes)
+            if rng.random() < win_rate:
+                equity += stake * (rng.choice(multipliers) - 1)
+            else:
+                equity -= stake
+            if equity >= peak:
+                peak = equity
+                streak = 0
+            else:
+                under += 1
+                streak += 1
+                longest = max(longest, streak)
+                max_drawdown = max(max_drawdown, peak - equity)
+            ruined = ruined or equity <= 0
+
+        results["final_profit"].append(equity - bankroll)
+        results["max_drawdown"].append(max_drawdown)
+        results["ruined"].append(ruined)
+        results["bets_under_water"].append(under)
+        results["longest_under_water"].append(longest)
+
+    return results
@@ -2,6 +2,7 @@
 from typing import Dict, Any, List
 from collections import defaultdict
 from boto3.dynamodb.conditions import Key
+from benny.settled_bets import get_settled_bets
 from benny.threshold_optimizer import _to_decimal
 
 
@@ -15,14 +16,8 @@ class OutcomeAnalyzer:
     def analyze_features(self) -> Dict[str, Any]:
         """Analyze feature correlations with wins"""
         # Get all settled bets with features
-        response = self.table.query(
-            KeyConditionExpression=Key("pk").eq(self.pk) & Key("sk").begins_with("BET#"),
-            FilterExpression="attribute_exists(features) AND #status IN (:won, :lost)",
-            ExpressionAttributeNames={"#status": "status"},
-            ExpressionAttributeValues={":won": "won", ":lost": "lost"}
-        )
-        
-        bets = response.get("Items", [])
+        settled = get_settled_bets(self.table, self.pk)
+        bets = settled.filter([f is not None for f in settled["features"]]).rows()
         
         if len(bets) < 10:
             return {"error": "Insufficient data", "bet_count": len(bets)}
@@ -1,8 +1,7 @@
-"""Parlay engine: builds 2-3 leg parlays from uncorrelated prop opportunities."""
+"""Parlay engine: builds 2-4 leg parlays from uncorrelated prop opportunities."""
 
 from decimal import Decimal
-from itertools import combinations
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 
 class ParlayEngine:
@@ -11,45 +10,89 @@ class ParlayEngine:
     MIN_LEG_CONFIDENCE = 0.70
     KELLY_FRACTION = Decimal("0.10")  # More conservative than singles (0.25)
     MAX_BET_PERCENTAGE = Decimal("0.10")  # Cap at 10% of bankroll per parlay
+    MAX_SEARCH_NODES = 200_000  # Per parlay; the best combo found so far is used past this
+
+    def __init__(self, max_legs: int = None):
+        self.max_legs = max_legs or self.MAX_LEGS
+        self.nodes_searched = 0
 
     def build_parlays(
         self, opportunities: List[Dict[str, Any]], max_parlays: int = 3
     ) -> List[Dict[str, Any]]:
-        """Build uncorrelated parlays from prop opportunities."""
+        """
+        Build uncorrelated parlays from prop opportunities.
+
+        Larger parlays are built first. Each one is the unused, non-conflicting
+        combination with the highest combined EV, found by a depth-first
+        branch-and-bound over legs sorted by EV factor (confidence x decimal
+        odds), so most of the combination space is never visited.
+        """
         # Filter to high-confidence legs only
         legs = [
             o
             for o in opportunities
             if o.get("confidence", 0) >= self.MIN_LEG_CONFIDENCE
         ]
-        legs.sort(key=lambda x: x["confidence"], reverse=True)
+        factors = [
+            leg["confidence"] * self._american_to_decimal(float(leg.get("odds", -110)))
+            for leg in legs
+        ]
+        order = sorted(range(len(legs)), key=lambda i: factors[i], reverse=True)
 
         parlays = []
         used_legs = set()  # Track indices of legs already in a parlay
+        self.nodes_searched = 0
 
-        for size in range(self.MAX_LEGS, self.MIN_LEGS - 1, -1):
-            for combo in combinations(range(len(legs)), size):
-                if len(parlays) >= max_parlays:
-                    return parlays
-                if any(i in used_legs for i in combo):
-                    continue
-                selected = [legs[i] for i in combo]
-                if not self._legs_uncorrelated(selected):
-                    continue
-
-                parlay = self._build_parlay(selected)
-                parlays.append(parlay)
+        for size in range(self.max_legs, self.MIN_LEGS - 1, -1):
+            while len(parlays) < max_parlays:
+                available = [i for i in order if i not in used_legs]
+                combo = self._best_combo(legs, factors, available, size)
+                if not combo:
+                    break
+                parlays.append(self._build_parlay([legs[i] for i in combo]))
                 used_legs.update(combo)
 
         return parlays
 
-    def _legs_uncorrelated(self, legs: List[Dict[str, Any]]) -> bool:
-        """Check that no two legs share a game or player."""
-        game_ids = [l["game_id"] for l in legs]
-        players = [l.get("player") for l in legs]
-        # Filter out None/empty players before checking duplicates
-        named = [p for p in players if p]
-        return len(set(game_ids)) == len(legs) and len(named) == len(set(named))
+    def _best_combo(
+        self, legs: List[Dict[str, Any]], factors: List[float], available: List[int], size: int
+    ) -> Optional[List[int]]:
+        """Highest-EV `size`-leg combination from `available` (sorted by factor, descending)"""
+        if len({legs[i]["game_id"] for i in available}) < size:
+            return None
+
+        best = {"product": 0.0, "combo": None}
+        nodes = 0
+
+        def search(start, chosen, product, games, players):
+            nonlocal nodes
+            if len(chosen) == size:
+                if product > best["product"]:
+                    best["product"], best["combo"] = product, list(chosen)
+                return
+            slots = size - len(chosen)
+            for pos in range(start, len(available) - slots + 1):
+                nodes += 1
+                if nodes > self.MAX_SEARCH_NODES:
+                    return
+                # Factors only shrink from here, so this bounds every completion
+                bound = product
+                for i in available[pos:pos + slots]:
+                    bound *= factors[i]
+                if bound <= best["product"]:
+                    return
+
+                i = available[pos]
+                game, player = legs[i]["game_id"], legs[i].get("player")
+                if game in games or (player and player in players):
+                    continue
+                chosen.append(i)
+                search(pos + 1, chosen, product * factors[i], games | {game}, (players | {player}) if player else players)
+                chosen.pop()
+
+        search(0, [], 1.0, frozenset(), frozenset())
+        self.nodes_searched += nodes
+        return best["combo"]
 
     def _build_parlay(self, legs: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Combine legs into a parlay with combined odds and probability."""
@@ -7,13 +7,16 @@ import os
 import boto3
 from boto3.dynamodb.conditions import Key
 
+from benny.llm_executor import LLMExecutor
+
 
 class PositionManager:
     """Manages existing bet positions - cash-out and double-down logic"""
     
-    def __init__(self, table, bedrock_client):
+    def __init__(self, table, bedrock_client, llm: Optional[LLMExecutor] = None):
         self.table = table
         self.bedrock = bedrock_client
+        self.llm = llm or LLMExecutor(bedrock_client)
         self.sqs = boto3.client('sqs')
         self.notification_queue_url = os.environ.get('NOTIFICATION_QUEUE_URL')
     
@@ -331,17 +334,7 @@ Reasoning: {bet.get('ai_reasoning')}
 Has anything changed? Respond with JSON:
 {{"confidence": 0.70, "reasoning": "Brief update"}}"""
 
-            response = self.bedrock.invoke_model(
-                modelId="us.anthropic.claude-sonnet-4-5-20250929-v1:0",
-                body=json.dumps({
-                    "anthropic_version": "bedrock-2023-05-31",
-                    "max_tokens": 200,
-                    "messages": [{"role": "user", "content": prompt}]
-                })
-            )
-            
-            result = json.loads(response["body"].read())
-            content = result["content"][0]["text"]
+            content = self.llm.invoke(prompt, 200)
             
             if "```json" in content:
                 content = content.split("```json")[1].split("```")[0].strip()
@@ -0,0 +1,167 @@
+"""Shared columnar snapshot of a Benny version's settled bets"""
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+from boto3.dynamodb.conditions import Key
+
+from dao import ReadStats, iter_query
+
+REFRESH_SECONDS = 300
+STALE_PENDING_DAYS = 14  # Pending bets older than this no longer hold back the refresh floor
+
+SETTLED_STATUSES = ("won", "lost")
+NUMERIC_COLUMNS = ("confidence", "bet_amount", "payout", "profit", "odds")
+TEXT_COLUMNS = (
+    "sk", "status", "sport", "market_key", "bet_type", "game_id",
+    "prediction", "placed_at", "settled_at", "ai_reasoning",
+)
+OBJECT_COLUMNS = ("features", "ai_key_factors")
+COLUMNS = TEXT_COLUMNS + NUMERIC_COLUMNS + OBJECT_COLUMNS
+
+
+class SettledBets:
+    """
+    Column lists for settled (won/lost) bets.
+
+    Numeric columns are converted from Decimal to float once when a bet is
+    added, so aggregations work on plain lists instead of re-parsing items.
+    """
+
+    def __init__(self, columns: Optional[Dict[str, list]] = None):
+        self.columns = columns or {name: [] for name in COLUMNS}
+        self._index = {sk: i for i, sk in enumerate(self.columns["sk"])}
+
+    @classmethod
+    def from_items(cls, items: Iterable[Dict[str, Any]]) -> "SettledBets":
+        bets = cls()
+        bets.upsert(items)
+        return bets
+
+    def __len__(self) -> int:
+        return len(self.columns["sk"])
+
+    def __getitem__(self, name: str) -> list:
+        return self.columns[name]
+
+    @property
+    def won(self) -> List[bool]:
+        return [status == "won" for status in self.columns["status"]]
+
+    def upsert(self, items: Iterable[Dict[str, Any]]) -> int:
+        """Add settled items, replacing any already held with the same sk"""
+        added = 0
+        for item in items:
+            if item.get("status") not in SETTLED_STATUSES:
+                continue
+            row = {name: item.get(name) for name in TEXT_COLUMNS + OBJECT_COLUMNS}
+            for name in NUMERIC_COLUMNS:
+                row[name] = float(item.get(name) or 0)
+
+            position = self._index.get(row["sk"]) if row["sk"] else None
+            if position is None:
+                if row["sk"]:
+                    self._index[row["sk"]] = len(self)
+                for name in COLUMNS:
+                    self.columns[name].append(row[name])
+                added += 1
+            else:
+                for name in COLUMNS:
+                    self.columns[name][position] = row[name]
+        return added
+
+    def filter(self, mask: List[bool]) -> "SettledBets":
+        return SettledBets({
+            name: [v for v, keep in zip(values, mask) if keep]
+            for name, values in self.columns.items()
+        })
+
+    def since(self, column: str, cutoff: str) -> "SettledBets":
+        """Bets whose ISO timestamp `column` is after `cutoff`"""
+        return self.filter([(value or "") > cutoff for value in self.columns[column]])
+
+    def group_by(self, column: str) -> Dict[Any, "SettledBets"]:
+        masks: Dict[Any, List[bool]] = {}
+        for i, value in enumerate(self.columns[column]):
+            masks.setdefault(value, [False] * len(self))[i] = True
+        return {value: self.filter(mask) for value, mask in masks.items()}
+
+    def total(self, column: str) -> float:
+        return sum(self.columns[column])
+
+    def rows(self) -> List[Dict[str, Any]]:
+        """Dict-per-bet view for code written against raw items"""
+        names = list(self.columns)
+        return [dict(zip(names, values)) for values in zip(*self.columns.values())]
+
+
+class SettledBetStore:
+    """
+    Keeps a SettledBets snapshot for one pk current with incremental reads.
+
+    Bets only change while pending, and sks start with the placement time, so
+    each refresh queries from the oldest still-pending sk (the floor) rather
+    than the whole BET# history.
+    """
+
+    def __init__(self, table, pk: str):
+        self.table = table
+        self.pk = pk
+        self.bets = SettledBets()
+        self.floor: Optional[str] = None
+        self.loaded_at = 0.0
+        self.stats = ReadStats()
+        self._lock = threading.Lock()
+
+    def load(self, max_age: float = REFRESH_SECONDS) -> SettledBets:
+        with self._lock:
+            if self.floor is None or time.monotonic() - self.loaded_at >= max_age:
+                self._refresh()
+            return self.bets
+
+    def _refresh(self):
+        if self.floor is None:
+            condition = Key("pk").eq(self.pk) & Key("sk").begins_with("BET#")
+        else:
+            # "$" sorts right after "#", so this stays within the BET# prefix
+            condition = Key("pk").eq(self.pk) & Key("sk").between(self.floor, "BET$")
+
+        stale = f"BET#{(datetime.utcnow() - timedelta(days=STALE_PENDING_DAYS)).isoformat()}"
+        self.stats = ReadStats()
+        items = list(iter_query(
+            self.table, attributes=list(COLUMNS), stats=self.stats, KeyConditionExpression=condition
+        ))
+        added = self.bets.upsert(items)
+
+        pending = [
+            item["sk"] for item in items
+            if item.get("status") == "pending" and item.get("sk", "") >= stale
+        ]
+        newest = max((item.get("sk", "") for item in items), default="")
+        self.floor = min(pending) if pending else max(newest, self.floor or "BET#")
+        self.loaded_at = time.monotonic()
+        print(
+            f"[{self.pk}] Settled-bet snapshot: {len(self.bets)} bets "
+            f"(+{added}, read {len(items)} items in {self.stats.pages} pages)"
+        )
+
+
+# (id(table), pk) -> store; the store holds the table, so the id can't be reused
+_stores: Dict[tuple, SettledBetStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_settled_bets(table, pk: str, max_age: float = REFRESH_SECONDS) -> SettledBets:
+    """Settled bets for `pk`, shared by every learning component in the process"""
+    key = (id(table), pk)
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = _stores[key] = SettledBetStore(table, pk)
+    return store.load(max_age)
+
+
+def clear_settled_bets():
+    with _stores_lock:
+        _stores.clear()
@@ -1,8 +1,20 @@
 """Dynamic threshold optimizer - finds optimal betting thresholds"""
 import json
+import random
+from bisect import bisect_right
 from decimal import Decimal
 from typing import Dict, Any, List, Tuple
-from boto3.dynamodb.conditions import Key
+
+from benny.settled_bets import get_settled_bets
+
+CONFIDENCE_GRID = [round(0.50 + 0.01 * i, 2) for i in range(46)]  # 0.50 .. 0.95
+EV_GRID = [round(0.005 * i, 3) for i in range(41)]  # 0.000 .. 0.200
+MIN_BETS_PER_CELL = 5
+MIN_BETS_PER_SLICE = 10
+BOOTSTRAP_SAMPLES = 100
+
+_ROWS = len(CONFIDENCE_GRID) + 1
+_COLS = len(EV_GRID) + 1
 
 
 def _to_decimal(obj):
@@ -18,102 +30,197 @@ def _to_decimal(obj):
     return obj
 
 
+def _interval(values: List[float]) -> List[float]:
+    """5th-95th percentile range"""
+    ordered = sorted(values)
+    return [ordered[int(len(ordered) * 0.05)], ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)]]
+
+
+def expected_value(confidence: float, odds: float) -> float:
+    """EV per unit staked, as Benny computes it when placing (-110 when odds are unknown)"""
+    if not odds or -100 < odds < 100:
+        odds = -110
+    payout_multiplier = 1 + (odds / 100 if odds > 0 else 100 / abs(odds))
+    return confidence * payout_multiplier - 1
+
+
+def _cell(confidence: float, ev: float) -> int:
+    """Histogram cell: how many confidence and EV thresholds the bet clears"""
+    row = bisect_right(CONFIDENCE_GRID, round(confidence, 6))
+    col = bisect_right(EV_GRID, round(ev, 6))
+    return row * _COLS + col
+
+
+def _suffix_sums(hist: List[float]) -> List[float]:
+    """2D suffix sums: out[r][c] = sum of hist[r':][c':]"""
+    out = list(hist)
+    for r in range(_ROWS - 1, -1, -1):
+        base = r * _COLS
+        running = 0.0
+        for c in range(_COLS - 1, -1, -1):
+            running += hist[base + c]
+            out[base + c] = running + (out[base + _COLS + c] if r + 1 < _ROWS else 0)
+    return out
+
+
+class _Slice:
+    """Count/wins/wagered/profit histograms over the threshold grid"""
+
+    def __init__(self):
+        size = _ROWS * _COLS
+        self.count = [0.0] * size
+        self.wins = [0.0] * size
+        self.wagered = [0.0] * size
+        self.profit = [0.0] * size
+        self.bets = 0
+
+    def add(self, cell: int, won: bool, amount: float, profit: float):
+        self.count[cell] += 1
+        self.wins[cell] += won
+        self.wagered[cell] += amount
+        self.profit[cell] += profit
+        self.bets += 1
+
+    def best(self) -> Dict[str, Any]:
+        """Highest-ROI threshold pair with enough bets; ties keep the looser thresholds"""
+        count = _suffix_sums(self.count)
+        wagered = _suffix_sums(self.wagered)
+        profit = _suffix_sums(self.profit)
+
+        best_roi, best_cell = -float("inf"), None
+        for r in range(len(CONFIDENCE_GRID)):
+            for c in range(len(EV_GRID)):
+                # Bets passing threshold (r, c) fall in cells beyond both indexes
+                cell = (r + 1) * _COLS + c + 1
+                if count[cell] < MIN_BETS_PER_CELL or wagered[cell] <= 0:
+                    continue
+                roi = profit[cell] / wagered[cell]
+                if roi > best_roi:
+                    best_roi, best_cell = roi, (r, c, cell)
+
+        if best_cell is None:
+            return {
+                "optimal_min_confidence": 0.70,
+                "optimal_min_ev": 0.05,
+                "expected_roi": 0.0,
+                "expected_win_rate": 0,
+                "sample_size": 0,
+            }
+        r, c, cell = best_cell
+        wins = _suffix_sums(self.wins)
+        return {
+            "optimal_min_confidence": CONFIDENCE_GRID[r],
+            "optimal_min_ev": EV_GRID[c],
+            "expected_roi": best_roi,
+            "expected_win_rate": wins[cell] / count[cell],
+            "sample_size": int(count[cell]),
+        }
+
+
 class ThresholdOptimizer:
     """Optimizes min_confidence and min_ev thresholds to maximize ROI"""
     
-    def __init__(self, table, pk="BENNY"):
+    def __init__(self, table, pk="BENNY", bootstrap_samples=BOOTSTRAP_SAMPLES, seed=None):
         self.table = table
         self.pk = pk
+        self.bootstrap_samples = bootstrap_samples
+        self.seed = seed
     
     def optimize_thresholds(self) -> Dict[str, Any]:
-        """Find optimal thresholds per sport/market"""
-        # Get all settled bets
-        response = self.table.query(
-            KeyConditionExpression=Key("pk").eq(self.pk) & Key("sk").begins_with("BET#"),
-            FilterExpression="#status IN (:won, :lost)",
-            ExpressionAttributeNames={"#status": "status"},
-            ExpressionAttributeValues={":won": "won", ":lost": "lost"}
-        )
-        
-        bets = response.get("Items", [])
-        
-        if len(bets) < 30:
-            return {"error": "Insufficient data", "bet_count": len(bets)}
-        
-        # Optimize globally
-        global_optimal = self._find_optimal_thresholds(bets)
+        """Find optimal thresholds globally and per sport/market"""
+        settled = get_settled_bets(self.table, self.pk)
         
-        # Optimize per sport
-        sport_optimal = {}
-        for sport in set(b.get("sport") for b in bets):
-            sport_bets = [b for b in bets if b.get("sport") == sport]
-            if len(sport_bets) >= 10:
-                sport_optimal[sport] = self._find_optimal_thresholds(sport_bets)
+        if len(settled) < 30:
+            return {"error": "Insufficient data", "bet_count": len(settled)}
         
-        # Optimize per market
-        market_optimal = {}
-        for market in set(b.get("market_key") for b in bets):
-            market_bets = [b for b in bets if b.get("market_key") == market]
-            if len(market_bets) >= 10:
-                market_optimal[market] = self._find_optimal_thresholds(market_bets)
+        columns = self._columns(
+            settled["confidence"], settled["odds"], settled.won, settled["bet_amount"],
+            settled["profit"], settled["sport"], settled["market_key"],
+        )
+        results = self._optimize(columns, bootstrap=True)
         
         return {
-            "total_bets": len(bets),
-            "global": global_optimal,
-            "by_sport": sport_optimal,
-            "by_market": market_optimal
+            "total_bets": len(settled),
+            "global": results.pop(("global", None)),
+            "by_sport": {key: r for (kind, key), r in results.items() if kind == "sport"},
+            "by_market": {key: r for (kind, key), r in results.items() if kind == "market"},
         }
     
     def _find_optimal_thresholds(self, bets: List[Dict]) -> Dict[str, Any]:
         """Find optimal confidence and EV thresholds for a set of bets"""
-        # Test different confidence thresholds
-        confidence_thresholds = [0.65, 0.70, 0.75, 0.80, 0.85]
-        ev_thresholds = [0.03, 0.05, 0.08, 0.10, 0.12]
-        
-        best_roi = -float('inf')
-        best_conf = 0.70
-        best_ev = 0.05
-        best_stats = {}
-        
-        for conf_threshold in confidence_thresholds:
-            for ev_threshold in ev_thresholds:
-                # Filter bets that would pass these thresholds
-                filtered_bets = [
-                    b for b in bets
-                    if float(b.get("confidence", 0)) >= conf_threshold
-                ]
-                
-                if len(filtered_bets) < 5:
-                    continue
-                
-                # Calculate ROI for this threshold combination
-                total_wagered = sum(float(b.get("bet_amount", 0)) for b in filtered_bets)
-                total_profit = sum(float(b.get("profit", 0)) for b in filtered_bets)
-                roi = (total_profit / total_wagered) if total_wagered > 0 else 0
-                
-                wins = sum(1 for b in filtered_bets if b.get("status") == "won")
-                win_rate = wins / len(filtered_bets)
-                
-                # Update best if this is better
-                if roi > best_roi:
-                    best_roi = roi
-                    best_conf = conf_threshold
-                    best_ev = ev_threshold
-                    best_stats = {
-                        "roi": roi,
-                        "win_rate": win_rate,
-                        "bet_count": len(filtered_bets),
-                        "total_wagered": total_wagered,
-                        "total_profit": total_profit
-                    }
-        
+        columns = self._columns(
+            [float(b.get("confidence") or 0) for b in bets],
+            [float(b.get("odds") or 0) for b in bets],
+            [b.get("status") == "won" for b in bets],
+            [float(b.get("bet_amount") or 0) for b in bets],
+            [float(b.get("profit") or 0) for b in bets],
+            [b.get("sport") for b in bets],
+            [b.get("market_key") for b in bets],
+        )
+        return self._optimize(columns, slices=False)[("global", None)]
+
+    @staticmethod
+    def _columns(confidence, odds, won, amount, profit, sport, market) -> Dict[str, list]:
+        """Grid cell per bet (sorting bets into the grid once) alongside its outcome"""
         return {
-            "optimal_min_confidence": best_conf,
-            "optimal_min_ev": best_ev,
-            "expected_roi": best_roi,
-            "expected_win_rate": best_stats.get("win_rate", 0),
-            "sample_size": best_stats.get("bet_count", 0)
+            "cell": [_cell(c, expected_value(c, o)) for c, o in zip(confidence, odds)],
+            "won": list(won),
+            "amount": list(amount),
+            "profit": list(profit),
+            "sport": list(sport),
+            "market": list(market),
+        }
+
+    def _optimize(self, columns: Dict[str, list], slices=True, bootstrap=False) -> Dict[tuple, Dict]:
+        """
+        Score every grid cell for the global, per-sport and per-market slices.
+
+        Each bet is added to its histogram cell once; 2D suffix sums then give
+        the totals for every threshold pair, so the cost is bets + grid rather
+        than bets x grid. Bootstrap resamples rerun the same pass to put a 90%
+        interval on the chosen thresholds.
+        """
+        results = {
+            key: grid.best()
+            for key, grid in self._histograms(columns, range(len(columns["cell"])), slices).items()
+            if key[0] == "global" or grid.bets >= MIN_BETS_PER_SLICE
         }
+        if not bootstrap or not self.bootstrap_samples:
+            return results
+
+        rng = random.Random(self.seed)
+        n = len(columns["cell"])
+        chosen: Dict[tuple, Tuple[list, list]] = {key: ([], []) for key in results}
+        for _ in range(self.bootstrap_samples):
+            sample = [rng.randrange(n) for _ in range(n)]
+            for key, grid in self._histograms(columns, sample, slices).items():
+                if key in chosen and grid.bets >= MIN_BETS_PER_CELL:
+                    best = grid.best()
+                    if best["sample_size"]:
+                        chosen[key][0].append(best["optimal_min_confidence"])
+                        chosen[key][1].append(best["optimal_min_ev"])
+
+        for key, (confidences, evs) in chosen.items():
+            if confidences:
+                results[key]["confidence_interval"] = {
+                    "min_confidence": _interval(confidences),
+                    "min_ev": _interval(evs),
+                }
+        return results
+
+    @staticmethod
+    def _histograms(columns: Dict[str, list], indexes, slices: bool) -> Dict[tuple, _Slice]:
+        grids: Dict[tuple, _Slice] = {("global", None): _Slice()}
+        for i in indexes:
+            keys = [("global", None)]
+            if slices:
+                keys += [("sport", columns["sport"][i]), ("market", columns["market"][i])]
+            for key in keys:
+                grid = grids.get(key)
+                if grid is None:
+                    grid = grids[key] = _Slice()
+                grid.add(columns["cell"][i], columns["won"][i], columns["amount"][i], columns["profit"][i])
+        return grids
     
     def save_optimal_thresholds(self, thresholds: Dict):
         """Save optimal thresholds to DynamoDB"""
@@ -1,64 +1,58 @@
 """Monte Carlo variance tracker for Benny"""
-import random
-from decimal import Decimal
-from typing import Dict, Any, List
-from boto3.dynamodb.conditions import Key
+import time
+from typing import Dict, Any
+
+from benny import monte_carlo
+from benny.settled_bets import SettledBets, get_settled_bets
 
 
 class VarianceTracker:
     """Simulates bankroll paths to understand expected variance"""
 
-    SIMULATIONS = 1000
+    SIMULATIONS = 100_000
+    FALLBACK_SIMULATIONS = 2_000  # Pure-Python engine when numpy is unavailable
+    STARTING_BANKROLL = 100.0  # Weekly budget
 
     def __init__(self, table, pk="BENNY_V3"):
         self.table = table
         self.pk = pk
 
-    def run_simulation(self) -> Dict[str, Any]:
+    def run_simulation(self, simulations: int = None, seed: int = None) -> Dict[str, Any]:
         """Run Monte Carlo simulation based on actual bet history"""
         bets = self._get_settled_bets()
         if len(bets) < 20:
             return {"error": "Need 20+ settled bets", "bet_count": len(bets)}
 
+        if simulations is None:
+            simulations = self.SIMULATIONS if monte_carlo.HAS_NUMPY else self.FALLBACK_SIMULATIONS
+
         # Extract actual distributions
-        win_rate = sum(1 for b in bets if b.get("status") == "won") / len(bets)
-        bet_sizes = [float(b.get("bet_amount", 0)) for b in bets]
-        avg_bet = sum(bet_sizes) / len(bet_sizes)
-
-        # Get payout multipliers from winning bets
-        won_bets = [b for b in bets if b.get("status") == "won"]
-        if won_bets:
-            payouts = [float(b.get("payout", 0)) / float(b.get("bet_amount", 1)) for b in won_bets if float(b.get("bet_amount", 0)) > 0]
-            avg_payout = sum(payouts) / len(payouts) if payouts else 1.9
-        else:
-            avg_payout = 1.9
+        won = bets.won
+        win_rate = sum(won) / len(bets)
+        stakes = [amount for amount in bets["bet_amount"] if amount > 0]
+        avg_bet = sum(stakes) / len(stakes) if stakes else 0.0
+
+        # (stake, payout) pairs from winning bets, resampled as payout multipliers
+        payouts = [
+            payout / amount
+            for payout, amount, is_win in zip(bets["payout"], bets["bet_amount"], won)
+            if is_win and amount > 0
+        ]
+        avg_payout = sum(payouts) / len(payouts) if payouts else 1.9
 
-        # Simulate N bankroll paths for the same number of bets
         num_bets = len(bets)
-        final_profits = []
-
-        for _ in range(self.SIMULATIONS):
-            profit = 0.0
-            for _ in range(num_bets):
-                if random.random() < win_rate:
-                    profit += avg_bet * (avg_payout - 1)
-                else:
-                    profit -= avg_bet
-            final_profits.append(profit)
-
-        final_profits.sort()
-        actual_profit = sum(float(b.get("profit", 0)) for b in bets)
-        actual_wagered = sum(float(b.get("bet_amount", 0)) for b in bets)
-
-        # Calculate percentiles
-        p5 = final_profits[int(self.SIMULATIONS * 0.05)]
-        p25 = final_profits[int(self.SIMULATIONS * 0.25)]
-        p50 = final_profits[int(self.SIMULATIONS * 0.50)]
-        p75 = final_profits[int(self.SIMULATIONS * 0.75)]
-        p95 = final_profits[int(self.SIMULATIONS * 0.95)]
+        start = time.perf_counter()
+        paths = monte_carlo.simulate_paths(
+            stakes or [0.0], payouts, win_rate, num_bets, simulations, self.STARTING_BANKROLL, seed
+        )
+        elapsed = time.perf_counter() - start
+
+        final_profits = paths["final_profit"]
+        actual_profit = bets.total("profit")
+        actual_wagered = bets.total("bet_amount")
 
         # Where does actual result fall?
-        percentile = sum(1 for p in final_profits if p <= actual_profit) / self.SIMULATIONS
+        percentile = monte_carlo.share_at_most(final_profits, actual_profit)
 
         # How many more bets needed for significance?
         # Rule of thumb: need 1/(edge^2) bets. With ~1% edge, need ~10000.
@@ -71,34 +65,32 @@ class VarianceTracker:
         else:
             bets_for_significance = 9999
 
+        def rounded(values):
+            return {k: round(v, 2) for k, v in monte_carlo.percentiles(values).items()}
+
         return {
             "total_bets": num_bets,
+            "simulations": simulations,
+            "engine": "numpy" if monte_carlo.HAS_NUMPY else "python",
+            "simulation_seconds": round(elapsed, 3),
             "win_rate": round(win_rate, 4),
             "avg_bet_size": round(avg_bet, 2),
             "avg_payout_multiplier": round(avg_payout, 3),
             "actual_profit": round(actual_profit, 2),
             "actual_roi": round(actual_profit / actual_wagered, 4) if actual_wagered > 0 else 0,
-            "simulated_percentiles": {
-                "p5": round(p5, 2),
-                "p25": round(p25, 2),
-                "p50": round(p50, 2),
-                "p75": round(p75, 2),
-                "p95": round(p95, 2),
-            },
+            "simulated_percentiles": rounded(final_profits),
             "actual_percentile": round(percentile, 2),
             "is_within_expected": 0.05 <= percentile <= 0.95,
+            "max_drawdown_percentiles": rounded(paths["max_drawdown"]),
+            "risk_of_ruin": round(monte_carlo.share_true(paths["ruined"]), 4),
+            "bets_under_water_percentiles": rounded(paths["bets_under_water"]),
+            "longest_under_water_percentiles": rounded(paths["longest_under_water"]),
             "bets_for_significance": min(bets_for_significance, 9999),
             "edge_estimate": round(edge, 4),
         }
 
-    def _get_settled_bets(self) -> List[Dict]:
-        response = self.table.query(
-            KeyConditionExpression=Key("pk").eq(self.pk) & Key("sk").begins_with("BET#"),
-            FilterExpression="#s IN (:w, :l)",
-            ExpressionAttributeNames={"#s": "status"},
-            ExpressionAttributeValues={":w": "won", ":l": "lost"},
-        )
-        return response.get("Items", [])
+    def _get_settled_bets(self) -> SettledBets:
+        return get_settled_bets(self.table, self.pk)
 
     def save_simulation(self, results: Dict):
         from datetime import datetime
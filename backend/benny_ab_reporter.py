@@ -6,6 +6,8 @@ from typing import Dict, Any, List
 import boto3
 from boto3.dynamodb.conditions import Key
 
+from dao import iter_query
+
 
 def calculate_metrics(bets: List[Dict]) -> Dict[str, Any]:
     """Calculate performance metrics from bet list"""
@@ -89,13 +91,12 @@ def get_bets(table, pk: str, days: int) -> List[Dict]:
     """Get bets for a version from last N days"""
     cutoff = (datetime.utcnow() - timedelta(days=days)).isoformat()
     
-    response = table.query(
+    return list(iter_query(
+        table,
         KeyConditionExpression=Key("pk").eq(pk) & Key("sk").begins_with("BET#"),
         FilterExpression="placed_at > :cutoff",
         ExpressionAttributeValues={":cutoff": cutoff}
-    )
-    
-    return response.get("Items", [])
+    ))
 
 
 def calculate_consensus(v1_bets: List[Dict], v3_bets: List[Dict]) -> Dict[str, Any]:
@@ -6,6 +6,9 @@ and AI reasoning. Tracks a $100/week virtual bankroll and learns over time.
 """
 import json
 import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
 from decimal import Decimal
 from typing import Any, Dict, List
@@ -20,6 +23,8 @@ from benny.learning_engine import LearningEngine
 from benny.opportunity_analyzer import OpportunityAnalyzer
 from benny.bet_executor import BetExecutor
 from benny.parlay_engine import ParlayEngine
+from benny.llm_cache import LLMResponseCache
+from benny.llm_executor import DEFAULT_MODEL_ID, LLMExecutor
 
 dynamodb = boto3.resource("dynamodb", region_name="us-east-1")
 bedrock = boto3.client("bedrock-runtime", region_name="us-east-1")
@@ -40,6 +45,7 @@ class BennyTrader:
     TARGET_ROI = 0.15
     MAX_BET_PERCENTAGE = 0.20
     MIN_SAMPLE_SIZE = 30
+    GATHER_WORKERS = 8  # Concurrent DynamoDB lookups while gathering game context
 
     def __init__(self, table_name=None, version="v1"):
         if table_name:
@@ -63,12 +69,19 @@ class BennyTrader:
         )
         self.parlay_engine = ParlayEngine()
 
-        self.position_manager = PositionManager(self.table, bedrock)
+        from elo_calculator import EloRatingService
+        self.elo_ratings = EloRatingService(self.table)
+
+        self.llm = LLMExecutor(bedrock)
+        self.llm_cache = LLMResponseCache(self.table)
+        self.position_manager = PositionManager(self.table, bedrock, llm=self.llm)
 
         # Caches built during analysis, shared across methods
         self.game_teams = {}  # game_id -> {home_team, away_team}
         self.player_teams = {}  # player_name -> team_name
         self._perf_stats_cache = None  # populated once per run
+        self.stage_timings = {}  # stage -> {seconds, calls}
+        self._timing_lock = threading.Lock()
 
         # Model — each version has its own strategy class
         if version == "v3":
@@ -482,165 +495,225 @@ class BennyTrader:
 
             print(f"  Parsed {len(games)} unique games for {sport}")
 
-            # Analyze each game with AI
+            eligible = []
             for game_id, game_data in games.items():
                 if len(game_data["h2h_odds"]) < 2:
                     print(
                         f"  Skipping {game_data['home_team']} vs {game_data['away_team']}: insufficient odds"
                     )
                     continue
+                eligible.append((game_id, game_data))
 
-                print(
-                    f"  Analyzing {game_data['home_team']} vs {game_data['away_team']}"
-                )
+            # Analyze each game with AI. Lookups for the next game run on the
+            # worker pool while Bedrock is analyzing the current one.
+            with ThreadPoolExecutor(max_workers=self.GATHER_WORKERS) as executor:
+                pending = self._start_game_gather(executor, eligible[0][1]) if eligible else None
+                for index, (game_id, game_data) in enumerate(eligible):
+                    print(
+                        f"  Analyzing {game_data['home_team']} vs {game_data['away_team']}"
+                    )
 
-                # Gather essential data
-                home_stats = self._get_team_stats(game_data["home_team"], sport)
-                away_stats = self._get_team_stats(game_data["away_team"], sport)
-                home_injuries = self._get_team_injuries(game_data["home_team"], sport)
-                away_injuries = self._get_team_injuries(game_data["away_team"], sport)
-                h2h_history = self._get_head_to_head(
-                    game_data["home_team"], game_data["away_team"], sport
-                )
-                home_form = self._get_recent_form(game_data["home_team"], sport)
-                away_form = self._get_recent_form(game_data["away_team"], sport)
-                home_news = self._get_team_news_sentiment(game_data["home_team"], sport)
-                away_news = self._get_team_news_sentiment(game_data["away_team"], sport)
-                home_elo = self._get_elo_rating(game_data["home_team"], sport)
-                away_elo = self._get_elo_rating(game_data["away_team"], sport)
-                print(
-                    f"Elo ratings: {game_data['home_team']} {home_elo:.0f} vs {game_data['away_team']} {away_elo:.0f}"
-                )
-                home_adjusted = self._get_adjusted_metrics(
-                    game_data["home_team"], sport
-                )
-                away_adjusted = self._get_adjusted_metrics(
-                    game_data["away_team"], sport
-                )
-                weather = self._get_weather_data(game_id)
-                fatigue = self._get_fatigue_data(game_id)
-
-                # Use preferred bookmaker odds (FanDuel > DraftKings > first)
-                h2h_book = self._get_preferred_book(game_data["h2h_odds"])
-                avg_h2h = {
-                    "home": h2h_book["home_price"],
-                    "away": h2h_book["away_price"],
-                }
-                if h2h_book.get("draw_price"):
-                    avg_h2h["draw"] = h2h_book["draw_price"]
-
-                avg_spread = None
-                if game_data["spread_odds"]:
-                    spread_book = self._get_preferred_book(game_data["spread_odds"])
-                    avg_spread = {
-                        "home_point": spread_book["home_point"],
-                        "home_price": spread_book["home_price"],
-                        "away_point": spread_book["away_point"],
-                        "away_price": spread_book["away_price"],
-                    }
+                    context = self._collect_game_gather(pending)
+                    if index + 1 < len(eligible):
+                        pending = self._start_game_gather(executor, eligible[index + 1][1])
 
-                avg_total = None
-                if game_data["total_odds"]:
-                    total_book = self._get_preferred_book(game_data["total_odds"])
-                    avg_total = {
-                        "point": total_book["over_point"],
-                        "over_price": total_book["over_price"],
-                        "under_price": total_book["under_price"],
-                    }
+                    opportunities.extend(
+                        self._build_game_opportunities(game_id, game_data, sport, context)
+                    )
 
-                # Let AI analyze all markets
-                analysis = self._ai_analyze_game(
-                    game_data,
-                    home_stats,
-                    away_stats,
-                    home_injuries,
-                    away_injuries,
-                    h2h_history,
-                    home_form,
-                    away_form,
-                    home_news,
-                    away_news,
-                    home_elo,
-                    away_elo,
-                    home_adjusted,
-                    away_adjusted,
-                    weather,
-                    fatigue,
-                    avg_spread,
-                    avg_total,
-                )
+        self._print_stage_timings()
+        return opportunities
 
-                if analysis:
-                    # Create opportunities for each market prediction
-                    for market_type, prediction_data in analysis.items():
-                        # Skip if AI didn't provide prediction for this market
-                        if not prediction_data or not isinstance(prediction_data, dict):
-                            continue
-
-                        if market_type == "h2h":
-                            predicted_team = prediction_data["prediction"].lower()
-                            if game_data["home_team"].lower() in predicted_team:
-                                odds = avg_h2h["home"]
-                                normalized_pred = f"{game_data['home_team']} (Moneyline)"
-                            elif game_data["away_team"].lower() in predicted_team:
-                                odds = avg_h2h["away"]
-                                normalized_pred = f"{game_data['away_team']} (Moneyline)"
-                            elif "draw" in predicted_team and "draw" in avg_h2h:
-                                odds = avg_h2h["draw"]
-                                normalized_pred = "Draw (Moneyline)"
-                            else:
-                                continue
-
-                        elif market_type == "spread" and avg_spread:
-                            if (
-                                game_data["home_team"].lower()
-                                in prediction_data["prediction"].lower()
-                            ):
-                                odds = avg_spread["home_price"]
-                                normalized_pred = f"{game_data['home_team']} {avg_spread['home_point']:+.1f} (Spread)"
-                            else:
-                                odds = avg_spread["away_price"]
-                                normalized_pred = f"{game_data['away_team']} {avg_spread['away_point']:+.1f} (Spread)"
-
-                        elif market_type == "total" and avg_total:
-                            if "over" in prediction_data["prediction"].lower():
-                                odds = avg_total["over_price"]
-                                normalized_pred = f"Over {avg_total['point']:.1f} (Total)"
-                            else:
-                                odds = avg_total["under_price"]
-                                normalized_pred = f"Under {avg_total['point']:.1f} (Total)"
-
-                        else:
-                            continue
-
-                        # Calculate EV
-                        odds = float(odds)
-                        if odds > 0:
-                            payout_multiplier = 1 + (odds / 100)
-                        else:
-                            payout_multiplier = 1 + (100 / abs(odds))
-
-                        expected_value = (
-                            float(prediction_data["confidence"]) * payout_multiplier
-                        ) - 1
-                        print(f"  {market_type.upper()} EV: {expected_value:.3f}")
-
-                        opportunity = {
-                            "game_id": game_id,
-                            "sport": sport,
-                            "home_team": game_data["home_team"],
-                            "away_team": game_data["away_team"],
-                            "prediction": normalized_pred,
-                            "confidence": prediction_data["confidence"],
-                            "reasoning": prediction_data["reasoning"],
-                            "key_factors": prediction_data["key_factors"],
-                            "commence_time": game_data["commence_time"],
-                            "market_key": market_type,
-                            "odds": odds,
-                            "expected_value": expected_value,
-                        }
+    def _start_game_gather(self, executor, game_data: Dict[str, Any]) -> Dict[str, Future]:
+        """Submit every context lookup for a game to the worker pool"""
+        sport = game_data["sport"]
+        home_team = game_data["home_team"]
+        away_team = game_data["away_team"]
+        game_id = game_data["game_id"]
+
+        lookups = {
+            "home_stats": (self._get_team_stats, home_team, sport),
+            "away_stats": (self._get_team_stats, away_team, sport),
+            "home_injuries": (self._get_team_injuries, home_team, sport),
+            "away_injuries": (self._get_team_injuries, away_team, sport),
+            "h2h_history": (self._get_head_to_head, home_team, away_team, sport),
+            "home_form": (self._get_recent_form, home_team, sport),
+            "away_form": (self._get_recent_form, away_team, sport),
+            "home_news": (self._get_team_news_sentiment, home_team, sport),
+            "away_news": (self._get_team_news_sentiment, away_team, sport),
+            "home_elo": (self._get_elo_rating, home_team, sport),
+            "away_elo": (self._get_elo_rating, away_team, sport),
+            "home_adjusted": (self._get_adjusted_metrics, home_team, sport),
+            "away_adjusted": (self._get_adjusted_metrics, away_team, sport),
+            "weather": (self._get_weather_data, game_id),
+            "fatigue": (self._get_fatigue_data, game_id),
+        }
+        return {
+            name: executor.submit(self._timed, "lookups", fn, *args)
+            for name, (fn, *args) in lookups.items()
+        }
+
+    def _collect_game_gather(self, futures: Dict[str, Future]) -> Dict[str, Any]:
+        """Wait for a game's lookups; time spent here is I/O not hidden by Bedrock"""
+        start = time.perf_counter()
+        context = {name: future.result() for name, future in futures.items()}
+        self._record_stage("gather_wait", time.perf_counter() - start)
+        return context
+
+    def _timed(self, stage: str, fn, *args):
+        start = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            self._record_stage(stage, time.perf_counter() - start)
+
+    def _record_stage(self, stage: str, seconds: float):
+        with self._timing_lock:
+            timing = self.stage_timings.setdefault(stage, {"seconds": 0.0, "calls": 0})
+            timing["seconds"] += seconds
+            timing["calls"] += 1
+
+    def _print_stage_timings(self):
+        summary = ", ".join(
+            f"{stage} {t['seconds']:.2f}s/{t['calls']}"
+            for stage, t in self.stage_timings.items()
+        )
+        print(f"Stage timings: {summary or 'none'}")
+
+    def _build_game_opportunities(
+        self, game_id: str, game_data: Dict[str, Any], sport: str, context: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """Run AI analysis for one game and turn its predictions into opportunities"""
+        opportunities = []
+        home_elo = context["home_elo"]
+        away_elo = context["away_elo"]
+        print(
+            f"Elo ratings: {game_data['home_team']} {home_elo:.0f} vs {game_data['away_team']} {away_elo:.0f}"
+        )
+
+        # Use preferred bookmaker odds (FanDuel > DraftKings > first)
+        h2h_book = self._get_preferred_book(game_data["h2h_odds"])
+        avg_h2h = {
+            "home": h2h_book["home_price"],
+            "away": h2h_book["away_price"],
+        }
+        if h2h_book.get("draw_price"):
+            avg_h2h["draw"] = h2h_book["draw_price"]
+
+        avg_spread = None
+        if game_data["spread_odds"]:
+            spread_book = self._get_preferred_book(game_data["spread_odds"])
+            avg_spread = {
+                "home_point": spread_book["home_point"],
+                "home_price": spread_book["home_price"],
+                "away_point": spread_book["away_point"],
+                "away_price": spread_book["away_price"],
+            }
+
+        avg_total = None
+        if game_data["total_odds"]:
+            total_book = self._get_preferred_book(game_data["total_odds"])
+            avg_total = {
+                "point": total_book["over_point"],
+                "over_price": total_book["over_price"],
+                "under_price": total_book["under_price"],
+            }
+
+        # Let AI analyze all markets
+        analysis = self._timed(
+            "bedrock",
+            self._ai_analyze_game,
+            game_data,
+            context["home_stats"],
+            context["away_stats"],
+            context["home_injuries"],
+            context["away_injuries"],
+            context["h2h_history"],
+            context["home_form"],
+            context["away_form"],
+            context["home_news"],
+            context["away_news"],
+            home_elo,
+            away_elo,
+            context["home_adjusted"],
+            context["away_adjusted"],
+            context["weather"],
+            context["fatigue"],
+            avg_spread,
+            avg_total,
+        )
+
+        if analysis:
+            # Create opportunities for each market prediction
+            for market_type, prediction_data in analysis.items():
+                # Skip if AI didn't provide prediction for this market
+                if not prediction_data or not isinstance(prediction_data, dict):
+                    continue
+
+                if market_type == "h2h":
+                    predicted_team = prediction_data["prediction"].lower()
+                    if game_data["home_team"].lower() in predicted_team:
+                        odds = avg_h2h["home"]
+                        normalized_pred = f"{game_data['home_team']} (Moneyline)"
+                    elif game_data["away_team"].lower() in predicted_team:
+                        odds = avg_h2h["away"]
+                        normalized_pred = f"{game_data['away_team']} (Moneyline)"
+                    elif "draw" in predicted_team and "draw" in avg_h2h:
+                        odds = avg_h2h["draw"]
+                        normalized_pred = "Draw (Moneyline)"
+                    else:
+                        continue
+
+                elif market_type == "spread" and avg_spread:
+                    if (
+                        game_data["home_team"].lower()
+                        in prediction_data["prediction"].lower()
+                    ):
+                        odds = avg_spread["home_price"]
+                        normalized_pred = f"{game_data['home_team']} {avg_spread['home_point']:+.1f} (Spread)"
+                    else:
+                        odds = avg_spread["away_price"]
+                        normalized_pred = f"{game_data['away_team']} {avg_spread['away_point']:+.1f} (Spread)"
+
+                elif market_type == "total" and avg_total:
+                    if "over" in prediction_data["prediction"].lower():
+                        odds = avg_total["over_price"]
+                        normalized_pred = f"Over {avg_total['point']:.1f} (Total)"
+                    else:
+                        odds = avg_total["under_price"]
+                        normalized_pred = f"Under {avg_total['point']:.1f} (Total)"
 
-                        opportunities.append(opportunity)
+                else:
+                    continue
+
+                # Calculate EV
+                odds = float(odds)
+                if odds > 0:
+                    payout_multiplier = 1 + (odds / 100)
+                else:
+                    payout_multiplier = 1 + (100 / abs(odds))
+
+                expected_value = (
+                    float(prediction_data["confidence"]) * payout_multiplier
+                ) - 1
+                print(f"  {market_type.upper()} EV: {expected_value:.3f}")
+
+                opportunity = {
+                    "game_id": game_id,
+                    "sport": sport,
+                    "home_team": game_data["home_team"],
+                    "away_team": game_data["away_team"],
+                    "prediction": normalized_pred,
+                    "confidence": prediction_data["confidence"],
+                    "reasoning": prediction_data["reasoning"],
+                    "key_factors": prediction_data["key_factors"],
+                    "commence_time": game_data["commence_time"],
+                    "market_key": market_type,
+                    "odds": odds,
+                    "expected_value": expected_value,
+                }
+
+                opportunities.append(opportunity)
 
         return opportunities
 
@@ -716,31 +789,25 @@ class BennyTrader:
 
             print(f"  Parsed {len(props_by_player)} unique props for {sport}")
 
-            # Analyze top props (limit to prevent timeout)
-            for prop_key, prop_data in list(props_by_player.items())[:20]:
-                if len(prop_data["odds"]) < 2:
-                    continue
+            # Analyze top props (limit to prevent timeout) concurrently through
+            # the shared LLM executor, then evaluate results in slate order
+            candidates = [
+                prop_data
+                for prop_data in list(props_by_player.values())[:20]
+                if len(prop_data["odds"]) >= 2
+            ]
+            futures = [
+                self.llm.submit(self._research_prop, prop_data, sport)
+                for prop_data in candidates
+            ]
 
+            for prop_data, future in zip(candidates, futures):
                 print(f"  Analyzing {prop_data['player']} {prop_data['market']}")
-
-                # Get player data
-                player_stats = self._get_player_stats(prop_data["player"], sport)
-                player_trends = self._get_player_trends(
-                    prop_data["player"], sport, prop_data["market"]
-                )
-                matchup_data = self._get_player_matchup(
-                    prop_data["player"], prop_data["opponent"], sport
-                )
-
-                if player_stats:
-                    print(f"    Player stats: {list(player_stats.keys())[:5]}")
-                else:
-                    print(f"    No player stats found")
-
-                # AI analysis
-                analysis = self._ai_analyze_prop(
-                    prop_data, player_stats, player_trends, matchup_data
-                )
+                try:
+                    analysis = future.result()
+                except Exception as e:
+                    print(f"    Error analyzing prop: {e}")
+                    analysis = None
 
                 if analysis:
                     prediction = analysis.get("prediction", "")
@@ -811,6 +878,23 @@ class BennyTrader:
 
         return opportunities
 
+    def _research_prop(self, prop_data: Dict, sport: str) -> Dict[str, Any]:
+        """Load player context for a prop and run its AI analysis"""
+        player_stats = self._get_player_stats(prop_data["player"], sport)
+        player_trends = self._get_player_trends(
+            prop_data["player"], sport, prop_data["market"]
+        )
+        matchup_data = self._get_player_matchup(
+            prop_data["player"], prop_data["opponent"], sport
+        )
+
+        if not player_stats:
+            print(f"    No player stats found for {prop_data['player']}")
+
+        return self._ai_analyze_prop(
+            prop_data, player_stats, player_trends, matchup_data
+        )
+
     def _ai_analyze_prop(
         self,
         prop_data: Dict,
@@ -823,25 +907,7 @@ class BennyTrader:
             prompt = self.model.build_prop_prompt(prop_data, player_stats, player_trends, matchup_data)
             max_tokens = 300 if self.version == "v3" else 400
 
-            response = bedrock.invoke_model(
-                modelId="us.anthropic.claude-sonnet-4-5-20250929-v1:0",
-                body=json.dumps({
-                    "anthropic_version": "bedrock-2023-05-31",
-                    "max_tokens": max_tokens,
-                    "messages": [{"role": "user", "content": prompt}],
-                }),
-            )
-            result = json.loads(response["body"].read())
-            content = result["content"][0]["text"]
-
-            if "```json" in content:
-                content = content.split("```json")[1].split("```")[0].strip()
-            elif "```" in content:
-                content = content.split("```")[1].split("```")[0].strip()
-
-            parsed = json.loads(content)
-
-            return parsed
+            return self._invoke_cached(prompt, max_tokens, prop_data.get("commence_time"))
         except Exception as e:
             print(f"Error in prop AI analysis: {e}")
             return None
@@ -1104,29 +1170,30 @@ Away: {avg_away_price} ({away_prob:.1%} implied)"""
             prompt = self.model.build_game_prompt(game_data, context)
             max_tokens = 500 if self.version == "v3" else 800
 
-            response = bedrock.invoke_model(
-                modelId="us.anthropic.claude-sonnet-4-5-20250929-v1:0",
-                body=json.dumps({
-                    "anthropic_version": "bedrock-2023-05-31",
-                    "max_tokens": max_tokens,
-                    "messages": [{"role": "user", "content": prompt}],
-                }),
-            )
-            result = json.loads(response["body"].read())
-            content = result["content"][0]["text"]
-
-            if "```json" in content:
-                content = content.split("```json")[1].split("```")[0].strip()
-            elif "```" in content:
-                content = content.split("```")[1].split("```")[0].strip()
-
-            parsed = json.loads(content)
-
-            return parsed
+            return self._invoke_cached(prompt, max_tokens, game_data.get("commence_time"))
         except Exception as e:
             print(f"Error in AI analysis: {e}")
             return None
 
+    def _invoke_cached(self, prompt: str, max_tokens: int, commence_time: str) -> Dict[str, Any]:
+        """Return the parsed JSON answer for a prompt, reusing a cached answer for identical prompts"""
+        cache_key = self.llm_cache.key(prompt, DEFAULT_MODEL_ID, max_tokens)
+        cached = self.llm_cache.get(cache_key)
+        if cached is not None:
+            print("  Reusing cached AI analysis (prompt unchanged)")
+            return cached
+
+        content = self.llm.invoke(prompt, max_tokens)
+
+        if "```json" in content:
+            content = content.split("```json")[1].split("```")[0].strip()
+        elif "```" in content:
+            content = content.split("```")[1].split("```")[0].strip()
+
+        parsed = json.loads(content)
+        self.llm_cache.put(cache_key, parsed, commence_time)
+        return parsed
+
     @staticmethod
     def _american_to_probability(american_odds: float) -> float:
         """Convert American odds to implied probability"""
@@ -1173,14 +1240,7 @@ Away: {avg_away_price} ({away_prob:.1%} implied)"""
     def _get_elo_rating(self, team_name: str, sport: str) -> float:
         """Get current Elo rating for a team"""
         try:
-            normalized_team = team_name.strip().replace(" ", "_").upper()
-            response = table.query(
-                KeyConditionExpression=Key("pk").eq(f"ELO#{sport}#{normalized_team}"),
-                ScanIndexForward=False,
-                Limit=1,
-            )
-            items = response.get("Items", [])
-            return float(items[0].get("rating", 1500)) if items else 1500.0
+            return float(self.elo_ratings.get(sport, team_name))
         except Exception as e:
             print(f"Error fetching Elo: {e}")
             return 1500.0
@@ -1571,6 +1631,7 @@ Away: {avg_away_price} ({away_prob:.1%} implied)"""
             "bets": placed_bets,
             "parlay_bets": parlay_bets,
             "position_actions": position_actions,
+            "stage_timings": self.stage_timings,
         }
 
         # Post-run: learning updates, feature analysis, variance tracking
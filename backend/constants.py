@@ -55,3 +55,6 @@ MODEL_NAMES = {
 
 BET_TYPES = ["game", "prop"]
 MARKET_TYPES = ["h2h", "spreads", "totals"]
+
+# Catalog of sports/bookmakers seen by the odds collector (single item read by the API)
+CATALOG_KEY = {"pk": "CATALOG", "sk": "ODDS"}
@@ -1,8 +1,11 @@
 """
 Custom Data - User-uploaded datasets for custom model data sources
 """
+import hashlib
 import json
 import os
+import threading
+import time
 import uuid
 from datetime import datetime
 from decimal import Decimal
@@ -19,6 +22,12 @@ CUSTOM_DATA_BUCKET = os.environ.get("CUSTOM_DATA_BUCKET", "dev-custom-data-bucke
 
 custom_data_table = dynamodb.Table(CUSTOM_DATA_TABLE)
 
+# Compiled datasets are cached on the Lambda's /tmp across invocations and
+# revalidated against the compiled object's S3 ETag
+CACHE_DIR = os.environ.get("CUSTOM_DATA_CACHE_DIR", "/tmp/custom_data")
+REVALIDATE_SECONDS = 300
+KEY_COLUMNS = {"team": "team", "player": "player"}
+
 
 def convert_floats_to_decimal(obj: Any) -> Any:
     """Recursively convert floats to Decimal for DynamoDB"""
@@ -118,16 +127,21 @@ class CustomDataset:
         return [CustomDataset.from_dynamodb(item) for item in response.get("Items", [])]
 
     def delete(self):
-        """Delete dataset metadata and S3 file"""
+        """Delete dataset metadata and S3 files"""
         # Delete from DynamoDB
         custom_data_table.delete_item(
             Key={"PK": f"USER#{self.user_id}", "SK": f"DATASET#{self.dataset_id}"}
         )
         # Delete from S3
-        try:
-            s3.delete_object(Bucket=CUSTOM_DATA_BUCKET, Key=self.s3_key)
-        except Exception as e:
-            print(f"Error deleting S3 object: {e}")
+        for key in (self.s3_key, self.compiled_key):
+            try:
+                s3.delete_object(Bucket=CUSTOM_DATA_BUCKET, Key=key)
+            except Exception as e:
+                print(f"Error deleting S3 object: {e}")
+
+    @property
+    def compiled_key(self) -> str:
+        return f"{os.path.splitext(self.s3_key)[0]}.compiled.json"
 
     def get_data(self) -> List[Dict]:
         """Retrieve dataset from S3"""
@@ -139,6 +153,151 @@ class CustomDataset:
             print(f"Error retrieving dataset from S3: {e}")
             return []
 
+    def store_compiled(self, data: List[Dict]) -> Optional[Dict]:
+        """Compile rows and upload them next to the raw dataset; returns the compiled form"""
+        compiled = compile_dataset(data, self.data_type)
+        try:
+            response = s3.put_object(
+                Bucket=CUSTOM_DATA_BUCKET,
+                Key=self.compiled_key,
+                Body=json.dumps(compiled).encode("utf-8"),
+                ContentType="application/json",
+            )
+            _write_cache(self.compiled_key, response.get("ETag"), compiled)
+        except Exception as e:
+            print(f"Error storing compiled dataset: {e}")
+        return compiled
+
+    def get_compiled(self) -> Optional["CompiledDataset"]:
+        """
+        Compiled dataset, read from /tmp when its ETag still matches S3.
+
+        Datasets uploaded before compilation existed are compiled from the raw
+        rows on first use and the compiled form is uploaded for next time.
+        """
+        try:
+            etag = s3.head_object(Bucket=CUSTOM_DATA_BUCKET, Key=self.compiled_key)["ETag"]
+        except Exception:
+            data = self.get_data()
+            return CompiledDataset(self.store_compiled(data)) if data else None
+
+        cached = _read_cache(self.compiled_key)
+        if cached and cached.get("etag") == etag:
+            return CompiledDataset(cached["compiled"])
+
+        try:
+            response = s3.get_object(Bucket=CUSTOM_DATA_BUCKET, Key=self.compiled_key)
+            compiled = json.loads(response["Body"].read().decode("utf-8"))
+        except Exception as e:
+            print(f"Error retrieving compiled dataset from S3: {e}")
+            return None
+        _write_cache(self.compiled_key, response.get("ETag", etag), compiled)
+        return CompiledDataset(compiled)
+
+
+def compile_dataset(data: List[Dict], data_type: str) -> Dict:
+    """
+    Compact form of validated rows: lowercased key-column names plus every
+    other column as an array of floats (None where a value isn't numeric).
+    """
+    key_column = KEY_COLUMNS.get(data_type, "team")
+    columns = [c for c in (data[0].keys() if data else []) if c != key_column]
+
+    def number(value):
+        try:
+            return float(value)
+        except (ValueError, TypeError):
+            return None
+
+    return {
+        "data_type": data_type,
+        "names": [str(row.get(key_column, "")).lower() for row in data],
+        "columns": {c: [number(row.get(c)) for row in data] for c in columns},
+    }
+
+
+class CompiledDataset:
+    """Name-indexed, column-oriented view of a compiled dataset"""
+
+    def __init__(self, compiled: Dict):
+        self.data_type = compiled.get("data_type", "team")
+        self.names: List[str] = compiled.get("names", [])
+        self.columns: Dict[str, List[Optional[float]]] = compiled.get("columns", {})
+        # Team lookups historically took the last matching row, player lookups the first
+        self._last_match = self.data_type != "player"
+        self.index: Dict[str, int] = {}
+        for i, name in enumerate(self.names):
+            if self._last_match or name not in self.index:
+                self.index[name] = i
+        self._resolved: Dict[str, Optional[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def find(self, name: str) -> Optional[int]:
+        """Row for `name`: an exact (case-insensitive) match, else a substring match either way"""
+        name = name.lower()
+        if name in self._resolved:
+            return self._resolved[name]
+        position = self.index.get(name)
+        if position is None:
+            matches = [i for i, row_name in enumerate(self.names) if name in row_name or row_name in name]
+            if matches:
+                position = matches[-1] if self._last_match else matches[0]
+        self._resolved[name] = position
+        return position
+
+
+# (user_id, dataset_id) -> (checked_at, CompiledDataset or None), shared across bets in a warm Lambda
+_compiled_cache: Dict[tuple, tuple] = {}
+_compiled_lock = threading.Lock()
+
+
+def get_compiled_dataset(user_id: str, dataset_id: str) -> Optional[CompiledDataset]:
+    """Compiled dataset for evaluation; metadata and ETag are rechecked every REVALIDATE_SECONDS"""
+    key = (user_id, dataset_id)
+    with _compiled_lock:
+        entry = _compiled_cache.get(key)
+    if entry and time.monotonic() - entry[0] < REVALIDATE_SECONDS:
+        return entry[1]
+
+    dataset = CustomDataset.get(user_id, dataset_id)
+    compiled = dataset.get_compiled() if dataset else None
+    with _compiled_lock:
+        _compiled_cache[key] = (time.monotonic(), compiled)
+    return compiled
+
+
+def clear_compiled_cache():
+    with _compiled_lock:
+        _compiled_cache.clear()
+
+
+def _cache_path(s3_key: str) -> str:
+    return os.path.join(CACHE_DIR, f"{hashlib.sha256(s3_key.encode()).hexdigest()}.json")
+
+
+def _read_cache(s3_key: str) -> Optional[Dict]:
+    try:
+        with open(_cache_path(s3_key)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_cache(s3_key: str, etag: Optional[str], compiled: Dict):
+    if not etag:
+        return
+    path = _cache_path(s3_key)
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        partial = f"{path}.{threading.get_ident()}.tmp"
+        with open(partial, "w") as f:
+            json.dump({"etag": etag, "compiled": compiled}, f)
+        os.replace(partial, path)
+    except OSError as e:
+        print(f"Error caching compiled dataset: {e}")
+
 
 def validate_dataset(data: List[Dict], data_type: str) -> tuple[bool, Optional[str]]:
     """Validate dataset structure and content"""
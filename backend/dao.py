@@ -2,11 +2,82 @@
 Database Access Object for sports betting data
 """
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
 import boto3
 
 
+class ReadStats:
+    """Accumulates pages, item counts and consumed read capacity across paginated calls"""
+
+    def __init__(self):
+        self.pages = 0
+        self.items = 0
+        self.scanned = 0
+        self.capacity_units = 0.0
+
+    def record(self, response: Dict[str, Any]):
+        self.pages += 1
+        self.items += response.get("Count", len(response.get("Items", [])))
+        self.scanned += response.get("ScannedCount", 0)
+        self.capacity_units += float(
+            (response.get("ConsumedCapacity") or {}).get("CapacityUnits", 0)
+        )
+
+
+def _paginate(
+    operation,
+    attributes: Optional[List[str]] = None,
+    max_items: Optional[int] = None,
+    stats: Optional[ReadStats] = None,
+    **kwargs,
+) -> Iterator[Dict[str, Any]]:
+    if attributes:
+        names = dict(kwargs.get("ExpressionAttributeNames", {}))
+        placeholders = []
+        for i, attribute in enumerate(attributes):
+            names[f"#p{i}"] = attribute
+            placeholders.append(f"#p{i}")
+        kwargs["ProjectionExpression"] = ", ".join(placeholders)
+        kwargs["ExpressionAttributeNames"] = names
+    if stats is not None:
+        kwargs["ReturnConsumedCapacity"] = "TOTAL"
+
+    yielded = 0
+    while True:
+        response = operation(**kwargs)
+        if stats is not None:
+            stats.record(response)
+
+        for item in response.get("Items", []):
+            yield item
+            yielded += 1
+            if max_items is not None and yielded >= max_items:
+                return
+
+        last_evaluated_key = response.get("LastEvaluatedKey")
+        if not isinstance(last_evaluated_key, dict) or not last_evaluated_key:
+            return
+        kwargs["ExclusiveStartKey"] = last_evaluated_key
+
+
+def iter_query(table, attributes: Optional[List[str]] = None, max_items: Optional[int] = None,
+               stats: Optional[ReadStats] = None, **kwargs) -> Iterator[Dict[str, Any]]:
+    """Lazily yield every item of a query, following LastEvaluatedKey page by page.
+
+    attributes pushes a ProjectionExpression down to DynamoDB, max_items stops
+    reading once enough items were yielded (so does breaking out of the loop),
+    and stats accumulates consumed capacity. Remaining kwargs go to table.query.
+    """
+    return _paginate(table.query, attributes, max_items, stats, **kwargs)
+
+
+def iter_scan(table, attributes: Optional[List[str]] = None, max_items: Optional[int] = None,
+              stats: Optional[ReadStats] = None, **kwargs) -> Iterator[Dict[str, Any]]:
+    """Lazily yield every item of a scan; same options as iter_query"""
+    return _paginate(table.scan, attributes, max_items, stats, **kwargs)
+
+
 class BettingDAO:
     def __init__(self):
         import os
@@ -25,34 +96,20 @@ class BettingDAO:
             week_from_now = now + timedelta(days=7)
 
             game_ids = set()
-            last_evaluated_key = None
-
-            while True:
-                query_params = {
-                    "IndexName": "ActiveBetsIndexV2",
-                    "KeyConditionExpression": "active_bet_pk = :active_bet_pk AND commence_time BETWEEN :start_time AND :end_time",
-                    "FilterExpression": "attribute_exists(latest)",
-                    "ExpressionAttributeValues": {
-                        ":active_bet_pk": f"GAME#{sport}",
-                        ":start_time": day_ago.isoformat() + "Z",
-                        ":end_time": week_from_now.isoformat() + "Z",
-                    },
-                    "ProjectionExpression": "pk",
-                }
-
-                if last_evaluated_key:
-                    query_params["ExclusiveStartKey"] = last_evaluated_key
-
-                response = self.table.query(**query_params)
-
+            for item in iter_query(
+                self.table,
+                attributes=["pk"],
+                IndexName="ActiveBetsIndexV2",
+                KeyConditionExpression="active_bet_pk = :active_bet_pk AND commence_time BETWEEN :start_time AND :end_time",
+                FilterExpression="attribute_exists(latest)",
+                ExpressionAttributeValues={
+                    ":active_bet_pk": f"GAME#{sport}",
+                    ":start_time": day_ago.isoformat() + "Z",
+                    ":end_time": week_from_now.isoformat() + "Z",
+                },
+            ):
                 # Extract unique game IDs from pk (format: GAME#{game_id})
-                for item in response["Items"]:
-                    game_id = item["pk"].split("#")[1]
-                    game_ids.add(game_id)
-
-                last_evaluated_key = response.get("LastEvaluatedKey")
-                if not last_evaluated_key:
-                    break
+                game_ids.add(item["pk"].split("#")[1])
 
             return list(game_ids)
         except Exception as e:
@@ -70,36 +127,22 @@ class BettingDAO:
             week_from_now = now + timedelta(days=7)
 
             prop_ids = set()
-            last_evaluated_key = None
-
-            while True:
-                query_params = {
-                    "IndexName": "ActiveBetsIndexV2",
-                    "KeyConditionExpression": "active_bet_pk = :active_bet_pk AND commence_time BETWEEN :start_time AND :end_time",
-                    "FilterExpression": "attribute_exists(latest)",
-                    "ExpressionAttributeValues": {
-                        ":active_bet_pk": f"PROP#{sport}",
-                        ":start_time": day_ago.isoformat() + "Z",
-                        ":end_time": week_from_now.isoformat() + "Z",
-                    },
-                    "ProjectionExpression": "pk",
-                }
-
-                if last_evaluated_key:
-                    query_params["ExclusiveStartKey"] = last_evaluated_key
-
-                response = self.table.query(**query_params)
-
+            for item in iter_query(
+                self.table,
+                attributes=["pk"],
+                IndexName="ActiveBetsIndexV2",
+                KeyConditionExpression="active_bet_pk = :active_bet_pk AND commence_time BETWEEN :start_time AND :end_time",
+                FilterExpression="attribute_exists(latest)",
+                ExpressionAttributeValues={
+                    ":active_bet_pk": f"PROP#{sport}",
+                    ":start_time": day_ago.isoformat() + "Z",
+                    ":end_time": week_from_now.isoformat() + "Z",
+                },
+            ):
                 # Extract unique prop IDs from pk (format: PROP#{event_id}#{player_name})
-                for item in response["Items"]:
-                    pk_parts = item["pk"].split("#")
-                    if len(pk_parts) >= 3:  # PROP#{event_id}#{player_name}
-                        prop_id = f"{pk_parts[1]}#{pk_parts[2]}"  # event_id#player_name
-                        prop_ids.add(prop_id)
-
-                last_evaluated_key = response.get("LastEvaluatedKey")
-                if not last_evaluated_key:
-                    break
+                pk_parts = item["pk"].split("#")
+                if len(pk_parts) >= 3:  # PROP#{event_id}#{player_name}
+                    prop_ids.add(f"{pk_parts[1]}#{pk_parts[2]}")  # event_id#player_name
 
             return list(prop_ids)
         except Exception as e:
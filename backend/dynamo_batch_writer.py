@@ -0,0 +1,137 @@
+"""Buffered DynamoDB writer that flushes through batch_write_item"""
+import random
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import boto3
+
+BATCH_SIZE = 25  # DynamoDB batch_write_item limit
+
+
+class BufferedBatchWriter:
+    """
+    Thread-safe write buffer for a DynamoDB table.
+
+    Items are deduplicated by (pk, sk) — the last write wins, which also keeps
+    batch_write_item from rejecting a chunk with duplicate keys — and flushed in
+    25-item chunks. UnprocessedItems are retried with jittered exponential
+    backoff. Flush latency is tracked so callers can publish it to CloudWatch.
+    """
+
+    def __init__(
+        self,
+        table,
+        batch_size: int = BATCH_SIZE,
+        max_retries: int = 5,
+        base_delay: float = 0.05,
+        metric_namespace: Optional[str] = None,
+    ):
+        self.table = table
+        self.batch_size = min(batch_size, BATCH_SIZE)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.metric_namespace = metric_namespace
+        self._buffer: Dict[tuple, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self.items_written = 0
+        self.items_failed = 0
+        self.duplicates = 0
+        self.flush_count = 0
+        self.flush_seconds = 0.0
+
+    def put(self, item: Dict[str, Any]):
+        """Queue an item, flushing a full chunk when one is ready"""
+        chunk = None
+        with self._lock:
+            key = (item["pk"], item["sk"])
+            if key in self._buffer:
+                self.duplicates += 1
+            self._buffer[key] = item
+            if len(self._buffer) >= self.batch_size:
+                chunk = self._take(self.batch_size)
+
+        if chunk:
+            self._write_chunk(chunk)
+
+    def flush(self):
+        """Write everything still buffered"""
+        while True:
+            with self._lock:
+                chunk = self._take(self.batch_size)
+            if not chunk:
+                return
+            self._write_chunk(chunk)
+
+    def _take(self, count: int) -> List[Dict[str, Any]]:
+        keys = list(self._buffer)[:count]
+        return [self._buffer.pop(key) for key in keys]
+
+    def _write_chunk(self, items: List[Dict[str, Any]]):
+        table_name = self.table.name
+        client = self.table.meta.client
+        request = {table_name: [{"PutRequest": {"Item": item}} for item in items]}
+        start = time.perf_counter()
+
+        attempt = 0
+        written = len(items)
+        try:
+            while request:
+                response = client.batch_write_item(RequestItems=request)
+                unprocessed = response.get("UnprocessedItems") or {}
+                pending = list(unprocessed.get(table_name, []))
+                if not pending:
+                    break
+                if attempt >= self.max_retries:
+                    print(f"Giving up on {len(pending)} unprocessed items after {attempt} retries")
+                    with self._lock:
+                        self.items_failed += len(pending)
+                    written -= len(pending)
+                    break
+                delay = self.base_delay * (2 ** attempt)
+                time.sleep(random.uniform(delay / 2, delay))
+                attempt += 1
+                request = {table_name: pending}
+        except Exception as e:
+            print(f"Error writing batch of {len(items)} items: {e}")
+            with self._lock:
+                self.items_failed += len(items)
+            return
+
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.items_written += written
+            self.flush_count += 1
+            self.flush_seconds += elapsed
+
+    def emit_metrics(self, dimensions: List[Dict[str, str]] = None):
+        """Publish flush latency and item counts to CloudWatch"""
+        if not self.metric_namespace or not self.flush_count:
+            return
+        try:
+            cloudwatch = boto3.client("cloudwatch")
+            cloudwatch.put_metric_data(
+                Namespace=self.metric_namespace,
+                MetricData=[
+                    {
+                        "MetricName": "BatchFlushLatency",
+                        "Value": self.flush_seconds / self.flush_count * 1000,
+                        "Unit": "Milliseconds",
+                        "Dimensions": dimensions or [],
+                    },
+                    {
+                        "MetricName": "BatchItemsWritten",
+                        "Value": self.items_written,
+                        "Unit": "Count",
+                        "Dimensions": dimensions or [],
+                    },
+                    {
+                        "MetricName": "BatchItemsFailed",
+                        "Value": self.items_failed,
+                        "Unit": "Count",
+                        "Dimensions": dimensions or [],
+                    },
+                ],
+            )
+        except Exception as e:
+            print(f"Failed to emit metric: {e}")
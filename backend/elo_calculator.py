@@ -2,21 +2,68 @@
 Elo rating calculator for team strength assessment
 """
 import os
+import threading
+import time
 import boto3
 from datetime import datetime
-from typing import Dict, Optional, Tuple
+from typing import Dict, Iterable, Optional, Tuple
 from decimal import Decimal
 
-class EloCalculator:
-    def __init__(self):
-        self.table = boto3.resource('dynamodb').Table(os.environ['DYNAMODB_TABLE'])
-        self.k_factor = 32  # Standard K-factor
-        self.initial_rating = 1500
-    
-    def get_team_rating(self, sport: str, team_name: str) -> float:
-        """Get current Elo rating for a team"""
-        normalized_name = team_name.strip().replace(" ", "_").upper()
-        
+INITIAL_RATING = 1500
+
+
+def normalize_team_name(team_name: str) -> str:
+    return team_name.strip().replace(" ", "_").upper()
+
+
+class EloRatingService:
+    """
+    In-memory snapshot of current Elo ratings, loaded one sport at a time.
+
+    Every rating write also stores an ELO#{sport}#{TEAM} / LATEST pointer
+    indexed under GenericQueryIndex (gsi_pk = ELO#{sport}), so a sport's
+    current ratings come back in a single paginated query. Teams without a
+    pointer yet fall back to their newest history record once per snapshot.
+    """
+
+    SNAPSHOT_TTL_SECONDS = 300
+
+    def __init__(self, table, ttl_seconds: int = None):
+        self.table = table
+        self.ttl_seconds = self.SNAPSHOT_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        self._snapshots = {}  # sport -> (loaded_at, {normalized_team: rating})
+        self._lock = threading.Lock()
+
+    def _snapshot(self, sport: str) -> Dict[str, float]:
+        with self._lock:
+            cached = self._snapshots.get(sport)
+            if cached and time.monotonic() - cached[0] < self.ttl_seconds:
+                return cached[1]
+
+        ratings = {}
+        query_kwargs = {
+            "IndexName": "GenericQueryIndex",
+            "KeyConditionExpression": "gsi_pk = :pk",
+            "ExpressionAttributeValues": {":pk": f"ELO#{sport}"},
+            "ProjectionExpression": "gsi_sk, #rating",
+            "ExpressionAttributeNames": {"#rating": "rating"},
+        }
+        while True:
+            response = self.table.query(**query_kwargs)
+            for item in response.get("Items", []):
+                if "gsi_sk" in item and "rating" in item:
+                    ratings[item["gsi_sk"]] = float(item["rating"])
+            last_key = response.get("LastEvaluatedKey")
+            if not last_key:
+                break
+            query_kwargs["ExclusiveStartKey"] = last_key
+
+        with self._lock:
+            self._snapshots[sport] = (time.monotonic(), ratings)
+        return ratings
+
+    def _load_latest(self, sport: str, normalized_name: str) -> float:
+        """Read a team's newest history record (teams written before LATEST pointers)"""
         response = self.table.query(
             KeyConditionExpression="pk = :pk AND begins_with(sk, :sk_prefix)",
             ExpressionAttributeValues={
@@ -26,11 +73,80 @@ class EloCalculator:
             ScanIndexForward=False,
             Limit=1
         )
-        
         items = response.get("Items", [])
         if items:
-            return float(items[0].get("rating", self.initial_rating))
-        return self.initial_rating
+            return float(items[0].get("rating", INITIAL_RATING))
+        return INITIAL_RATING
+
+    def get(self, sport: str, team_name: str) -> float:
+        """Get current Elo rating for one team"""
+        return self.get_many(sport, [team_name])[team_name]
+
+    def get_many(self, sport: str, teams: Iterable[str]) -> Dict[str, float]:
+        """Get current Elo ratings for many teams of one sport"""
+        snapshot = self._snapshot(sport)
+        ratings = {}
+        for team_name in teams:
+            normalized_name = normalize_team_name(team_name)
+            if normalized_name not in snapshot:
+                rating = self._load_latest(sport, normalized_name)
+                with self._lock:
+                    snapshot[normalized_name] = rating
+            ratings[team_name] = snapshot[normalized_name]
+        return ratings
+
+    def put_many(self, sport: str, ratings: Dict[str, float], timestamp: str = None):
+        """Write new ratings (history record + LATEST pointer) through a batch writer"""
+        timestamp = timestamp or datetime.utcnow().isoformat()
+        snapshot = self._snapshot(sport)
+
+        with self.table.batch_writer() as batch:
+            for team_name, rating in ratings.items():
+                normalized_name = normalize_team_name(team_name)
+                item = {
+                    "pk": f"ELO#{sport}#{normalized_name}",
+                    "sk": timestamp,
+                    "sport": sport,
+                    "team_name": team_name,
+                    "rating": Decimal(str(round(rating, 2))),
+                    "updated_at": timestamp
+                }
+                batch.put_item(Item=item)
+                batch.put_item(Item={
+                    **item,
+                    "sk": "LATEST",
+                    "gsi_pk": f"ELO#{sport}",
+                    "gsi_sk": normalized_name,
+                })
+                with self._lock:
+                    snapshot[normalized_name] = round(rating, 2)
+
+    def invalidate(self, sport: str = None):
+        with self._lock:
+            if sport:
+                self._snapshots.pop(sport, None)
+            else:
+                self._snapshots.clear()
+
+
+class EloCalculator:
+    def __init__(self):
+        self.table = boto3.resource('dynamodb').Table(os.environ['DYNAMODB_TABLE'])
+        self.k_factor = 32  # Standard K-factor
+        self.initial_rating = INITIAL_RATING
+
+    @property
+    def table(self):
+        return self.ratings.table
+
+    @table.setter
+    def table(self, table):
+        # Rebinding the table starts a fresh rating snapshot
+        self.ratings = EloRatingService(table)
+    
+    def get_team_rating(self, sport: str, team_name: str) -> float:
+        """Get current Elo rating for a team"""
+        return self.ratings.get(sport, team_name)
     
     def calculate_expected_score(self, rating_a: float, rating_b: float) -> float:
         """Calculate expected score for team A"""
@@ -39,8 +155,9 @@ class EloCalculator:
     def update_ratings(self, sport: str, home_team: str, away_team: str, 
                       home_score: int, away_score: int) -> Tuple[float, float]:
         """Update Elo ratings after a game"""
-        home_rating = self.get_team_rating(sport, home_team)
-        away_rating = self.get_team_rating(sport, away_team)
+        current = self.ratings.get_many(sport, [home_team, away_team])
+        home_rating = current[home_team]
+        away_rating = current[away_team]
         
         # Calculate expected scores
         home_expected = self.calculate_expected_score(home_rating, away_rating)
@@ -60,24 +177,12 @@ class EloCalculator:
         
         # Store new ratings
         timestamp = datetime.utcnow().isoformat()
-        self._store_rating(sport, home_team, new_home_rating, timestamp)
-        self._store_rating(sport, away_team, new_away_rating, timestamp)
+        self.ratings.put_many(
+            sport, {home_team: new_home_rating, away_team: new_away_rating}, timestamp
+        )
         
         return new_home_rating, new_away_rating
     
-    def _store_rating(self, sport: str, team_name: str, rating: float, timestamp: str):
-        """Store Elo rating in DynamoDB"""
-        normalized_name = team_name.strip().replace(" ", "_").upper()
-        
-        self.table.put_item(Item={
-            "pk": f"ELO#{sport}#{normalized_name}",
-            "sk": timestamp,
-            "sport": sport,
-            "team_name": team_name,
-            "rating": Decimal(str(round(rating, 2))),
-            "updated_at": timestamp
-        })
-    
     def process_game_result(self, game_data: Dict) -> Optional[Tuple[float, float]]:
         """Process a completed game and update Elo ratings"""
         sport = game_data.get("sport")
@@ -3,11 +3,44 @@ Injury Collector - Fetches player injury reports from ESPN API
 """
 
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List, Optional
 
 import boto3
 import requests
+from requests.adapters import HTTPAdapter
+
+TEAM_WORKERS = 8
+REF_WORKERS = 8
+REF_CACHE_TTL_SECONDS = 6 * 60 * 60
+
+
+class RefCache:
+    """Thread-safe TTL cache for resolved ESPN $ref lookups"""
+
+    def __init__(self, ttl_seconds: int = REF_CACHE_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > time.monotonic():
+                return entry[1]
+            self._entries.pop(key, None)
+            return None
+
+    def put(self, key: str, value: Any):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+
+
+# Module level so team and athlete lookups survive across warm Lambda invocations
+ref_cache = RefCache()
 
 
 class InjuryCollector:
@@ -15,6 +48,26 @@ class InjuryCollector:
         self.dynamodb = boto3.resource("dynamodb")
         self.table = self.dynamodb.Table(os.getenv("DYNAMODB_TABLE"))
         self.espn_base_url = "http://sports.core.api.espn.com/v2/sports"
+        self.ref_cache = ref_cache
+
+        # One pooled session shared by all worker threads
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=TEAM_WORKERS * REF_WORKERS)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def _get_json(self, url: str, params: Dict = None, timeout: int = 10) -> Dict[str, Any]:
+        response = self.session.get(url, params=params, timeout=timeout)
+        response.raise_for_status()
+        return response.json()
+
+    @staticmethod
+    def _map(fn: Callable, items: List, max_workers: int) -> List:
+        """Apply fn to items on a bounded thread pool, preserving order"""
+        if len(items) <= 1:
+            return [fn(item) for item in items]
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+            return list(executor.map(fn, items))
 
     def collect_injuries_for_sport(self, sport: str) -> int:
         """Collect injury reports for all teams in a sport"""
@@ -38,9 +91,14 @@ class InjuryCollector:
         espn_sport, league = sport_mapping[sport]
         teams = self._get_teams(espn_sport, league)
 
+        team_injuries_list = self._map(
+            lambda team: self._fetch_team_injuries(espn_sport, league, team["id"]),
+            teams,
+            TEAM_WORKERS,
+        )
+
         injuries_collected = 0
-        for team in teams:
-            team_injuries = self._fetch_team_injuries(espn_sport, league, team["id"])
+        for team, team_injuries in zip(teams, team_injuries_list):
             if team_injuries:
                 self._store_injuries(sport, team["id"], team["name"], team_injuries)
                 injuries_collected += len(team_injuries)
@@ -52,62 +110,49 @@ class InjuryCollector:
         """Get all teams for a sport"""
         url = f"{self.espn_base_url}/{espn_sport}/leagues/{league}/teams"
         try:
-            response = requests.get(url, params={"limit": 100}, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-
-            teams = []
-            for item in data.get("items", []):
-                team_url = item.get("$ref")
-                if team_url:
-                    try:
-                        team_response = requests.get(team_url, timeout=10)
-                        team_response.raise_for_status()
-                        team_data = team_response.json()
-                        teams.append(
-                            {
-                                "id": team_data.get("id"),
-                                "name": team_data.get("displayName"),
-                            }
-                        )
-                    except Exception as e:
-                        print(f"Error fetching team {team_url}: {e}")
-                        continue
-            return teams
+            data = self._get_json(url, params={"limit": 100})
+            team_urls = [item.get("$ref") for item in data.get("items", []) if item.get("$ref")]
+            teams = self._map(self._get_team, team_urls, REF_WORKERS)
+            return [team for team in teams if team]
         except Exception as e:
             print(f"Error fetching teams: {e}")
             return []
 
+    def _get_team(self, team_url: str) -> Optional[Dict[str, Any]]:
+        """Resolve a team $ref, cached across runs"""
+        cached = self.ref_cache.get(team_url)
+        if cached:
+            return cached
+        try:
+            team_data = self._get_json(team_url)
+            team = {"id": team_data.get("id"), "name": team_data.get("displayName")}
+            self.ref_cache.put(team_url, team)
+            return team
+        except Exception as e:
+            print(f"Error fetching team {team_url}: {e}")
+            return None
+
     def _fetch_team_injuries(
         self, espn_sport: str, league: str, team_id: str
     ) -> List[Dict[str, Any]]:
         """Fetch injury reports for a team"""
         url = f"{self.espn_base_url}/{espn_sport}/leagues/{league}/teams/{team_id}/injuries"
         try:
-            response = requests.get(
-                url, params={"lang": "en", "region": "us"}, timeout=10
-            )
-            response.raise_for_status()
-            data = response.json()
-
-            injuries = []
-            for item in data.get("items", []):
-                injury_url = item.get("$ref")
-                if injury_url:
-                    try:
-                        injury_response = requests.get(injury_url, timeout=10)
-                        injury_response.raise_for_status()
-                        injury_data = injury_response.json()
-                        injuries.append(self._parse_injury(injury_data))
-                    except Exception as e:
-                        print(f"Error fetching injury {injury_url}: {e}")
-                        continue
-
-            return injuries
+            data = self._get_json(url, params={"lang": "en", "region": "us"})
+            injury_urls = [item.get("$ref") for item in data.get("items", []) if item.get("$ref")]
+            injuries = self._map(self._fetch_injury, injury_urls, REF_WORKERS)
+            return [injury for injury in injuries if injury]
         except Exception as e:
             print(f"Error fetching injuries for team {team_id}: {e}")
             return []
 
+    def _fetch_injury(self, injury_url: str) -> Optional[Dict[str, Any]]:
+        try:
+            return self._parse_injury(self._get_json(injury_url))
+        except Exception as e:
+            print(f"Error fetching injury {injury_url}: {e}")
+            return None
+
     def _parse_injury(self, injury_data: Dict[str, Any]) -> Dict[str, Any]:
         """Parse injury data from ESPN API"""
         details = injury_data.get("details", {})
@@ -118,31 +163,9 @@ class InjuryCollector:
         player_name = None
         avg_minutes = 0.0
         if athlete_ref:
-            try:
-                athlete_response = requests.get(athlete_ref, timeout=5)
-                athlete_response.raise_for_status()
-                athlete_data = athlete_response.json()
-                player_name = athlete_data.get("displayName")
-
-                # Fetch player statistics for importance weighting
-                stats_ref = athlete_data.get("statistics", {}).get("$ref")
-                if stats_ref:
-                    try:
-                        stats_response = requests.get(stats_ref, timeout=5)
-                        stats_response.raise_for_status()
-                        stats_data = stats_response.json()
-
-                        # Extract average minutes from general stats
-                        for category in stats_data.get("splits", {}).get("categories", []):
-                            if category.get("name") == "general":
-                                for stat in category.get("stats", []):
-                                    if stat.get("name") == "avgMinutes":
-                                        avg_minutes = float(stat.get("value", 0))
-                                        break
-                    except Exception as e:
-                        print(f"Error fetching stats: {e}")
-            except Exception as e:
-                print(f"Error fetching athlete data: {e}")
+            athlete = self._get_athlete(athlete_ref)
+            player_name = athlete["player_name"]
+            avg_minutes = athlete["avg_minutes"]
 
         return {
             "injury_id": injury_data.get("id"),
@@ -160,6 +183,41 @@ class InjuryCollector:
             "date": injury_data.get("date"),
         }
 
+    def _get_athlete(self, athlete_ref: str) -> Dict[str, Any]:
+        """Resolve an athlete's name and average minutes, cached across teams and runs"""
+        cached = self.ref_cache.get(athlete_ref)
+        if cached:
+            return cached
+
+        athlete = {"player_name": None, "avg_minutes": 0.0}
+        try:
+            athlete_data = self._get_json(athlete_ref, timeout=5)
+            athlete["player_name"] = athlete_data.get("displayName")
+
+            # Fetch player statistics for importance weighting
+            stats_ref = athlete_data.get("statistics", {}).get("$ref")
+            if stats_ref:
+                try:
+                    stats_data = self._get_json(stats_ref, timeout=5)
+
+                    # Extract average minutes from general stats
+                    for category in stats_data.get("splits", {}).get("categories", []):
+                        if category.get("name") == "general":
+                            for stat in category.get("stats", []):
+                                if stat.get("name") == "avgMinutes":
+                                    athlete["avg_minutes"] = float(stat.get("value", 0))
+                                    break
+                except Exception as e:
+                    # Not cached, so the next injury for this athlete retries the stats
+                    print(f"Error fetching stats: {e}")
+                    return athlete
+        except Exception as e:
+            print(f"Error fetching athlete data: {e}")
+            return athlete
+
+        self.ref_cache.put(athlete_ref, athlete)
+        return athlete
+
     def _store_injuries(
         self, sport: str, team_id: str, team_name: str, injuries: List[Dict[str, Any]]
     ):
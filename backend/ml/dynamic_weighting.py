@@ -1,62 +1,205 @@
 """Dynamic model weighting based on recent performance."""
 import os
+import threading
+import time
 from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+
 import boto3
 from boto3.dynamodb.conditions import Key
 
+from dao import iter_query
+
+MIN_SAMPLES = 20  # Fewer verified predictions than this get no weight
+WEIGHTS_CACHE_SECONDS = 900
+WEIGHTS_MAX_AGE = timedelta(hours=12)  # Refresh job runs every 4 hours
+
+# (sport, bet_type, lookback_days, models) -> (expires_at, weights); shared by every
+# ensemble instance in a warm Lambda
+_weights_cache: Dict[tuple, tuple] = {}
+_weights_lock = threading.Lock()
+
+
+def clear_weights_cache():
+    with _weights_lock:
+        _weights_cache.clear()
+
+
+def roi_score(correct: int, total: int) -> float:
+    """ROI at -110 odds, floored at zero (negative-ROI models get no weight)"""
+    if total < MIN_SAMPLES:
+        return 0.0
+    # Assume -110 odds: win = +90.91, loss = -110
+    profit = (correct * 90.91) - ((total - correct) * 110)
+    wagered = total * 110
+    return max(0, profit / wagered)
+
 
 class DynamicModelWeighting:
     """Weight models based on actual ROI per sport."""
 
-    def __init__(self, lookback_days=90):
+    DEFAULT_MODELS = ["consensus", "value", "momentum", "contrarian", "hot_cold",
+                      "rest_schedule", "matchup", "injury_aware", "fundamentals"]
+
+    def __init__(self, lookback_days=90, table=None):
         self.lookback_days = lookback_days
-        table_name = os.environ.get("DYNAMODB_TABLE", "carpool-bets-v2-dev")
-        self.dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
-        self.table = self.dynamodb.Table(table_name)
+        if table is None:
+            table_name = os.environ.get("DYNAMODB_TABLE", "carpool-bets-v2-dev")
+            self.dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
+            table = self.dynamodb.Table(table_name)
+        self.table = table
 
     def get_model_weights(self, sport, bet_type="game", models=None):
-        """Calculate weights dynamically from actual performance."""
-        if models is None:
-            models = ["consensus", "value", "momentum", "contrarian", "hot_cold", 
-                     "rest_schedule", "matchup", "injury_aware", "fundamentals"]
+        """
+        Weights for `models`, normalized from each model's ROI.
 
-        cutoff = (datetime.utcnow() - timedelta(days=self.lookback_days)).isoformat()
-        
-        # Calculate ROI for each model
-        performances = {}
+        Counters come from the MODEL_WEIGHTS record kept by refresh_weights;
+        models it doesn't cover (or a stale record) fall back to counting
+        VerifiedAnalysisGSI. Results are memoized per process for
+        WEIGHTS_CACHE_SECONDS.
+        """
+        models = list(models or self.DEFAULT_MODELS)
+        key = (sport, bet_type, self.lookback_days, tuple(sorted(models)))
+        with _weights_lock:
+            cached = _weights_cache.get(key)
+            if cached and cached[0] > time.monotonic():
+                return dict(cached[1])
+
+        counters = self._load_counters(sport, bet_type)
         for model in models:
-            pk = f"VERIFIED#{model}#{sport}#{bet_type}"
-            
-            try:
-                response = self.table.query(
-                    IndexName='VerifiedAnalysisGSI',
-                    KeyConditionExpression=Key('verified_analysis_pk').eq(pk) & Key('verified_analysis_sk').gte(cutoff)
-                )
-                
-                items = response.get('Items', [])
-                if len(items) < 20:
-                    performances[model] = 0.0  # Not enough data
-                    continue
-                
-                # Calculate ROI
-                correct = sum(1 for i in items if i.get('analysis_correct'))
-                total = len(items)
-                
-                # Assume -110 odds: win = +90.91, loss = -110
-                profit = (correct * 90.91) - ((total - correct) * 110)
-                wagered = total * 110
-                roi = profit / wagered if wagered > 0 else 0
-                
-                performances[model] = max(0, roi)  # Exclude negative ROI
-                
-            except Exception as e:
-                print(f"Error calculating performance for {model}: {e}")
-                performances[model] = 0.0
-        
-        # Normalize to weights
+            if model not in counters:
+                counters[model] = self._count_verified(model, sport, bet_type)
+
+        weights = self._normalize(models, counters)
+        with _weights_lock:
+            _weights_cache[key] = (time.monotonic() + WEIGHTS_CACHE_SECONDS, weights)
+        return dict(weights)
+
+    def refresh_weights(self, sport, bet_type="game", models=None):
+        """
+        Recompute the persisted weights record for a sport and bet type.
+
+        Reads the per-day counters OutcomeCollector adds to MODEL_ROLLUP items
+        (one item per model per day) rather than every verified analysis in the
+        window. Rollups start when they were deployed and aren't backfilled, so
+        until a model's oldest rollup day reaches back to the start of the
+        lookback window it is counted from VerifiedAnalysisGSI instead.
+        """
+        models = list(models or self.DEFAULT_MODELS)
+        counters = {}
+        for model in models:
+            correct = total = 0
+            if self._rollups_cover_window(model, sport):
+                correct, total = self._count_rollups(model, sport, bet_type)
+            if total == 0:
+                correct, total = self._count_verified(model, sport, bet_type)
+            counters[model] = (correct, total)
+
+        weights = self._normalize(models, counters)
+        now = datetime.utcnow().isoformat()
+        try:
+            self.table.put_item(Item={
+                'pk': f"MODEL_WEIGHTS#{sport}#{bet_type}",
+                'sk': f"LOOKBACK#{self.lookback_days}",
+                'counters': {m: {'correct': c, 'total': t} for m, (c, t) in counters.items()},
+                'weights': {m: Decimal(str(round(w, 6))) for m, w in weights.items()},
+                'updated_at': now,
+            })
+        except Exception as e:
+            print(f"Error storing model weights for {sport}/{bet_type}: {e}")
+
+        with _weights_lock:
+            for key in [k for k in _weights_cache if k[:3] == (sport, bet_type, self.lookback_days)]:
+                del _weights_cache[key]
+        return weights
+
+    def _load_counters(self, sport, bet_type) -> Dict[str, Tuple[int, int]]:
+        """(correct, total) per model from a fresh MODEL_WEIGHTS record"""
+        try:
+            response = self.table.get_item(Key={
+                'pk': f"MODEL_WEIGHTS#{sport}#{bet_type}",
+                'sk': f"LOOKBACK#{self.lookback_days}",
+            })
+            item = response.get('Item')
+            if not isinstance(item, dict):
+                return {}
+            cutoff = (datetime.utcnow() - WEIGHTS_MAX_AGE).isoformat()
+            if item.get('updated_at', '') < cutoff:
+                return {}
+            return {
+                model: (int(c.get('correct', 0)), int(c.get('total', 0)))
+                for model, c in item.get('counters', {}).items()
+            }
+        except Exception as e:
+            print(f"Error loading model weights for {sport}/{bet_type}: {e}")
+            return {}
+
+    def _rollups_cover_window(self, model, sport) -> bool:
+        """Whether the model has a rollup on or before the first day of the window"""
+        cutoff_day = (datetime.utcnow() - timedelta(days=self.lookback_days)).strftime("%Y-%m-%d")
+        try:
+            response = self.table.query(
+                KeyConditionExpression=Key('pk').eq(f"MODEL_ROLLUP#{model}#{sport}") & Key('sk').between("DAY#", f"DAY#{cutoff_day}"),
+                ProjectionExpression='sk',
+                Limit=1,
+            )
+            return bool(response.get('Items'))
+        except Exception as e:
+            print(f"Error checking rollup coverage for {model}: {e}")
+            return False
+
+    def _count_rollups(self, model, sport, bet_type) -> Tuple[int, int]:
+        cutoff_day = (datetime.utcnow() - timedelta(days=self.lookback_days)).strftime("%Y-%m-%d")
+        correct = total = 0
+        try:
+            for item in iter_query(
+                self.table,
+                attributes=[f"{bet_type}_correct", f"{bet_type}_total"],
+                KeyConditionExpression=Key('pk').eq(f"MODEL_ROLLUP#{model}#{sport}") & Key('sk').gte(f"DAY#{cutoff_day}")
+            ):
+                correct += int(item.get(f"{bet_type}_correct", 0))
+                total += int(item.get(f"{bet_type}_total", 0))
+        except Exception as e:
+            print(f"Error reading rollups for {model}: {e}")
+        return correct, total
+
+    def _count_verified(self, model, sport, bet_type) -> Tuple[int, int]:
+        cutoff = (datetime.utcnow() - timedelta(days=self.lookback_days)).isoformat()
+        pk = f"VERIFIED#{model}#{sport}#{bet_type}"
+        try:
+            items = list(iter_query(
+                self.table,
+                attributes=['analysis_correct'],
+                IndexName='VerifiedAnalysisGSI',
+                KeyConditionExpression=Key('verified_analysis_pk').eq(pk) & Key('verified_analysis_sk').gte(cutoff)
+            ))
+            return sum(1 for i in items if i.get('analysis_correct')), len(items)
+        except Exception as e:
+            print(f"Error calculating performance for {model}: {e}")
+            return 0, 0
+
+    @staticmethod
+    def _normalize(models: List[str], counters: Dict[str, Tuple[int, int]]) -> Dict[str, float]:
+        performances = {m: roi_score(*counters.get(m, (0, 0))) for m in models}
         total = sum(performances.values())
         if total == 0:
             return {m: 1.0 / len(models) for m in models}
+        return {m: p / total for m, p in performances.items()}
 
-        weights = {m: p / total for m, p in performances.items()}
-        return weights
+
+def refresh_all_weights(sports: Optional[List[str]] = None, table=None) -> int:
+    """Refresh persisted game and prop weights for every sport; returns records written"""
+    from constants import SUPPORTED_SPORTS, SYSTEM_MODELS
+
+    models = [m for m in SYSTEM_MODELS if m != "ensemble"]
+    weighting = DynamicModelWeighting(table=table)
+    refreshed = 0
+    for sport in sports or SUPPORTED_SPORTS:
+        for bet_type in ("game", "prop"):
+            try:
+                weighting.refresh_weights(sport, bet_type, models)
+                refreshed += 1
+            except Exception as e:
+                print(f"Error refreshing weights for {sport}/{bet_type}: {e}")
+    return refreshed
@@ -0,0 +1,276 @@
+"""Per-invocation game context shared by all analysis models"""
+
+import logging
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+import boto3
+
+logger = logging.getLogger(__name__)
+
+OUTDOOR_SPORTS = [
+    "americanfootball_nfl",
+    "americanfootball_ncaaf",
+    "baseball_mlb",
+    "soccer_epl",
+    "soccer_usa_mls",
+]
+
+FATIGUE_LOOKBACK_DAYS = 14
+BATCH_GET_ATTEMPTS = 5
+BATCH_GET_BASE_DELAY = 0.05  # Seconds; doubles per retry of UnprocessedKeys
+
+
+def _parse_time(value: str) -> datetime:
+    dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+class GameContext:
+    """
+    Memoized team and game facts for one analysis run.
+
+    Every model in a run (and every sub-model of the ensemble) reads Elo,
+    fatigue, team stats, injuries, H2H and weather through this object, so
+    each fact is loaded from DynamoDB at most once per invocation. Call
+    prefetch() with the slate up front to warm the shared facts in parallel.
+    """
+
+    def __init__(self, table=None, elo_calculator=None, fatigue_calculator=None):
+        if table is None:
+            dynamodb = boto3.resource("dynamodb", region_name="us-east-1")
+            table = dynamodb.Table(os.getenv("DYNAMODB_TABLE", "carpool-bets-v2-dev"))
+        self.table = table
+        self._elo_calculator = elo_calculator
+        self._fatigue_calculator = fatigue_calculator
+        self._cache: Dict[Hashable, Any] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def elo_calculator(self):
+        if self._elo_calculator is None:
+            from elo_calculator import EloCalculator
+
+            self._elo_calculator = EloCalculator()
+        return self._elo_calculator
+
+    @property
+    def fatigue_calculator(self):
+        if self._fatigue_calculator is None:
+            from travel_fatigue_calculator import TravelFatigueCalculator
+
+            self._fatigue_calculator = TravelFatigueCalculator()
+        return self._fatigue_calculator
+
+    def _get(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Return the cached value for key, loading it on first use"""
+        with self._lock:
+            if key in self._cache:
+                self.hits += 1
+                return self._cache[key]
+            self.misses += 1
+
+        value = loader()
+
+        with self._lock:
+            return self._cache.setdefault(key, value)
+
+    def _put(self, key: Hashable, value: Any):
+        with self._lock:
+            self._cache[key] = value
+
+    def prefetch(self, games: List[Dict], max_workers: int = 10):
+        """Warm Elo, fatigue and weather for every game on the slate"""
+        tasks = []
+        seen = set()
+        teams_by_sport: Dict[str, List[str]] = {}
+        for game in games:
+            sport = game.get("sport")
+            game_date = game.get("commence_time")
+            for team in (game.get("home_team"), game.get("away_team")):
+                if not sport or not team:
+                    continue
+                if ("elo", sport, team) not in seen:
+                    seen.add(("elo", sport, team))
+                    teams_by_sport.setdefault(sport, []).append(team)
+                if game_date and ("fatigue", sport, team, game_date) not in seen:
+                    seen.add(("fatigue", sport, team, game_date))
+                    tasks.append((self.get_fatigue, (team, sport, game_date)))
+
+        # One schedule read per sport covers every team's fatigue window
+        dates_by_sport: Dict[str, List[str]] = {}
+        for game in games:
+            if game.get("sport") and game.get("commence_time"):
+                dates_by_sport.setdefault(game["sport"], []).append(game["commence_time"])
+        for sport, dates in dates_by_sport.items():
+            try:
+                start = _parse_time(min(dates, key=_parse_time)) - timedelta(days=FATIGUE_LOOKBACK_DAYS)
+                self.fatigue_calculator.load_schedule(sport, start.isoformat(), max(dates, key=_parse_time))
+            except Exception as e:
+                logger.error(f"Error prefetching schedule for {sport}: {e}")
+
+        # One snapshot read per sport covers every team's Elo rating
+        for sport, teams in teams_by_sport.items():
+            try:
+                ratings = self.elo_calculator.ratings.get_many(sport, teams)
+                for team, rating in ratings.items():
+                    self._put(("elo", sport, team), rating)
+            except Exception as e:
+                logger.error(f"Error prefetching Elo ratings for {sport}: {e}")
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(fn, *args) for fn, args in tasks]
+            for future in futures:
+                try:
+                    future.result()
+                except Exception as e:
+                    logger.error(f"Error prefetching game context: {e}")
+
+        weather_games = [
+            g.get("game_id") for g in games
+            if g.get("game_id") and g.get("sport") in OUTDOOR_SPORTS
+        ]
+        self._prefetch_weather(weather_games)
+
+        logger.info(
+            f"Prefetched context for {len(games)} games ({len(self._cache)} facts)"
+        )
+
+    def _prefetch_weather(self, game_ids: List[str]):
+        """Load weather records for many games with batch_get_item"""
+        game_ids = list(dict.fromkeys(game_ids))
+        if not game_ids:
+            return
+
+        try:
+            client = self.table.meta.client
+            table_name = self.table.name
+            found = {}
+            unread = set()
+            for i in range(0, len(game_ids), 100):
+                keys = [
+                    {"pk": f"WEATHER#{game_id}", "sk": "latest"}
+                    for game_id in game_ids[i:i + 100]
+                ]
+                request = {table_name: {"Keys": keys}}
+                for attempt in range(BATCH_GET_ATTEMPTS):
+                    if attempt:
+                        delay = BATCH_GET_BASE_DELAY * (2 ** attempt)
+                        time.sleep(random.uniform(delay / 2, delay))
+                    response = client.batch_get_item(RequestItems=request)
+                    for item in response.get("Responses", {}).get(table_name, []):
+                        found[item["pk"][len("WEATHER#"):]] = item
+                    request = response.get("UnprocessedKeys")
+                    if not request:
+                        break
+                if request:
+                    unread.update(
+                        key["pk"][len("WEATHER#"):] for key in request[table_name]["Keys"]
+                    )
+
+            # Keys still unprocessed aren't cached, so get_weather reads them individually
+            for game_id in game_ids:
+                if game_id not in unread:
+                    self._put(("weather", game_id), found.get(game_id))
+        except Exception as e:
+            logger.error(f"Error prefetching weather: {e}")
+
+    def get_elo_rating(self, sport: str, team: str) -> float:
+        return self._get(
+            ("elo", sport, team),
+            lambda: self.elo_calculator.get_team_rating(sport, team),
+        )
+
+    def get_fatigue(self, team: str, sport: str, game_date: str) -> Dict:
+        return self._get(
+            ("fatigue", sport, team, game_date),
+            lambda: self.fatigue_calculator.calculate_fatigue_score(team, sport, game_date),
+        )
+
+    def get_weather(self, game_id: str) -> Optional[Dict]:
+        def load():
+            response = self.table.get_item(Key={"pk": f"WEATHER#{game_id}", "sk": "latest"})
+            return response.get("Item")
+
+        return self._get(("weather", game_id), load)
+
+    def get_adjusted_metrics(self, sport: str, team: str) -> Optional[Dict]:
+        def load():
+            normalized_name = team.strip().replace(" ", "_").upper()
+            response = self.table.query(
+                KeyConditionExpression="pk = :pk",
+                FilterExpression="latest = :true",
+                ExpressionAttributeValues={
+                    ":pk": f"ADJUSTED_METRICS#{sport}#{normalized_name}",
+                    ":true": True,
+                },
+                Limit=1,
+            )
+            items = response.get("Items", [])
+            return items[0].get("metrics") if items else None
+
+        return self._get(("adjusted_metrics", sport, team), load)
+
+    def get_team_stats(self, sport: str, team: str) -> Optional[Dict]:
+        def load():
+            team_key = team.lower().replace(" ", "_")
+            response = self.table.query(
+                KeyConditionExpression="pk = :pk",
+                ExpressionAttributeValues={":pk": f"TEAM_STATS#{sport}#{team_key}"},
+                ScanIndexForward=False,
+                Limit=1,
+            )
+            items = response.get("Items", [])
+            return items[0] if items else None
+
+        return self._get(("team_stats", sport, team), load)
+
+    def get_team_outcomes(self, sport: str, team: str, limit: int = 10) -> List[Dict]:
+        def load():
+            normalized_team = team.lower().replace(" ", "_")
+            response = self.table.query(
+                IndexName="TeamOutcomesIndex",
+                KeyConditionExpression="team_outcome_pk = :pk",
+                ExpressionAttributeValues={":pk": f"TEAM#{sport}#{normalized_team}"},
+                Limit=limit,
+                ScanIndexForward=False,
+            )
+            return response.get("Items", [])[:limit]
+
+        return self._get(("team_outcomes", sport, team, limit), load)
+
+    def get_head_to_head(self, sport: str, team_a: str, team_b: str, limit: int = 10) -> List[Dict]:
+        teams_sorted = sorted([team_a.lower().replace(" ", "_"), team_b.lower().replace(" ", "_")])
+        h2h_pk = f"H2H#{sport}#{teams_sorted[0]}#{teams_sorted[1]}"
+
+        def load():
+            response = self.table.query(
+                IndexName="H2HIndex",
+                KeyConditionExpression="h2h_pk = :pk",
+                ExpressionAttributeValues={":pk": h2h_pk},
+                ScanIndexForward=False,
+                Limit=limit,
+            )
+            return response.get("Items", [])
+
+        return self._get(("h2h", h2h_pk, limit), load)
+
+    def get_injury_report(self, sport: str, team_id: str) -> Optional[Dict]:
+        def load():
+            response = self.table.query(
+                KeyConditionExpression="pk = :pk",
+                ExpressionAttributeValues={":pk": f"INJURIES#{sport}#{team_id}"},
+                Limit=1,
+                ScanIndexForward=False,
+            )
+            items = response.get("Items", [])
+            return items[0] if items else None
+
+        return self._get(("injuries", sport, team_id), load)
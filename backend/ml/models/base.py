@@ -11,6 +11,9 @@ logger = logging.getLogger(__name__)
 class BaseModel:
     """Base class for all analysis models"""
 
+    # Shared per-invocation GameContext, attached via set_context()
+    context = None
+
     def __init__(self):
         self.performance_tracker = None
         self.inefficiency_tracker = None
@@ -29,6 +32,20 @@ class BaseModel:
         """Analyze prop odds and return analysis result"""
         raise NotImplementedError("Subclasses must implement analyze_prop_odds")
 
+    def set_context(self, context):
+        """Read team and game facts from a shared GameContext instead of DynamoDB"""
+        self.context = context
+
+    def _get_elo_rating(self, sport: str, team: str) -> float:
+        if self.context is not None:
+            return self.context.get_elo_rating(sport, team)
+        return self.elo_calculator.get_team_rating(sport, team)
+
+    def _get_fatigue(self, team: str, sport: str, game_date: str) -> Dict:
+        if self.context is not None:
+            return self.context.get_fatigue(team, sport, game_date)
+        return self.fatigue_calculator.calculate_fatigue_score(team, sport, game_date)
+
     def american_to_decimal(self, american_odds: int) -> float:
         """Convert American odds to decimal odds"""
         if american_odds > 0:
@@ -61,7 +78,7 @@ class BaseModel:
             return base_confidence
 
         try:
-            perf = self.performance_tracker.get_model_performance(model_name, sport, days=30)
+            perf = self.performance_tracker.get_rollup_performance(model_name, sport, days=30)
             if perf["total_predictions"] < 10:
                 return base_confidence
             
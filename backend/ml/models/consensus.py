@@ -93,8 +93,8 @@ class ConsensusModel(BaseModel):
         away_team = game_info.get("away_team")
         
         try:
-            home_elo = self.elo_calculator.get_team_rating(sport, home_team)
-            away_elo = self.elo_calculator.get_team_rating(sport, away_team)
+            home_elo = self._get_elo_rating(sport, home_team)
+            away_elo = self._get_elo_rating(sport, away_team)
             elo_diff = home_elo - away_elo
             
             elo_context = ""
@@ -48,8 +48,8 @@ class ContrarianModel(BaseModel):
         elo_context = ""
         elo_boost = 0.0
         try:
-            home_elo = self.elo_calculator.get_team_rating(sport, home_team)
-            away_elo = self.elo_calculator.get_team_rating(sport, away_team)
+            home_elo = self._get_elo_rating(sport, home_team)
+            away_elo = self._get_elo_rating(sport, away_team)
             elo_diff = home_elo - away_elo
             
             if abs(elo_diff) > 50:
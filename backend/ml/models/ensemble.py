@@ -37,6 +37,11 @@ class EnsembleModel(BaseModel):
             "player_stats": PlayerStatsModel(),
         }
 
+    def set_context(self, context):
+        self.context = context
+        for model in self.models.values():
+            model.set_context(context)
+
     def analyze_game_odds(
         self, game_id: str, odds_items: List[Dict], game_info: Dict
     ) -> AnalysisResult:
@@ -51,22 +51,25 @@ class FundamentalsModel(BaseModel):
         away_team = game_info.get("away_team")
         game_date = game_info.get("commence_time")
         
-        home_elo = self.elo_calculator.get_team_rating(sport, home_team)
-        away_elo = self.elo_calculator.get_team_rating(sport, away_team)
+        home_elo = self._get_elo_rating(sport, home_team)
+        away_elo = self._get_elo_rating(sport, away_team)
         elo_diff = home_elo - away_elo
         
         home_metrics = self._get_adjusted_metrics(sport, home_team)
         away_metrics = self._get_adjusted_metrics(sport, away_team)
         
-        home_fatigue = self.fatigue_calculator.calculate_fatigue_score(home_team, sport, game_date)
-        away_fatigue = self.fatigue_calculator.calculate_fatigue_score(away_team, sport, game_date)
+        home_fatigue = self._get_fatigue(home_team, sport, game_date)
+        away_fatigue = self._get_fatigue(away_team, sport, game_date)
         
         weather_impact = 0
         weather_context = ""
         if sport in ['americanfootball_nfl', 'baseball_mlb', 'soccer_epl', 'soccer_usa_mls', 'americanfootball_ncaaf']:
             try:
-                weather_response = self.table.get_item(Key={"pk": f"WEATHER#{game_id}", "sk": "latest"})
-                weather_data = weather_response.get("Item")
+                if self.context is not None:
+                    weather_data = self.context.get_weather(game_id)
+                else:
+                    weather_response = self.table.get_item(Key={"pk": f"WEATHER#{game_id}", "sk": "latest"})
+                    weather_data = weather_response.get("Item")
                 if weather_data:
                     impact = weather_data.get("impact", "low")
                     if impact == "high":
@@ -131,6 +134,8 @@ class FundamentalsModel(BaseModel):
     
     def _get_adjusted_metrics(self, sport: str, team_name: str) -> Optional[Dict]:
         try:
+            if self.context is not None:
+                return self.context.get_adjusted_metrics(sport, team_name)
             normalized_name = team_name.strip().replace(" ", "_").upper()
             response = self.table.query(
                 KeyConditionExpression="pk = :pk",
@@ -76,18 +76,20 @@ class HotColdModel(BaseModel):
         self, team: str, sport: str, lookback: int = 10
     ) -> Dict[str, int]:
         try:
-            normalized_team = team.lower().replace(" ", "_")
-            response = self.table.query(
-                IndexName="TeamOutcomesIndex",
-                KeyConditionExpression="team_outcome_pk = :pk",
-                ExpressionAttributeValues={
-                    ":pk": f"TEAM#{sport}#{normalized_team}",
-                },
-                Limit=lookback,
-                ScanIndexForward=False,
-            )
-
-            items = response.get("Items", [])[:lookback]
+            if self.context is not None:
+                items = self.context.get_team_outcomes(sport, team, lookback)
+            else:
+                normalized_team = team.lower().replace(" ", "_")
+                response = self.table.query(
+                    IndexName="TeamOutcomesIndex",
+                    KeyConditionExpression="team_outcome_pk = :pk",
+                    ExpressionAttributeValues={
+                        ":pk": f"TEAM#{sport}#{normalized_team}",
+                    },
+                    Limit=lookback,
+                    ScanIndexForward=False,
+                )
+                items = response.get("Items", [])[:lookback]
 
             if not items:
                 return {"wins": 5, "losses": 5, "games": 10}
@@ -134,15 +134,18 @@ class InjuryAwareModel(BaseModel):
             if not team_id:
                 return []
 
-            pk = f"INJURIES#{sport}#{team_id}"
-            response = self.table.query(
-                KeyConditionExpression="pk = :pk",
-                ExpressionAttributeValues={":pk": pk},
-                Limit=1,
-                ScanIndexForward=False,
-            )
-
-            items = response.get("Items", [])
+            if self.context is not None:
+                report = self.context.get_injury_report(sport, team_id)
+                items = [report] if report else []
+            else:
+                pk = f"INJURIES#{sport}#{team_id}"
+                response = self.table.query(
+                    KeyConditionExpression="pk = :pk",
+                    ExpressionAttributeValues={":pk": pk},
+                    Limit=1,
+                    ScanIndexForward=False,
+                )
+                items = response.get("Items", [])
             if items:
                 return [
                     inj
@@ -42,10 +42,13 @@ class MatchupModel(BaseModel):
         weather_context = ""
         try:
             if sport in ['americanfootball_nfl', 'baseball_mlb', 'soccer_epl']:
-                weather_response = self.table.get_item(
-                    Key={"pk": f"WEATHER#{game_id}", "sk": "latest"}
-                )
-                weather_data = weather_response.get("Item")
+                if self.context is not None:
+                    weather_data = self.context.get_weather(game_id)
+                else:
+                    weather_response = self.table.get_item(
+                        Key={"pk": f"WEATHER#{game_id}", "sk": "latest"}
+                    )
+                    weather_data = weather_response.get("Item")
                 
                 if weather_data and weather_data.get("impact") in ["high", "moderate"]:
                     impact = weather_data.get("impact")
@@ -156,16 +159,20 @@ class MatchupModel(BaseModel):
             teams_sorted = sorted([home_normalized, away_normalized])
             h2h_pk = f"H2H#{sport}#{teams_sorted[0]}#{teams_sorted[1]}"
 
-            response = self.table.query(
-                IndexName="H2HIndex",
-                KeyConditionExpression="h2h_pk = :pk",
-                ExpressionAttributeValues={":pk": h2h_pk},
-                ScanIndexForward=False,
-                Limit=10,
-            )
+            if self.context is not None:
+                items = self.context.get_head_to_head(sport, home_team, away_team)
+            else:
+                response = self.table.query(
+                    IndexName="H2HIndex",
+                    KeyConditionExpression="h2h_pk = :pk",
+                    ExpressionAttributeValues={":pk": h2h_pk},
+                    ScanIndexForward=False,
+                    Limit=10,
+                )
+                items = response.get("Items", [])
 
-            home_wins = sum(1 for item in response.get("Items", []) if item.get("winner") == home_team)
-            away_wins = sum(1 for item in response.get("Items", []) if item.get("winner") == away_team)
+            home_wins = sum(1 for item in items if item.get("winner") == home_team)
+            away_wins = sum(1 for item in items if item.get("winner") == away_team)
             total_games = home_wins + away_wins
 
             if total_games == 0:
@@ -235,6 +242,8 @@ class MatchupModel(BaseModel):
 
     def _get_team_stats(self, sport: str, team: str) -> Optional[Dict]:
         try:
+            if self.context is not None:
+                return self.context.get_team_stats(sport, team)
             team_key = team.lower().replace(" ", "_")
             response = self.table.query(
                 KeyConditionExpression="pk = :pk",
@@ -57,8 +57,8 @@ class MomentumModel(BaseModel):
         fatigue_context = ""
         fatigue_adjustment = 0
         try:
-            home_fatigue = self.fatigue_calculator.calculate_fatigue_score(home_team, sport, game_date)
-            away_fatigue = self.fatigue_calculator.calculate_fatigue_score(away_team, sport, game_date)
+            home_fatigue = self._get_fatigue(home_team, sport, game_date)
+            away_fatigue = self._get_fatigue(away_team, sport, game_date)
             
             fatigue_diff = away_fatigue['fatigue_score'] - home_fatigue['fatigue_score']
             
@@ -85,8 +85,8 @@ class MomentumModel(BaseModel):
             reasoning = f"Small line adjustment: Spread moved slightly from {abs(old_spread):.1f} to {abs(new_spread):.1f} points. Minor market change.{fatigue_context}"
 
         try:
-            home_elo = self.elo_calculator.get_team_rating(sport, home_team)
-            away_elo = self.elo_calculator.get_team_rating(sport, away_team)
+            home_elo = self._get_elo_rating(sport, home_team)
+            away_elo = self._get_elo_rating(sport, away_team)
             elo_diff = home_elo - away_elo
             
             if (movement < 0 and elo_diff > 50) or (movement > 0 and elo_diff < -50):
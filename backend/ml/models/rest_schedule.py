@@ -34,8 +34,8 @@ class RestScheduleModel(BaseModel):
         game_date = game_info.get("commence_time")
 
         try:
-            home_fatigue = self.fatigue_calculator.calculate_fatigue_score(home_team, sport, game_date)
-            away_fatigue = self.fatigue_calculator.calculate_fatigue_score(away_team, sport, game_date)
+            home_fatigue = self._get_fatigue(home_team, sport, game_date)
+            away_fatigue = self._get_fatigue(away_team, sport, game_date)
             
             home_advantage = (100 - home_fatigue['fatigue_score']) - (100 - away_fatigue['fatigue_score'])
             home_advantage = home_advantage / 20
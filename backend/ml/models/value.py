@@ -54,8 +54,8 @@ class ValueModel(BaseModel):
         confidence = 0.7 if abs(spread_diff) > 1.0 else 0.6
         
         try:
-            home_elo = self.elo_calculator.get_team_rating(sport, home_team)
-            away_elo = self.elo_calculator.get_team_rating(sport, away_team)
+            home_elo = self._get_elo_rating(sport, home_team)
+            away_elo = self._get_elo_rating(sport, away_team)
             elo_diff = home_elo - away_elo
             
             if (prediction == home_team and elo_diff > 50) or \
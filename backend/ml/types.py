@@ -4,6 +4,16 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
+ANALYSIS_BY_GAME_PREFIX = "ANALYSIS_BY_GAME#"
+
+
+def analysis_game_index(item: Dict[str, Any]) -> Dict[str, str]:
+    """GameIndex keys that list every analysis of a game under one partition"""
+    return {
+        "game_index_pk": f"{ANALYSIS_BY_GAME_PREFIX}{item['game_id']}",
+        "game_index_sk": f"{item['pk']}#{item['sk']}",
+    }
+
 
 @dataclass
 class AnalysisResult:
@@ -95,5 +105,8 @@ class AnalysisResult:
             item["commence_time"] = self.commence_time
         else:
             item["commence_time"] = "9999-12-31T23:59:59Z"
-        
+
+        # Lets outcome verification find a game's analyses with one query
+        item.update(analysis_game_index(item))
+
         return item
@@ -514,6 +514,11 @@ def lambda_handler(event, context):
         # If no query params, this is a scheduled run - compute and store all analytics
         if not query_params:
             analytics.compute_and_store_all_analytics()
+
+            from ml.dynamic_weighting import refresh_all_weights
+
+            refreshed = refresh_all_weights(table=analytics.table)
+            print(f"Refreshed {refreshed} model weight records")
             return {
                 "statusCode": 200,
                 "body": {"message": "Analytics computed and stored"},
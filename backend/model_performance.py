@@ -6,20 +6,201 @@ This data is used for dynamic model weighting and performance analysis.
 """
 
 import logging
+import threading
+import time
 from datetime import datetime, timedelta
-from typing import Any, Dict, List
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
 
 import boto3
 
+from dao import iter_query
+
 logger = logging.getLogger(__name__)
 
+CONFIDENCE_BUCKETS = [
+    ("0.5-0.6", 0.5, 0.6),
+    ("0.6-0.7", 0.6, 0.7),
+    ("0.7-0.8", 0.7, 0.8),
+    ("0.8-0.9", 0.8, 0.9),
+    ("0.9-1.0", 0.9, 1.0),
+]
+
+ROLLUP_CACHE_SECONDS = 900
+
+# (model, sport, days) -> (expires_at, performance); shared across models in a process
+_rollup_cache: Dict[tuple, tuple] = {}
+_rollup_lock = threading.Lock()
+
+
+def confidence_bucket(confidence: float) -> Optional[str]:
+    """Calibration bucket label for a confidence, or None below 0.5"""
+    for label, low, high in CONFIDENCE_BUCKETS:
+        if low <= confidence < high or (high == 1.0 and confidence == 1.0):
+            return label
+    return None
+
+
+def bet_return(correct: bool, odds) -> float:
+    """Amount returned on a $100 bet at American odds (0 when lost)"""
+    if not correct:
+        return 0.0
+    odds = float(odds or -110)
+    payout = 100 * (100 / abs(odds)) if odds < 0 else odds
+    return 100 + payout
+
 
 class ModelPerformanceTracker:
     """Track and analyze model performance metrics"""
 
-    def __init__(self, table_name: str):
-        self.dynamodb = boto3.resource("dynamodb")
-        self.table = self.dynamodb.Table(table_name)
+    # Only the attributes the metric calculations read
+    PERFORMANCE_ATTRIBUTES = ["prediction", "actual_outcome", "confidence", "recommended_odds"]
+
+    def __init__(self, table_name: str = None, table=None):
+        if table is None:
+            self.dynamodb = boto3.resource("dynamodb")
+            table = self.dynamodb.Table(table_name)
+        self.table = table
+
+    def record_outcome(
+        self,
+        model: str,
+        sport: str,
+        commence_time: Optional[str],
+        correct: bool,
+        confidence: float,
+        odds=-110,
+        bet_type: str = "game",
+    ) -> None:
+        """
+        Add one verified prediction to the model's daily rollup.
+
+        Rollups live at MODEL_ROLLUP#{model}#{sport} / DAY#{date of commence_time}
+        and hold counters (total, correct, confidence and $100-bet return sums,
+        per-bucket and per-bet-type totals) that get_rollup_performance and
+        DynamicModelWeighting sum over a window.
+        """
+        day = (commence_time or datetime.utcnow().isoformat())[:10]
+        correct_count = 1 if correct else 0
+        names = {
+            "#total": "total",
+            "#correct": "correct",
+            "#conf": "confidence_sum",
+            "#ret": "return_sum",
+            "#tt": f"{bet_type}_total",
+            "#tc": f"{bet_type}_correct",
+        }
+        values = {
+            ":one": 1,
+            ":correct": correct_count,
+            ":conf": Decimal(str(round(float(confidence), 4))),
+            ":ret": Decimal(str(round(bet_return(correct, odds), 4))),
+            ":now": datetime.utcnow().isoformat(),
+        }
+        adds = [
+            "#total :one",
+            "#correct :correct",
+            "#conf :conf",
+            "#ret :ret",
+            "#tt :one",
+            "#tc :correct",
+        ]
+
+        bucket = confidence_bucket(float(confidence))
+        if bucket:
+            names["#bt"] = f"bucket_{bucket}_total"
+            names["#bc"] = f"bucket_{bucket}_correct"
+            adds += ["#bt :one", "#bc :correct"]
+
+        try:
+            self.table.update_item(
+                Key={"pk": f"MODEL_ROLLUP#{model}#{sport}", "sk": f"DAY#{day}"},
+                UpdateExpression=f"ADD {', '.join(adds)} SET updated_at = :now",
+                ExpressionAttributeNames=names,
+                ExpressionAttributeValues=values,
+            )
+        except Exception as e:
+            logger.error(f"Error updating performance rollup for {model}/{sport}: {e}")
+
+    def get_rollup_performance(
+        self, model: str, sport: str, days: int = 30
+    ) -> Dict[str, Any]:
+        """
+        Performance over the last `days` days from the daily rollups.
+
+        Returns the same shape as get_model_performance, which it falls back
+        to until the rollups reach back to the start of the window (they were
+        not backfilled). Results are memoized per process for
+        ROLLUP_CACHE_SECONDS, so every game a model scores in a run shares one
+        read.
+        """
+        key = (model, sport, days)
+        with _rollup_lock:
+            cached = _rollup_cache.get(key)
+            if cached and cached[0] > time.monotonic():
+                return cached[1]
+
+        cutoff_day = (datetime.utcnow() - timedelta(days=days)).strftime("%Y-%m-%d")
+        if self._rollups_cover_window(model, sport, cutoff_day):
+            performance = self._sum_rollups(model, sport, cutoff_day)
+        else:
+            performance = self.get_model_performance(model, sport, days=days)
+
+        with _rollup_lock:
+            _rollup_cache[key] = (time.monotonic() + ROLLUP_CACHE_SECONDS, performance)
+        return performance
+
+    def _rollups_cover_window(self, model: str, sport: str, cutoff_day: str) -> bool:
+        """Whether the model has a rollup on or before the first day of the window"""
+        try:
+            response = self.table.query(
+                KeyConditionExpression="pk = :pk AND sk BETWEEN :first AND :cutoff",
+                ExpressionAttributeValues={
+                    ":pk": f"MODEL_ROLLUP#{model}#{sport}",
+                    ":first": "DAY#",
+                    ":cutoff": f"DAY#{cutoff_day}",
+                },
+                ProjectionExpression="sk",
+                Limit=1,
+            )
+            return bool(response.get("Items"))
+        except Exception as e:
+            logger.error(f"Error checking rollup coverage for {model}/{sport}: {e}")
+            return False
+
+    def _sum_rollups(self, model: str, sport: str, cutoff_day: str) -> Dict[str, Any]:
+        totals: Dict[str, float] = {}
+        try:
+            for item in iter_query(
+                self.table,
+                KeyConditionExpression="pk = :pk AND sk >= :cutoff",
+                ExpressionAttributeValues={
+                    ":pk": f"MODEL_ROLLUP#{model}#{sport}",
+                    ":cutoff": f"DAY#{cutoff_day}",
+                },
+            ):
+                for name, value in item.items():
+                    if isinstance(value, (int, float, Decimal)) and not isinstance(value, bool):
+                        totals[name] = totals.get(name, 0.0) + float(value)
+        except Exception as e:
+            logger.error(f"Error reading performance rollup for {model}/{sport}: {e}")
+
+        total = int(totals.get("total", 0))
+        correct = int(totals.get("correct", 0))
+        calibration = {}
+        for label, _, _ in CONFIDENCE_BUCKETS:
+            bucket_total = totals.get(f"bucket_{label}_total", 0)
+            if bucket_total:
+                calibration[label] = totals.get(f"bucket_{label}_correct", 0) / bucket_total
+
+        return {
+            "total_predictions": total,
+            "correct_predictions": correct,
+            "accuracy": correct / total if total else 0.0,
+            "avg_confidence": totals.get("confidence_sum", 0.0) / total if total else 0.0,
+            "confidence_calibration": calibration,
+            "roi": (totals.get("return_sum", 0.0) - total * 100) / (total * 100) if total else 0.0,
+        }
 
     def get_model_performance(
         self, model: str, sport: str, days: int = 30
@@ -46,7 +227,9 @@ class ModelPerformanceTracker:
             for bookmaker in SUPPORTED_BOOKMAKERS:
                 for bet_type in ["game", "prop"]:
                     analysis_time_pk = f"ANALYSIS#{sport}#{bookmaker}#{model}#{bet_type}"
-                    response = self.table.query(
+                    all_analyses.extend(iter_query(
+                        self.table,
+                        attributes=self.PERFORMANCE_ATTRIBUTES,
                         IndexName="AnalysisTimeGSI",
                         KeyConditionExpression="analysis_time_pk = :pk AND commence_time >= :cutoff",
                         FilterExpression="attribute_exists(actual_outcome)",
@@ -54,8 +237,7 @@ class ModelPerformanceTracker:
                             ":pk": analysis_time_pk,
                             ":cutoff": cutoff_time,
                         },
-                    )
-                    all_analyses.extend(response.get("Items", []))
+                    ))
 
             analyses = all_analyses
 
@@ -6,8 +6,12 @@ Supports both team and player-level sentiment analysis.
 """
 
 import os
+import re
+import threading
+import time
+from collections import defaultdict
 from datetime import datetime, timedelta
-from typing import Dict, List
+from typing import Dict, List, Set
 
 import boto3
 
@@ -17,35 +21,140 @@ TABLE_NAME = os.environ.get("BETS_TABLE", os.environ.get("TABLE_NAME", "carpool-
 table = dynamodb.Table(TABLE_NAME)
 
 
-def get_news_sentiment(sport: str, search_terms: List[str], hours: int = 48) -> Dict:
-    """Get aggregated news sentiment for team or player"""
-    pk = f"NEWS#{sport}"
-    cutoff = (datetime.utcnow() - timedelta(hours=hours)).isoformat()
-
-    response = table.query(
-        KeyConditionExpression="pk = :pk AND sk > :cutoff",
-        ExpressionAttributeValues={":pk": pk, ":cutoff": cutoff},
-    )
-
-    items = response.get("Items", [])
-
-    # Find news mentioning any of the search terms
-    relevant_news = []
-    for item in items:
-        text = f"{item.get('headline', '')} {item.get('description', '')}".lower()
-        if any(term.lower() in text for term in search_terms):
-            relevant_news.append(item)
-
+IMPACT_WEIGHTS = {"high": 3.0, "medium": 2.0, "low": 1.0}
+INDEX_TTL_SECONDS = 600
+
+# Last-word nicknames collide within these sports: soccer clubs share "United"
+# and "City", and college programs share "Wildcats", "Tigers", "Bulldogs"...
+NO_NICKNAME_SPORTS = {
+    "soccer_epl",
+    "soccer_usa_mls",
+    "americanfootball_ncaaf",
+    "basketball_ncaab",
+    "basketball_wncaab",
+}
+
+# Nicknames longer than the last word, where the last word alone is shared
+NICKNAMES = {
+    "baseball_mlb": {"Boston Red Sox": "Red Sox", "Chicago White Sox": "White Sox"},
+}
+
+_indexes: Dict[tuple, "NewsIndex"] = {}
+_indexes_lock = threading.Lock()
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase and collapse punctuation so phrases match on word boundaries"""
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", text.lower()).split())
+
+
+def team_aliases(sport: str, team_name: str) -> List[str]:
+    """Full team name plus its nickname ("Los Angeles Lakers" -> "Lakers")"""
+    aliases = [team_name]
+    words = team_name.split()
+    nickname = NICKNAMES.get(sport, {}).get(team_name)
+    if nickname:
+        aliases.append(nickname)
+    elif len(words) > 1 and sport not in NO_NICKNAME_SPORTS:
+        aliases.append(words[-1])
+    return aliases
+
+
+class NewsIndex:
+    """
+    One sport's news window with an inverted token -> article index.
+
+    Entity lookups intersect posting lists and then confirm the full phrase,
+    so each lookup touches only the articles that can mention the entity.
+    Sentiment aggregates are memoized per entity.
+    """
+
+    def __init__(self, sport: str, items: List[Dict], loaded_at: float = None):
+        self.sport = sport
+        self.items = items
+        self.loaded_at = loaded_at if loaded_at is not None else time.monotonic()
+        self._texts: List[str] = []
+        self._postings: Dict[str, Set[int]] = defaultdict(set)
+        self._aggregates: Dict[tuple, Dict] = {}
+        self._lock = threading.Lock()
+
+        for i, item in enumerate(items):
+            text = normalize_text(f"{item.get('headline', '')} {item.get('description', '')}")
+            self._texts.append(f" {text} ")
+            for token in set(text.split()):
+                self._postings[token].add(i)
+
+    @classmethod
+    def load(cls, sport: str, hours: int = 48) -> "NewsIndex":
+        cutoff = (datetime.utcnow() - timedelta(hours=hours)).isoformat()
+        query_kwargs = {
+            "KeyConditionExpression": "pk = :pk AND sk > :cutoff",
+            "ExpressionAttributeValues": {":pk": f"NEWS#{sport}", ":cutoff": cutoff},
+        }
+        items = []
+        while True:
+            response = table.query(**query_kwargs)
+            items.extend(response.get("Items", []))
+            if "LastEvaluatedKey" not in response:
+                break
+            query_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+        return cls(sport, items)
+
+    def articles_for(self, search_terms: List[str]) -> List[Dict]:
+        """Articles whose headline or description mentions any search term"""
+        matches: Set[int] = set()
+        for term in search_terms:
+            phrase = normalize_text(term)
+            tokens = phrase.split()
+            if not tokens:
+                continue
+            candidates = set.intersection(*(self._postings.get(t, set()) for t in tokens))
+            matches.update(i for i in candidates if f" {phrase} " in self._texts[i])
+        return [self.items[i] for i in sorted(matches)]
+
+    def sentiment(self, search_terms: List[str]) -> Dict:
+        """Weighted sentiment aggregate for an entity, memoized per term set"""
+        key = tuple(sorted(normalize_text(t) for t in search_terms))
+        with self._lock:
+            if key in self._aggregates:
+                return self._aggregates[key]
+
+        result = aggregate_sentiment(self.articles_for(search_terms))
+        with self._lock:
+            self._aggregates[key] = result
+        return result
+
+
+def get_news_index(sport: str, hours: int = 48) -> NewsIndex:
+    """Shared per-sport index, reloaded after INDEX_TTL_SECONDS"""
+    key = (sport, hours)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index and time.monotonic() - index.loaded_at < INDEX_TTL_SECONDS:
+            return index
+
+    index = NewsIndex.load(sport, hours)
+    with _indexes_lock:
+        _indexes[key] = index
+    return index
+
+
+def clear_news_index():
+    with _indexes_lock:
+        _indexes.clear()
+
+
+def aggregate_sentiment(relevant_news: List[Dict]) -> Dict:
+    """Impact-weighted sentiment over a set of articles"""
     if not relevant_news:
         return {"sentiment_score": 0.0, "impact_score": 0.0, "news_count": 0}
 
     # Calculate weighted sentiment score
-    impact_weights = {"high": 3.0, "medium": 2.0, "low": 1.0}
     total_weight = 0
     weighted_sentiment = 0
 
     for news in relevant_news:
-        weight = impact_weights.get(news.get("impact", "low"), 1.0)
+        weight = IMPACT_WEIGHTS.get(news.get("impact", "low"), 1.0)
         sentiment = float(news.get("sentiment_positive", 0.5)) - float(
             news.get("sentiment_negative", 0.5)
         )
@@ -62,6 +171,11 @@ def get_news_sentiment(sport: str, search_terms: List[str], hours: int = 48) ->
     }
 
 
+def get_news_sentiment(sport: str, search_terms: List[str], hours: int = 48) -> Dict:
+    """Get aggregated news sentiment for team or player"""
+    return get_news_index(sport, hours).sentiment(search_terms)
+
+
 def get_player_sentiment(sport: str, player_name: str, hours: int = 48) -> Dict:
     """Get news sentiment for a specific player"""
     return get_news_sentiment(sport, [player_name], hours)
@@ -69,7 +183,7 @@ def get_player_sentiment(sport: str, player_name: str, hours: int = 48) -> Dict:
 
 def get_team_sentiment(sport: str, team_name: str, hours: int = 48) -> Dict:
     """Get news sentiment for a team"""
-    return get_news_sentiment(sport, [team_name], hours)
+    return get_news_sentiment(sport, team_aliases(sport, team_name), hours)
 
 
 def enrich_game_with_news(game_info: Dict) -> Dict:
@@ -8,6 +8,8 @@ from datetime import datetime, timedelta
 import boto3
 from boto3.dynamodb.conditions import Key
 
+from dao import ReadStats, iter_scan
+
 dynamodb = boto3.resource("dynamodb")
 BETS_TABLE = os.environ.get("BETS_TABLE", "carpool-bets-v2-dev")
 bets_table = dynamodb.Table(BETS_TABLE)
@@ -21,16 +23,17 @@ def handler(event, context):
     deleted_count = 0
 
     try:
-        # Scan for active games older than 7 days
-        response = bets_table.scan(
+        # Scan for active games older than 7 days, streaming only the keys
+        stats = ReadStats()
+        stale_count = 0
+        for item in iter_scan(
+            bets_table,
+            attributes=["pk", "sk"],
+            stats=stats,
             FilterExpression="begins_with(pk, :prefix) AND commence_time < :cutoff",
             ExpressionAttributeValues={":prefix": "GAME#", ":cutoff": cutoff},
-        )
-
-        items = response.get("Items", [])
-        print(f"Found {len(items)} stale game records")
-
-        for item in items:
+        ):
+            stale_count += 1
             pk = item.get("pk")
             sk = item.get("sk")
 
@@ -48,6 +51,10 @@ def handler(event, context):
             bets_table.delete_item(Key={"pk": pk, "sk": sk})
             deleted_count += 1
 
+        print(
+            f"Found {stale_count} stale game records across {stats.pages} pages "
+            f"({stats.capacity_units:.1f} RCU)"
+        )
         print(f"Deleted {deleted_count} stale odds records")
 
         return {"statusCode": 200, "deleted_count": deleted_count}
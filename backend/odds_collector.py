@@ -1,15 +1,21 @@
+import hashlib
 import json
 import os
+import random
+import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from decimal import Decimal
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Set, Tuple
 
 import boto3
 import requests
 
-from constants import SUPPORTED_SPORTS
+from constants import CATALOG_KEY, SUPPORTED_SPORTS
+from dynamo_batch_writer import BufferedBatchWriter
 
+BATCH_GET_ATTEMPTS = 5
+BATCH_GET_BASE_DELAY = 0.05  # Seconds; doubles per retry of UnprocessedKeys
 
 def get_secret(secret_arn: str) -> str:
     """Retrieve secret from AWS Secrets Manager"""
@@ -29,6 +35,31 @@ def convert_floats_to_decimal(obj):
     return obj
 
 
+def outcomes_hash(outcomes: List[Dict[str, Any]]) -> str:
+    """Stable hash of a market's outcomes, independent of order and numeric type"""
+
+    def canonical(value):
+        if isinstance(value, bool):
+            return value
+        if isinstance(value, (int, float, Decimal)):
+            return str(Decimal(str(value)).normalize())
+        if isinstance(value, dict):
+            return {k: canonical(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [canonical(v) for v in value]
+        return value
+
+    normalized = sorted(
+        (canonical(o) for o in outcomes),
+        key=lambda o: json.dumps(o, sort_keys=True),
+    )
+    return hashlib.sha256(json.dumps(normalized, sort_keys=True).encode()).hexdigest()
+
+
+# Catalog values already recorded by this container, to skip redundant updates
+_catalog_seen = {"sports": set(), "bookmakers": set()}
+
+
 class OddsCollector:
     def __init__(self):
         from dao import BettingDAO
@@ -175,36 +206,24 @@ class OddsCollector:
                         print(f"Error processing props for {event_id}: {str(e)}")
                         continue
 
-    def store_odds(self, sport: str, odds_data: List[Dict[str, Any]]):
-        """Store odds in DynamoDB with smart updating - only create new records if data changed"""
+    def store_odds(self, sport: str, odds_data: List[Dict[str, Any]]) -> Dict[str, int]:
+        """Store odds in DynamoDB with smart updating - only create new records if data changed
 
+        Existing LATEST pointers are read with batch_get_item and compared by
+        outcome hash in memory. Changed markets get a historical snapshot plus a
+        new LATEST pointer; unchanged ones only get their timestamp refreshed.
+        All writes go through one batched writer.
+        """
+        timestamp = datetime.utcnow().isoformat()
+        records = []
         for game in odds_data:
             game_id = game["id"]
-
             for bookmaker in game["bookmakers"]:
                 for market in bookmaker["markets"]:
-                    pk = f"GAME#{game_id}"
-                    sk_latest = f"{bookmaker['key']}#{market['key']}#LATEST"
-
-                    # Check if latest record exists and if data has changed
                     try:
-                        existing_response = self.table.get_item(
-                            Key={"pk": pk, "sk": sk_latest}
-                        )
-                        existing_item = existing_response.get("Item")
-
-                        # Compare outcomes to see if odds changed
                         new_outcomes = convert_floats_to_decimal(market["outcomes"])
-                        data_changed = True
-
-                        if existing_item:
-                            existing_outcomes = existing_item.get("outcomes", [])
-                            data_changed = new_outcomes != existing_outcomes
-
-                        timestamp = datetime.utcnow().isoformat()
-
-                        item_data = {
-                            "pk": pk,
+                        records.append({
+                            "pk": f"GAME#{game_id}",
                             "sport": sport,
                             "home_team": game["home_team"],
                             "away_team": game["away_team"],
@@ -212,51 +231,120 @@ class OddsCollector:
                             "market_key": market["key"],
                             "bookmaker": bookmaker["key"],
                             "outcomes": new_outcomes,
+                            "outcomes_hash": outcomes_hash(new_outcomes),
                             "updated_at": timestamp,
-                        }
+                        })
+                    except Exception as e:
+                        print(f"Error processing odds for {game_id}: {str(e)}")
 
-                        if data_changed:
-                            print(
-                                f"Data changed for {pk} {sk_latest} - creating new records"
-                            )
-                            # Store historical snapshot with new timestamp (no active_bet_pk)
-                            sk_historical = (
-                                f"{bookmaker['key']}#{market['key']}#{timestamp}"
-                            )
-                            self.table.put_item(Item={**item_data, "sk": sk_historical})
+        existing, unread = self._get_latest_records(
+            [(r["pk"], f"{r['bookmaker']}#{r['market_key']}#LATEST") for r in records]
+        )
 
-                            # Update latest pointer with new data, timestamp, and sparse index key
-                            latest_item = {
-                                **item_data,
-                                "sk": sk_latest,
-                                "latest": True,
-                                "active_bet_pk": f"GAME#{sport}",
-                            }
-                            self.table.put_item(Item=latest_item)
-                            print(
-                                f"Created historical record {sk_historical} and updated LATEST"
-                            )
-                        else:
-                            print(
-                                f"Data unchanged for {pk} {sk_latest} - updating timestamp to {timestamp}"
-                            )
-                            # Data unchanged, just update timestamp on existing LATEST record
-                            response = self.table.update_item(
-                                Key={"pk": pk, "sk": sk_latest},
-                                UpdateExpression="SET updated_at = :timestamp, active_bet_pk = :active_pk",
-                                ExpressionAttributeValues={
-                                    ":timestamp": timestamp,
-                                    ":active_pk": f"GAME#{sport}",
-                                },
-                                ReturnValues="ALL_NEW",
-                            )
-                            print(
-                                f"Updated timestamp: {response.get('Attributes', {}).get('updated_at', 'FAILED')}"
-                            )
+        writer = BufferedBatchWriter(self.table, metric_namespace="SportsAnalytics/OddsCollector")
+        counts = {"changed": 0, "unchanged": 0, "skipped": 0}
+        for item_data in records:
+            sk_prefix = f"{item_data['bookmaker']}#{item_data['market_key']}"
+            if (item_data["pk"], f"{sk_prefix}#LATEST") in unread:
+                # Couldn't tell whether it changed; next run will
+                counts["skipped"] += 1
+                continue
+            existing_item = existing.get((item_data["pk"], f"{sk_prefix}#LATEST"))
+
+            if existing_item and outcomes_hash(existing_item.get("outcomes", [])) == item_data["outcomes_hash"]:
+                # Data unchanged, just refresh the timestamp on the existing LATEST record
+                writer.put({
+                    **existing_item,
+                    "updated_at": timestamp,
+                    "active_bet_pk": f"GAME#{sport}",
+                })
+                counts["unchanged"] += 1
+            else:
+                # Store historical snapshot with new timestamp (no active_bet_pk)
+                writer.put({**item_data, "sk": f"{sk_prefix}#{timestamp}"})
+
+                # Update latest pointer with new data, timestamp, and sparse index key
+                writer.put({
+                    **item_data,
+                    "sk": f"{sk_prefix}#LATEST",
+                    "latest": True,
+                    "active_bet_pk": f"GAME#{sport}",
+                })
+                counts["changed"] += 1
+
+        writer.flush()
+        writer.emit_metrics([{"Name": "Sport", "Value": sport}])
+        if records:
+            self.update_catalog({sport}, {r["bookmaker"] for r in records})
+        counts["failed"] = writer.items_failed
+        print(
+            f"Stored odds for {sport}: {counts['changed']} changed, "
+            f"{counts['unchanged']} unchanged, {counts['skipped']} skipped, "
+            f"{writer.items_written} items written"
+        )
+        return counts
+
+    def update_catalog(self, sports: set, bookmakers: set):
+        """Add newly seen sports and bookmakers to the catalog record served by /sports and /bookmakers"""
+        new_sports = set(sports) - _catalog_seen["sports"]
+        new_bookmakers = set(bookmakers) - _catalog_seen["bookmakers"]
+        if not new_sports and not new_bookmakers:
+            return
+
+        updates = []
+        values = {":updated_at": datetime.utcnow().isoformat()}
+        if new_sports:
+            updates.append("sports :sports")
+            values[":sports"] = new_sports
+        if new_bookmakers:
+            updates.append("bookmakers :bookmakers")
+            values[":bookmakers"] = new_bookmakers
 
-                    except Exception as e:
-                        print(f"Error processing odds for {game_id}: {str(e)}")
-                        continue
+        try:
+            self.table.update_item(
+                Key=CATALOG_KEY,
+                UpdateExpression=f"ADD {', '.join(updates)} SET updated_at = :updated_at",
+                ExpressionAttributeValues=values,
+            )
+            _catalog_seen["sports"] |= new_sports
+            _catalog_seen["bookmakers"] |= new_bookmakers
+        except Exception as e:
+            print(f"Error updating catalog: {e}")
+
+    def _get_latest_records(
+        self, keys: List[tuple]
+    ) -> Tuple[Dict[tuple, Dict[str, Any]], Set[tuple]]:
+        """
+        Read LATEST pointers for many (pk, sk) keys with batch_get_item
+
+        Returns (found, unread): keys still unprocessed after the retries, or
+        in a chunk whose read failed, are unread rather than missing.
+        """
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        unread = set()
+        client = self.table.meta.client
+        table_name = self.table.name
+        for i in range(0, len(keys), 100):
+            chunk = keys[i:i + 100]
+            request = {table_name: {"Keys": [{"pk": pk, "sk": sk} for pk, sk in chunk]}}
+            try:
+                for attempt in range(BATCH_GET_ATTEMPTS):
+                    if attempt:
+                        delay = BATCH_GET_BASE_DELAY * (2 ** attempt)
+                        time.sleep(random.uniform(delay / 2, delay))
+                    response = client.batch_get_item(RequestItems=request)
+                    for item in response.get("Responses", {}).get(table_name, []):
+                        found[(item["pk"], item["sk"])] = item
+                    request = response.get("UnprocessedKeys")
+                    if not request:
+                        break
+                if request:
+                    unread.update((k["pk"], k["sk"]) for k in request[table_name]["Keys"])
+            except Exception as e:
+                print(f"Error reading existing odds: {e}")
+                unread.update(key for key in chunk if key not in found)
+        return found, unread
 
     def collect_props_for_sport(self, sport: str, limit: int = None) -> int:
         """Collect player props for a sport using existing game data with parallel processing"""
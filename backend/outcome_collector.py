@@ -1,14 +1,27 @@
 import os
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 from datetime import datetime
 from decimal import Decimal
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 import boto3
 import requests
 from boto3.dynamodb.conditions import Key
 
-from constants import SUPPORTED_SPORTS, SYSTEM_MODELS
+from constants import SUPPORTED_SPORTS
+from dao import iter_query
+from dynamo_batch_writer import BufferedBatchWriter
 from elo_calculator import EloCalculator
+from ml.types import ANALYSIS_BY_GAME_PREFIX
+from model_performance import ModelPerformanceTracker
+
+SETTLEMENT_WORKERS = 8  # Games settled at once; within boto3's default pool of 10 connections
+BENNY_VERSIONS = ("BENNY", "BENNY_V3")
+METRIC_NAMESPACE = "SportsAnalytics/OutcomeCollector"
 
 
 class OutcomeCollector:
@@ -18,9 +31,23 @@ class OutcomeCollector:
         self.odds_api_key = odds_api_key
         self.base_url = "https://api.the-odds-api.com/v4"
         self.elo_calculator = EloCalculator()
+        self.performance_tracker = ModelPerformanceTracker(table=self.table)
+        self.writer = None  # BufferedBatchWriter during collect_recent_outcomes
+        self.stage_seconds = defaultdict(float)
+        self.stage_counts = defaultdict(int)
+        self._stats_lock = threading.Lock()
+        self._bankroll_locks = {pk: threading.Lock() for pk in BENNY_VERSIONS}
 
     def collect_recent_outcomes(self, days_back: int = 3) -> Dict[str, int]:
-        """Collect outcomes for games from the last N days (max 3)"""
+        """
+        Collect outcomes for games from the last N days (max 3).
+
+        Games are settled concurrently, SETTLEMENT_WORKERS at a time. Insert-only
+        records (outcomes, prop outcomes, archived odds) go through one batch
+        writer; bankroll read-modify-writes hold a per-version lock. Parlay
+        legs and Elo updates run afterwards in game order: a parlay can span
+        several of the games, and each rating update depends on the last.
+        """
         results = {
             "updated_analysis": 0,
             "stored_outcomes": 0,
@@ -32,32 +59,122 @@ class OutcomeCollector:
         if days_back < 1 or days_back > 3:
             days_back = 3
 
-        # Get completed games from odds API
-        completed_games = self._get_completed_games(days_back)
+        self.stage_seconds = defaultdict(float)
+        self.stage_counts = defaultdict(int)
+        self.writer = BufferedBatchWriter(self.table)
+        start = time.perf_counter()
 
-        for game in completed_games:
-            try:
-                # Store game outcome for H2H queries
-                self._store_outcome(game)
-                results["stored_outcomes"] += 1
+        try:
+            # Get completed games from odds API
+            with self._timed("fetch_games"):
+                completed_games = self._get_completed_games(days_back)
+
+            stored = set()
+            with ThreadPoolExecutor(max_workers=SETTLEMENT_WORKERS) as pool:
+                futures = {pool.submit(self._settle_game, game): game for game in completed_games}
+                for future in as_completed(futures):
+                    game = futures[future]
+                    try:
+                        counts = future.result()
+                    except Exception as e:
+                        print(f"Error processing game {game.get('id', 'unknown')}: {e}")
+                        continue
+                    stored.add(game.get("id"))
+                    results["stored_outcomes"] += 1
+                    results["stored_prop_outcomes"] += counts["stored_prop_outcomes"]
+                    results["updated_analysis"] += counts["updated_analysis"]
+
+            with self._timed("flush_writes"):
+                self.writer.flush()
+
+            for game in completed_games:
+                if game.get("id") in stored:
+                    with self._timed("settle_parlays"):
+                        self._settle_benny_parlays(game)
+                    with self._timed("elo"):
+                        if self._update_elo_ratings(game):
+                            results["updated_elo"] += 1
+        finally:
+            writer, self.writer = self.writer, None
+
+        self._emit_settlement_metrics(
+            len(completed_games), time.perf_counter() - start, writer
+        )
+        return results
 
-                # Update Elo ratings
-                if self._update_elo_ratings(game):
-                    results["updated_elo"] += 1
+    def _settle_game(self, game: Dict[str, Any]) -> Dict[str, int]:
+        """Run every settlement stage for one completed game"""
+        # Store game outcome for H2H queries
+        with self._timed("store_outcome"):
+            self._store_outcome(game)
 
-                # Store prop outcomes for player tracking
-                prop_count = self._store_prop_outcomes(game)
-                results["stored_prop_outcomes"] += prop_count
+        # Store prop outcomes for player tracking
+        with self._timed("prop_outcomes"):
+            prop_count = self._store_prop_outcomes(game)
 
-                # Update analysis with outcome
-                analysis_updates = self._update_analysis_outcomes(game)
-                results["updated_analysis"] += analysis_updates
+        # Update analysis with outcome
+        with self._timed("verify_analysis"):
+            analysis_updates = self._update_analysis_outcomes(game)
 
-            except Exception as e:
-                print(f"Error processing game {game.get('id', 'unknown')}: {e}")
-                continue
+        with self._timed("settle_bets"):
+            self._settle_benny_bets(game)
 
-        return results
+        # Archive odds to historical records
+        with self._timed("archive_odds"):
+            self._archive_game_odds(game)
+
+        return {"stored_prop_outcomes": prop_count, "updated_analysis": analysis_updates}
+
+    @contextmanager
+    def _timed(self, stage: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._stats_lock:
+                self.stage_seconds[stage] += elapsed
+                self.stage_counts[stage] += 1
+
+    def _put(self, item: Dict[str, Any]) -> None:
+        """Insert-only write, batched while a collection run is in progress"""
+        if self.writer is not None:
+            self.writer.put(item)
+        else:
+            self.table.put_item(Item=item)
+
+    def _emit_settlement_metrics(
+        self, game_count: int, total_seconds: float, writer: BufferedBatchWriter
+    ) -> None:
+        """Publish per-stage latency (average ms per call) and run totals"""
+        print(
+            f"Settled {game_count} games in {total_seconds:.1f}s: "
+            + ", ".join(
+                f"{stage}={seconds:.1f}s" for stage, seconds in self.stage_seconds.items()
+            )
+        )
+        metric_data = [
+            {"MetricName": "SettlementDuration", "Value": total_seconds, "Unit": "Seconds"},
+            {"MetricName": "GamesSettled", "Value": game_count, "Unit": "Count"},
+            {"MetricName": "BatchItemsWritten", "Value": writer.items_written, "Unit": "Count"},
+            {"MetricName": "BatchItemsFailed", "Value": writer.items_failed, "Unit": "Count"},
+        ]
+        for stage, seconds in self.stage_seconds.items():
+            metric_data.append({
+                "MetricName": "StageLatency",
+                "Value": seconds / self.stage_counts[stage] * 1000,
+                "Unit": "Milliseconds",
+                "Dimensions": [{"Name": "Stage", "Value": stage}],
+            })
+        try:
+            cloudwatch = boto3.client("cloudwatch", region_name="us-east-1")
+            # put_metric_data accepts at most 20 metrics per call
+            for i in range(0, len(metric_data), 20):
+                cloudwatch.put_metric_data(
+                    Namespace=METRIC_NAMESPACE, MetricData=metric_data[i:i + 20]
+                )
+        except Exception as e:
+            print(f"Failed to emit settlement metrics: {e}")
 
     def _get_completed_games(self, days_back: int) -> List[Dict[str, Any]]:
         """Get completed games from The Odds API"""
@@ -173,8 +290,8 @@ class OutcomeCollector:
             completed_at = game.get("completed_at", datetime.utcnow().isoformat())
 
             # Store main outcome + team-specific records
-            self.table.put_item(
-                Item={
+            self._put(
+                {
                     "pk": f"OUTCOME#{game['sport']}#{game['id']}",
                     "sk": "RESULT",
                     "game_id": game["id"],
@@ -195,8 +312,8 @@ class OutcomeCollector:
                 (game["home_team"], home_normalized),
                 (game["away_team"], away_normalized),
             ]:
-                self.table.put_item(
-                    Item={
+                self._put(
+                    {
                         "pk": f"TEAM_OUTCOME#{game['sport']}#{team_norm}",
                         "sk": f"{completed_at}#{game['id']}",
                         "team_outcome_pk": f"TEAM#{game['sport']}#{team_norm}",
@@ -267,8 +384,8 @@ class OutcomeCollector:
                     # Normalize player name for PK
                     player_normalized = player_name.lower().replace(" ", "_")
 
-                    self.table.put_item(
-                        Item={
+                    self._put(
+                        {
                             "pk": f"PROP_OUTCOME#{sport}#{game_id}#{player_normalized}",
                             "sk": f"RESULT#{market_key}",
                             "game_id": game_id,
@@ -297,48 +414,25 @@ class OutcomeCollector:
     def _update_analysis_outcomes(self, game: Dict[str, Any]) -> int:
         """Update analysis records with actual outcomes"""
         updates = 0
-        sport = game["sport"]
-        game_id = game["id"]
 
         try:
-            # Query AnalysisTimeGSI for each model/bet_type combination
-            models = SYSTEM_MODELS
-            bet_types = ["game", "prop"]
-            bookmakers = ["fanduel"]
-
-            for model in models:
-                for bet_type in bet_types:
-                    for bookmaker in bookmakers:
-                        pk = f"ANALYSIS#{sport}#{bookmaker}#{model}#{bet_type}"
-
-                        response = self.table.query(
-                            IndexName="AnalysisTimeGSI",
-                            KeyConditionExpression="analysis_time_pk = :pk",
-                            FilterExpression="game_id = :game_id",
-                            ExpressionAttributeValues={
-                                ":pk": pk,
-                                ":game_id": game_id,
-                            },
-                        )
-
-                        items = response.get("Items", [])
-
-                        # Separate LATEST and INVERSE records
-                        latest_items = [
-                            item for item in items if "#LATEST" in item.get("sk", "")
-                        ]
+            # Every model's LATEST and INVERSE records for the game, from GameIndex
+            items = list(iter_query(
+                self.table,
+                IndexName="GameIndex",
+                KeyConditionExpression=Key("game_index_pk").eq(f"{ANALYSIS_BY_GAME_PREFIX}{game['id']}"),
+            ))
 
-                        updates += self._process_analysis_items(latest_items, game)
+            latest_items = [item for item in items if "#LATEST" in item.get("sk", "")]
+            inverse_items = {
+                (item["pk"], item["sk"]): item
+                for item in items if "#INVERSE" in item.get("sk", "")
+            }
 
-                        # Also verify inverse predictions (only pass LATEST items)
-                        updates += self._verify_inverse_predictions(latest_items, game)
+            updates += self._process_analysis_items(latest_items, game)
 
-            # Settle Benny bets for this game
-            self._settle_benny_bets(game)
-            self._settle_benny_parlays(game)
-
-            # Archive odds to historical records
-            self._archive_game_odds(game)
+            # Also verify inverse predictions (only pass LATEST items)
+            updates += self._verify_inverse_predictions(latest_items, game, inverse_items)
 
         except Exception as e:
             print(f"Error updating analyses for game {game['id']}: {e}")
@@ -346,9 +440,17 @@ class OutcomeCollector:
         return updates
 
     def _verify_inverse_predictions(
-        self, original_items: List[Dict[str, Any]], game: Dict[str, Any]
+        self,
+        original_items: List[Dict[str, Any]],
+        game: Dict[str, Any],
+        inverse_items: Optional[Dict[tuple, Dict[str, Any]]] = None,
     ) -> int:
-        """Verify inverse predictions for the given original predictions"""
+        """
+        Verify inverse predictions for the given original predictions.
+
+        inverse_items maps (pk, sk) to INVERSE records already read; any not in
+        it are fetched with get_item.
+        """
         updates = 0
 
         try:
@@ -357,14 +459,16 @@ class OutcomeCollector:
                 inverse_sk = original_item.get("sk", "").replace("#LATEST", "#INVERSE")
 
                 try:
-                    inverse_response = self.table.get_item(
-                        Key={"pk": original_item["pk"], "sk": inverse_sk}
-                    )
+                    inverse_item = (inverse_items or {}).get((original_item["pk"], inverse_sk))
+                    if inverse_item is None:
+                        inverse_response = self.table.get_item(
+                            Key={"pk": original_item["pk"], "sk": inverse_sk}
+                        )
 
-                    if "Item" not in inverse_response:
-                        continue
+                        if "Item" not in inverse_response:
+                            continue
 
-                    inverse_item = inverse_response["Item"]
+                        inverse_item = inverse_response["Item"]
 
                     # Verify inverse prediction
                     if inverse_item.get("analysis_type") == "game":
@@ -464,6 +568,7 @@ class OutcomeCollector:
                     },
                 )
                 updates += 1
+                self._record_rollup(item, analysis_correct)
                 print(
                     f"Verified original: {model} - Prediction: {item.get('prediction')}, Correct: {analysis_correct}"
                 )
@@ -493,9 +598,25 @@ class OutcomeCollector:
                     },
                 )
                 updates += 1
+                self._record_rollup(item, prop_correct)
 
         return updates
 
+    def _record_rollup(self, item: Dict[str, Any], correct: bool) -> None:
+        """Count a newly verified analysis in its model's performance rollup"""
+        # Games are re-verified on later runs; only count the first verification
+        if item.get("outcome_verified_at"):
+            return
+        self.performance_tracker.record_outcome(
+            item.get("model", "consensus"),
+            item.get("sport"),
+            item.get("commence_time"),
+            correct,
+            float(item.get("confidence", 0)),
+            item.get("recommended_odds", -110),
+            item.get("analysis_type", "game"),
+        )
+
     def _check_game_analysis_accuracy(
         self, analysis_result: str, winner: str, game: Dict[str, Any]
     ) -> bool:
@@ -739,7 +860,7 @@ class OutcomeCollector:
             game_id = game["id"]
 
             # Settle bets for both v1 and v3
-            for version_pk in ["BENNY", "BENNY_V3"]:
+            for version_pk in BENNY_VERSIONS:
                 # Query for Benny bets on this game
                 response = self.table.query(
                     KeyConditionExpression="pk = :pk",
@@ -756,13 +877,7 @@ class OutcomeCollector:
                 if not bets:
                     continue
 
-                # Get current bankroll
-                bankroll_response = self.table.get_item(
-                    Key={"pk": version_pk, "sk": "BANKROLL"}
-                )
-                current_bankroll = Decimal(
-                    str(bankroll_response.get("Item", {}).get("amount", "100.00"))
-                )
+                total_payout = Decimal("0")
 
                 for bet in bets:
                     bet_amount = Decimal(str(bet.get("bet_amount", 0)))
@@ -835,8 +950,7 @@ class OutcomeCollector:
                         },
                     )
 
-                    # Update bankroll
-                    current_bankroll += payout
+                    total_payout += payout
 
                     version_label = "v1" if version_pk == "BENNY" else "v3"
                     print(
@@ -844,31 +958,7 @@ class OutcomeCollector:
                     )
 
                 # Save updated bankroll (after processing all bets for this version)
-                timestamp = datetime.utcnow().isoformat()
-                bankroll_item = bankroll_response.get("Item", {})
-
-                # Update current bankroll
-                self.table.put_item(
-                    Item={
-                        "pk": version_pk,
-                        "sk": "BANKROLL",
-                        "amount": current_bankroll,
-                        "last_reset": bankroll_item.get("last_reset", timestamp),
-                        "updated_at": timestamp,
-                    }
-                )
-
-                # Store history snapshot
-                self.table.put_item(
-                    Item={
-                        "pk": version_pk,
-                        "sk": f"BANKROLL#{timestamp}",
-                        "amount": current_bankroll,
-                        "updated_at": timestamp,
-                    }
-                )
-
-                print(f"Updated Benny {version_label} bankroll: ${current_bankroll}")
+                self._credit_bankroll(version_pk, total_payout)
 
             # Settle shadow bets (no bankroll impact)
             self._settle_shadow_bets(game, version_pk)
@@ -879,6 +969,45 @@ class OutcomeCollector:
 
             traceback.print_exc()
 
+    def _credit_bankroll(self, version_pk: str, amount: Decimal, source: str = "") -> Decimal:
+        """
+        Add settled payouts to a Benny version's bankroll and store a history snapshot.
+
+        Games settle concurrently, so the read-modify-write holds that version's
+        lock; otherwise two games could both read the same starting balance.
+        """
+        with self._bankroll_locks[version_pk]:
+            bankroll_response = self.table.get_item(Key={"pk": version_pk, "sk": "BANKROLL"})
+            bankroll_item = bankroll_response.get("Item", {})
+            current_bankroll = Decimal(str(bankroll_item.get("amount", "100.00"))) + amount
+            timestamp = datetime.utcnow().isoformat()
+
+            # Update current bankroll
+            self.table.put_item(
+                Item={
+                    "pk": version_pk,
+                    "sk": "BANKROLL",
+                    "amount": current_bankroll,
+                    "last_reset": bankroll_item.get("last_reset", timestamp),
+                    "updated_at": timestamp,
+                }
+            )
+
+            # Store history snapshot
+            self.table.put_item(
+                Item={
+                    "pk": version_pk,
+                    "sk": f"BANKROLL#{timestamp}",
+                    "amount": current_bankroll,
+                    "updated_at": timestamp,
+                }
+            )
+
+        version_label = "v1" if version_pk == "BENNY" else "v3"
+        suffix = f" ({source})" if source else ""
+        print(f"Updated Benny {version_label} bankroll{suffix}: ${current_bankroll}")
+        return current_bankroll
+
     def _settle_shadow_bets(self, game: Dict[str, Any], version_pk: str) -> None:
         """Settle shadow bets for pick accuracy tracking. No bankroll impact."""
         try:
@@ -925,7 +1054,7 @@ class OutcomeCollector:
         try:
             game_id = game["id"]
 
-            for version_pk in ["BENNY", "BENNY_V3"]:
+            for version_pk in BENNY_VERSIONS:
                 response = self.table.query(
                     KeyConditionExpression="pk = :pk",
                     FilterExpression="#status = :pending AND bet_type = :parlay",
@@ -941,12 +1070,7 @@ class OutcomeCollector:
                 if not parlays:
                     continue
 
-                bankroll_response = self.table.get_item(
-                    Key={"pk": version_pk, "sk": "BANKROLL"}
-                )
-                current_bankroll = Decimal(
-                    str(bankroll_response.get("Item", {}).get("amount", "100.00"))
-                )
+                total_payout = Decimal("0")
                 bankroll_changed = False
 
                 for parlay in parlays:
@@ -1019,7 +1143,7 @@ class OutcomeCollector:
                         },
                     )
 
-                    current_bankroll += payout
+                    total_payout += payout
                     bankroll_changed = True
                     version_label = "v1" if version_pk == "BENNY" else "v3"
                     won_count = sum(1 for s in statuses if s == "won")
@@ -1028,27 +1152,7 @@ class OutcomeCollector:
                     )
 
                 if bankroll_changed:
-                    timestamp = datetime.utcnow().isoformat()
-                    bankroll_item = bankroll_response.get("Item", {})
-                    self.table.put_item(
-                        Item={
-                            "pk": version_pk,
-                            "sk": "BANKROLL",
-                            "amount": current_bankroll,
-                            "last_reset": bankroll_item.get("last_reset", timestamp),
-                            "updated_at": timestamp,
-                        }
-                    )
-                    self.table.put_item(
-                        Item={
-                            "pk": version_pk,
-                            "sk": f"BANKROLL#{timestamp}",
-                            "amount": current_bankroll,
-                            "updated_at": timestamp,
-                        }
-                    )
-                    version_label = "v1" if version_pk == "BENNY" else "v3"
-                    print(f"Updated Benny {version_label} bankroll (parlays): ${current_bankroll}")
+                    self._credit_bankroll(version_pk, total_payout, "parlays")
 
         except Exception as e:
             print(f"Error settling Benny parlays for game {game.get('id')}: {e}")
@@ -1172,7 +1276,7 @@ class OutcomeCollector:
                 historical_item.pop("active_bet_pk", None)
 
                 # Store historical record
-                self.table.put_item(Item=historical_item)
+                self._put(historical_item)
                 archived_count += 1
 
             print(f"Archived {archived_count} odds records for game {game_id}")
@@ -166,3 +166,26 @@ class TestDecimalConversion(unittest.TestCase):
 
 if __name__ == "__main__":
     unittest.main()
+
+
+class TestStoreAnalysisBatched(unittest.TestCase):
+    """Test store_analysis with a batch writer"""
+
+    @patch("analysis_generator.table")
+    def test_store_analysis_queues_original_and_inverse(self, mock_table):
+        """Both predictions go to the writer instead of put_item"""
+        writer = MagicMock()
+        item = {
+            "pk": "ANALYSIS#test",
+            "sk": "consensus#game#LATEST",
+            "prediction": "Lakers",
+            "home_team": "Lakers",
+            "away_team": "Warriors",
+            "confidence": 0.75,
+            "analysis_type": "game",
+        }
+
+        store_analysis(item, writer)
+
+        assert writer.put.call_count == 2
+        mock_table.put_item.assert_not_called()
@@ -1,10 +1,15 @@
 """
 Unit tests for backtesting engine
 """
-from unittest.mock import MagicMock, patch
+import json
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, Mock, patch
 
 import pytest
 
+import weight_sweep
 from backtest_engine import BacktestEngine
 
 
@@ -163,3 +168,254 @@ class TestBacktestEngine:
 
         assert len(results) == 2
         mock_user_models_table.query.assert_called_once()
+
+
+class TestFeatureSnapshots:
+    GAMES = [
+        {
+            "game_id": f"g{i}",
+            "sport": "basketball_nba",
+            "home_team": "Lakers",
+            "away_team": "Warriors",
+            "commence_time": f"2024-01-0{i}T19:00:00Z",
+            "outcome": {"winner": "Lakers"},
+        }
+        for i in range(1, 4)
+    ]
+    CONFIG = {
+        "sport": "basketball_nba",
+        "data_sources": {"team_stats": {"enabled": True, "weight": 1.0}},
+    }
+
+    def _engine(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("backtest_features.SNAPSHOT_DIR", str(tmp_path))
+        engine = BacktestEngine()
+        evaluator = MagicMock(return_value=0.6)
+        for name in engine.evaluators:
+            engine.evaluators[name] = evaluator
+        monkeypatch.setattr(engine, "_fetch_historical_games", lambda *args: self.GAMES)
+        monkeypatch.setattr(engine, "_store_backtest", lambda result: None)
+        return engine, evaluator
+
+    def test_evaluators_see_data_as_of_commence_time(self, tmp_path, monkeypatch):
+        engine, evaluator = self._engine(tmp_path, monkeypatch)
+
+        result = engine.run_backtest("user1", "model1", self.CONFIG, "2024-01-01", "2024-01-31")
+
+        assert result["total_predictions"] == 3
+        as_of = {call.args[0]["game_id"]: call.args[0]["as_of"] for call in evaluator.call_args_list}
+        assert as_of == {g["game_id"]: g["commence_time"] for g in self.GAMES}
+
+    def test_snapshots_are_reused_across_backtests(self, tmp_path, monkeypatch):
+        engine, evaluator = self._engine(tmp_path, monkeypatch)
+        engine.run_backtest("user1", "model1", self.CONFIG, "2024-01-01", "2024-01-31")
+        first_calls = evaluator.call_count
+
+        # A fresh engine (new invocation) reads the snapshot file instead of evaluating
+        engine, evaluator = self._engine(tmp_path, monkeypatch)
+        result = engine.run_backtest("user1", "model2", self.CONFIG, "2024-01-01", "2024-01-31")
+
+        assert first_calls == 3 * len(engine.evaluators)
+        evaluator.assert_not_called()
+        assert [p["scores"]["team_stats"] for p in result["predictions"]] == [0.6, 0.6, 0.6]
+
+    def test_concurrent_loads_build_each_game_once(self, tmp_path, monkeypatch):
+        engine, evaluator = self._engine(tmp_path, monkeypatch)
+        evaluator.side_effect = lambda game: time.sleep(0.01) or 0.6
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(
+                lambda _: engine.snapshots.load("basketball_nba", self.GAMES), range(4)
+            ))
+
+        assert engine.snapshots.built == 3
+        assert evaluator.call_count == 3 * len(engine.evaluators)
+        with open(engine.snapshots._path("basketball_nba")) as f:
+            assert sorted(json.load(f)) == ["g1", "g2", "g3"]
+
+    def test_failed_evaluations_are_not_snapshotted(self, tmp_path, monkeypatch):
+        engine, evaluator = self._engine(tmp_path, monkeypatch)
+        throttled = {"g2"}
+
+        def team_stats(game):
+            if game["game_id"] in throttled:
+                game["errors"].append("ProvisionedThroughputExceededException")
+                return 0.5
+            return 0.6
+
+        engine.evaluators["team_stats"] = team_stats
+        engine.run_backtest("user1", "model1", self.CONFIG, "2024-01-01", "2024-01-31")
+        assert engine.snapshots.built == 2
+
+        # The next backtest (fresh invocation) rebuilds only the failed game
+        throttled.clear()
+        engine, evaluator = self._engine(tmp_path, monkeypatch)
+        engine.evaluators["team_stats"] = team_stats
+        result = engine.run_backtest("user1", "model2", self.CONFIG, "2024-01-01", "2024-01-31")
+
+        assert engine.snapshots.built == 1
+        assert evaluator.call_count == len(engine.evaluators) - 1
+        assert [p["scores"]["team_stats"] for p in result["predictions"]] == [0.6, 0.6, 0.6]
+
+
+class TestWeightSweep:
+    # Two sources: team_stats picks the winner, odds_movement picks the loser
+    GAMES = [
+        {
+            "game_id": f"g{i}",
+            "sport": "basketball_nba",
+            "home_team": "Lakers",
+            "away_team": "Warriors",
+            "commence_time": f"2024-{1 + i // 28:02d}-{1 + i % 28:02d}T19:00:00Z",
+            "outcome": {"winner": "Lakers" if i % 2 else "Warriors"},
+        }
+        for i in range(100)
+    ]
+    CONFIG = {
+        "sport": "basketball_nba",
+        "min_confidence": 0.6,
+        "data_sources": {
+            "team_stats": {"enabled": True, "weight": 0.5},
+            "odds_movement": {"enabled": True, "weight": 0.5},
+            "recent_form": {"enabled": False, "weight": 0},
+        },
+    }
+
+    def _engine(self, tmp_path, monkeypatch, flip_after=None):
+        monkeypatch.setattr("backtest_features.SNAPSHOT_DIR", str(tmp_path))
+        engine = BacktestEngine()
+
+        def home_score(game, right):
+            i = int(game["game_id"][1:])
+            home_won = i % 2 == 1
+            if flip_after is not None and i >= flip_after:
+                right = not right
+            return 0.9 if home_won == right else 0.1
+
+        for name in engine.evaluators:
+            engine.evaluators[name] = lambda game: 0.5
+        engine.evaluators["team_stats"] = lambda game: home_score(game, True)
+        engine.evaluators["odds_movement"] = lambda game: home_score(game, False)
+        # Newest first, as the index returns them; the sweep orders by commence_time
+        monkeypatch.setattr(engine, "_fetch_historical_games", lambda *args: self.GAMES[::-1])
+        return engine
+
+    def test_sweep_finds_the_informative_source(self, tmp_path, monkeypatch, mock_user_models_table):
+        engine = self._engine(tmp_path, monkeypatch)
+
+        result = engine.run_weight_sweep(
+            "user1", "model1", self.CONFIG, "2024-01-01", "2024-04-30", configurations=200, seed=3
+        )
+
+        assert result["mode"] == "sweep"
+        assert result["sources"] == ["team_stats", "odds_movement"]
+        assert result["configurations_evaluated"] == 201 * 10
+        assert result["holdout_games"] == 30
+        # Equal weights average to exactly 0.5: no picks
+        assert result["current"]["volume"] == 0
+        best = result["recommended"]
+        # Only home picks clear min_confidence, as in calculate_prediction
+        assert (best["accuracy"], best["volume"]) == (1.0, 35)
+        assert best["holdout"] == {"accuracy": 1.0, "roi": 0.9091, "volume": 15, "correct": 15}
+        assert best["weights"]["team_stats"] > best["weights"]["odds_movement"]
+        assert best["min_confidence"] in weight_sweep.MIN_CONFIDENCE_GRID
+        item = mock_user_models_table.put_item.call_args[1]["Item"]
+        assert item["mode"] == "sweep"
+        assert "pareto_front" in item
+
+    def test_no_recommendation_unless_it_holds_up_out_of_sample(
+        self, tmp_path, monkeypatch, mock_user_models_table
+    ):
+        # team_stats stops being predictive for the held-out (most recent) games
+        engine = self._engine(tmp_path, monkeypatch, flip_after=70)
+
+        result = engine.run_weight_sweep(
+            "user1", "model1", self.CONFIG, "2024-01-01", "2024-04-30", configurations=200, seed=3
+        )
+
+        assert result["best"]["roi"] > 0
+        assert result["best"]["holdout"]["roi"] < 0
+        assert result["recommended"] is None
+
+    def test_sweep_reuses_feature_snapshots(self, tmp_path, monkeypatch, mock_user_models_table):
+        engine = self._engine(tmp_path, monkeypatch)
+        engine.run_weight_sweep("user1", "model1", self.CONFIG, "2024-01-01", "2024-04-30", configurations=10)
+        built = engine.snapshots.built
+
+        engine.run_weight_sweep("user1", "model1", self.CONFIG, "2024-01-01", "2024-04-30", configurations=10)
+
+        assert built == 100
+        assert engine.snapshots.built == 100
+
+    def test_sweep_requires_enabled_sources(self, engine):
+        config = {"sport": "basketball_nba", "data_sources": {"team_stats": {"enabled": False}}}
+
+        with pytest.raises(ValueError):
+            engine.run_weight_sweep("user1", "model1", config, "2024-01-01", "2024-01-31")
+
+    def test_python_and_numpy_engines_agree(self):
+        scores = [[0.9, 0.2], [0.3, 0.7], [0.7, 0.7], [0.5, 0.5], [0.1, 0.95]]
+        home_won = [True, False, True, False, False]
+        away_won = [False, True, False, False, True]  # g3 is a draw
+        weights = [[1.0, 0.0], [0.5, 0.5], [0.2, 0.8]]
+        thresholds = (0.25, 0.6, 0.8)
+
+        slow = weight_sweep._sweep_python(scores, home_won, away_won, weights, thresholds)
+
+        # Config 2 at 0.6: home on g1, g2 and g4 (g0 is away but below 0.6); only g2 wins
+        assert (slow["config"][5], slow["min_confidence"][5]) == (2, 0.6)
+        assert (slow["volume"][5], slow["correct"][5]) == (3, 1)
+        assert slow["roi"][5] == pytest.approx((1.9091 - 3) / 3)
+        # Config 0 at 0.25 also bets away on g1 (0.3); g3 sits in the no-bet band
+        assert (slow["volume"][0], slow["correct"][0]) == (3, 3)
+        if weight_sweep.HAS_NUMPY:
+            fast = weight_sweep._sweep_numpy(scores, home_won, away_won, weights, thresholds)
+            assert fast["volume"] == slow["volume"]
+            assert fast["correct"] == slow["correct"]
+
+    def test_sweep_matches_calculate_prediction(self):
+        from user_model_executor import calculate_prediction
+
+        rng = random.Random(11)
+        sources = ["team_stats", "odds_movement"]
+        games = [
+            {"game_id": f"g{i}", "home_team": "Home", "away_team": "Away",
+             "scores": {name: rng.random() for name in sources},
+             "winner": rng.choice(["Home", "Away"])}
+            for i in range(200)
+        ]
+        weights = [[0.7, 0.3], [0.2, 0.8], [0.5, 0.5]]
+        thresholds = (0.3, 0.5, 0.6, 0.75)
+        features = Mock()
+        features.score.side_effect = lambda source, game: game["scores"][source]
+
+        results = weight_sweep.sweep(
+            [[g["scores"][name] for name in sources] for g in games],
+            [g["winner"] == "Home" for g in games],
+            [g["winner"] == "Away" for g in games],
+            weights,
+            thresholds,
+        )
+
+        for row in range(len(results["config"])):
+            vector = weights[results["config"][row]]
+            model = Mock(
+                data_sources={
+                    name: {"enabled": True, "weight": w} for name, w in zip(sources, vector)
+                },
+                custom_datasets=[],
+                min_confidence=results["min_confidence"][row],
+            )
+            picks = [calculate_prediction(model, game, features) for game in games]
+            placed = [(p, g) for p, g in zip(picks, games) if p]
+            assert results["volume"][row] == len(placed)
+            assert results["correct"][row] == sum(p["prediction"] == g["winner"] for p, g in placed)
+
+    def test_pareto_front_drops_dominated_points(self):
+        results = {
+            "accuracy": [0.6, 0.7, 0.55, 0.7, 0.9],
+            "roi": [0.1, 0.2, 0.05, 0.2, 0.5],
+            "volume": [50, 40, 40, 40, 5],
+        }
+
+        assert weight_sweep.pareto_front(results) == [0, 1, 4]
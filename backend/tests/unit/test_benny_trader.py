@@ -1,6 +1,8 @@
 """
 Unit tests for Benny autonomous trader
 """
+import io
+import json
 from datetime import datetime, timedelta
 from decimal import Decimal
 from unittest.mock import MagicMock, patch
@@ -143,6 +145,62 @@ class TestBennyTrader:
         assert len(opportunities) >= 1
         assert all(opp["confidence"] >= 0.65 for opp in opportunities)
 
+    def test_analyze_games_overlaps_gather_with_ai(self, trader, mock_table, mock_bedrock):
+        """Test next game's lookups run while the current game is with Bedrock"""
+        import threading
+
+        commence = (datetime.utcnow() + timedelta(hours=2)).isoformat()
+        mock_table.query.return_value = {
+            "Items": [
+                {
+                    "pk": f"GAME#{game_id}",
+                    "commence_time": commence,
+                    "home_team": home,
+                    "away_team": away,
+                    "market_key": "h2h",
+                    "bookmaker": bookmaker,
+                    "outcomes": [{"name": home, "price": -110}, {"name": away, "price": -110}],
+                }
+                for game_id, home, away in [("game1", "Lakers", "Warriors"), ("game2", "Celtics", "Heat")]
+                for bookmaker in ["draftkings", "fanduel"]
+            ]
+        }
+
+        for name in ["_get_team_stats", "_get_adjusted_metrics", "_get_weather_data"]:
+            setattr(trader, name, MagicMock(return_value={}))
+        for name in ["_get_team_injuries", "_get_head_to_head", "_get_recent_form"]:
+            setattr(trader, name, MagicMock(return_value=[]))
+        trader._get_team_news_sentiment = MagicMock(
+            return_value={"sentiment_score": 0.0, "impact_score": 0.0, "news_count": 0}
+        )
+        trader._get_elo_rating = MagicMock(return_value=1500.0)
+
+        game2_gathering = threading.Event()
+
+        def fatigue(game_id):
+            if game_id == "game2":
+                game2_gathering.set()
+            return {}
+
+        trader._get_fatigue_data = MagicMock(side_effect=fatigue)
+        overlapped = []
+
+        def ai_analyze(game_data, *args):
+            if game_data["game_id"] == "game1":
+                overlapped.append(game2_gathering.wait(timeout=2))
+            return None
+
+        trader._ai_analyze_game = MagicMock(side_effect=ai_analyze)
+
+        with patch("benny_trader.SUPPORTED_SPORTS", ["basketball_nba"]):
+            trader.analyze_games()
+
+        assert overlapped == [True]
+        assert trader._ai_analyze_game.call_count == 2
+        assert trader.stage_timings["bedrock"]["calls"] == 2
+        assert trader.stage_timings["lookups"]["calls"] == 30
+        assert trader.stage_timings["gather_wait"]["calls"] == 2
+
     def test_place_bet_success(self, trader, mock_table, mock_bedrock):
         """Test successful bet placement with AI reasoning"""
         # Mock put_item to succeed
@@ -436,3 +494,20 @@ class TestBennyTrader:
         """Test minimum bet size"""
         bet_size = trader.model.calculate_bet_size(0.50, -110, trader.bankroll)
         assert bet_size >= Decimal("0.00")  # Non-negative
+
+    def test_invoke_cached_reuses_answer_for_identical_prompt(self, trader, mock_table, mock_bedrock):
+        """Identical prompts are answered from the LLM cache"""
+        mock_table.get_item.return_value = {}
+        mock_bedrock.invoke_model.return_value = {
+            "body": io.BytesIO(
+                json.dumps(
+                    {"content": [{"type": "text", "text": '```json\n{"confidence": 0.7}\n```'}]}
+                ).encode()
+            )
+        }
+
+        first = trader._invoke_cached("same prompt", 500, "2024-01-15T19:00:00Z")
+        second = trader._invoke_cached("same prompt", 500, "2024-01-15T19:00:00Z")
+
+        assert first == second == {"confidence": 0.7}
+        assert mock_bedrock.invoke_model.call_count == 1
@@ -0,0 +1,54 @@
+"""Unit tests for the coaching memo prompt"""
+import unittest
+from datetime import datetime
+from decimal import Decimal
+from unittest.mock import Mock
+
+from benny.coaching_agent import CoachingAgent
+from benny.settled_bets import clear_settled_bets
+
+
+def _bet(i, status, reasoning, factors):
+    return {
+        "pk": "BENNY",
+        "sk": f"BET#2026-01-0{i}T00:00:00#game{i}",
+        "status": status,
+        "sport": "basketball_nba",
+        "market_key": "h2h",
+        "prediction": f"Team {i}",
+        "confidence": Decimal("0.85"),
+        "bet_amount": Decimal("10"),
+        "profit": Decimal("9.09") if status == "won" else Decimal("-10"),
+        "settled_at": datetime.utcnow().isoformat(),
+        "ai_reasoning": reasoning,
+        "ai_key_factors": factors,
+    }
+
+
+class TestCoachingAgent(unittest.TestCase):
+
+    def setUp(self):
+        clear_settled_bets()
+
+    def tearDown(self):
+        clear_settled_bets()
+
+    def test_summary_includes_reasoning_and_key_factors_from_snapshot(self):
+        table = Mock()
+        table.query.return_value = {"Items": [
+            _bet(1, "lost", "Fatigue edge on the road team", ["rest_advantage"]),
+            _bet(2, "won", "Elo gap too large", ["elo_gap"]),
+            _bet(3, "won", "Elo gap and home court", ["elo_gap"]),
+            _bet(4, "won", None, ["elo_gap"]),
+        ]}
+        agent = CoachingAgent(table, llm=Mock())
+
+        summary = agent._summarize_bets(agent._get_settled_bets())
+
+        self.assertIn("Fatigue edge on the road team", summary)
+        self.assertIn("Elo gap too large", summary)
+        self.assertIn("✓ elo_gap: 3/3", summary)
+
+
+if __name__ == "__main__":
+    unittest.main()
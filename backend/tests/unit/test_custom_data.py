@@ -1,5 +1,6 @@
 """Custom data tests"""
 
+import json
 import os
 from unittest.mock import Mock, patch
 
@@ -7,7 +8,14 @@ import pytest
 
 os.environ["DYNAMODB_TABLE"] = "test-table"
 
-from custom_data import CustomDataset, validate_dataset, convert_floats_to_decimal
+import custom_data
+from custom_data import (
+    CompiledDataset,
+    CustomDataset,
+    compile_dataset,
+    convert_floats_to_decimal,
+    validate_dataset,
+)
 
 
 def test_convert_floats_to_decimal():
@@ -65,5 +73,97 @@ def test_custom_dataset_list_by_user():
         assert isinstance(datasets, list)
 
 
+def _dataset():
+    return CustomDataset(
+        user_id="user1",
+        name="Ratings",
+        description="",
+        sport="basketball_nba",
+        data_type="team",
+        columns=["team", "rating"],
+        s3_key="user1/abc.json",
+        row_count=2,
+        dataset_id="dataset_1",
+    )
+
+
+def test_compile_dataset_indexes_names_and_numeric_columns():
+    """Names are lowercased; non-numeric values compile to None"""
+    rows = [
+        {"team": "Los Angeles Lakers", "rating": "110.5", "note": "hot"},
+        {"team": "Golden State Warriors", "rating": 104, "note": "cold"},
+    ]
+
+    compiled = CompiledDataset(compile_dataset(rows, "team"))
+
+    assert compiled.names == ["los angeles lakers", "golden state warriors"]
+    assert compiled.columns == {"rating": [110.5, 104.0], "note": [None, None]}
+    assert compiled.find("Golden State Warriors") == 1
+    assert compiled.find("Lakers") == 0  # substring fallback
+    assert compiled.find("Celtics") is None
+
+
+def test_compiled_player_lookup_takes_first_substring_match():
+    compiled = CompiledDataset(compile_dataset(
+        [{"player": "Anthony Davis", "pts": 25}, {"player": "Anthony Edwards", "pts": 27}], "player"
+    ))
+
+    assert compiled.find("anthony") == 0
+
+
+def test_get_compiled_uses_tmp_cache_while_etag_matches(tmp_path):
+    compiled = compile_dataset([{"team": "Lakers", "rating": 1}], "team")
+    with patch.object(custom_data, "CACHE_DIR", str(tmp_path)), \
+         patch.object(custom_data, "s3") as mock_s3:
+        custom_data._write_cache("user1/abc.compiled.json", '"v1"', compiled)
+        mock_s3.head_object.return_value = {"ETag": '"v1"'}
+
+        result = _dataset().get_compiled()
+
+        assert result.names == ["lakers"]
+        mock_s3.head_object.assert_called_once_with(
+            Bucket=custom_data.CUSTOM_DATA_BUCKET, Key="user1/abc.compiled.json"
+        )
+        mock_s3.get_object.assert_not_called()
+
+
+def test_get_compiled_refreshes_stale_cache(tmp_path):
+    fresh = compile_dataset([{"team": "Celtics", "rating": 2}], "team")
+    body = Mock()
+    body.read.return_value = json.dumps(fresh).encode("utf-8")
+    with patch.object(custom_data, "CACHE_DIR", str(tmp_path)), \
+         patch.object(custom_data, "s3") as mock_s3:
+        custom_data._write_cache("user1/abc.compiled.json", '"v1"', compile_dataset([], "team"))
+        mock_s3.head_object.return_value = {"ETag": '"v2"'}
+        mock_s3.get_object.return_value = {"Body": body, "ETag": '"v2"'}
+
+        result = _dataset().get_compiled()
+
+        assert result.names == ["celtics"]
+        assert custom_data._read_cache("user1/abc.compiled.json")["etag"] == '"v2"'
+
+
+def test_get_compiled_compiles_legacy_dataset_once(tmp_path):
+    """Datasets without a compiled object are compiled from the raw rows and uploaded"""
+    raw = Mock()
+    raw.read.return_value = json.dumps([{"team": "Lakers", "rating": 3}]).encode("utf-8")
+    with patch.object(custom_data, "CACHE_DIR", str(tmp_path)), \
+         patch.object(custom_data, "s3") as mock_s3, \
+         patch.object(CustomDataset, "get", return_value=_dataset()) as mock_get:
+        custom_data.clear_compiled_cache()
+        mock_s3.head_object.side_effect = Exception("404")
+        mock_s3.get_object.return_value = {"Body": raw}
+        mock_s3.put_object.return_value = {"ETag": '"c1"'}
+
+        first = custom_data.get_compiled_dataset("user1", "dataset_1")
+        second = custom_data.get_compiled_dataset("user1", "dataset_1")
+        custom_data.clear_compiled_cache()
+
+        assert first is second
+        assert first.columns == {"rating": [3.0]}
+        mock_get.assert_called_once()
+        assert mock_s3.put_object.call_args.kwargs["Key"] == "user1/abc.compiled.json"
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
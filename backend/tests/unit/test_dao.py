@@ -5,7 +5,7 @@ from unittest.mock import Mock, patch
 
 import pytest
 
-from dao import BettingDAO
+from dao import BettingDAO, ReadStats, iter_query, iter_scan
 
 
 @pytest.fixture
@@ -81,5 +81,50 @@ def test_get_prop_ids_error(dao):
     assert prop_ids == []
 
 
+def test_iter_query_follows_pages_lazily():
+    """Pages are only requested as items are consumed"""
+    table = Mock()
+    table.query.side_effect = [
+        {"Items": [{"pk": "a"}, {"pk": "b"}], "LastEvaluatedKey": {"pk": "b"}},
+        {"Items": [{"pk": "c"}]},
+    ]
+
+    items = iter_query(table, KeyConditionExpression="pk = :pk")
+    assert next(items) == {"pk": "a"}
+    assert table.query.call_count == 1
+
+    assert [i["pk"] for i in items] == ["b", "c"]
+    assert table.query.call_args.kwargs["ExclusiveStartKey"] == {"pk": "b"}
+
+
+def test_iter_query_max_items_stops_early():
+    """max_items stops before reading further pages"""
+    table = Mock()
+    table.query.return_value = {"Items": [{"pk": "a"}, {"pk": "b"}], "LastEvaluatedKey": {"pk": "b"}}
+
+    assert len(list(iter_query(table, max_items=2))) == 2
+    assert table.query.call_count == 1
+
+
+def test_iter_scan_projection_and_capacity():
+    """attributes become a placeholder projection and capacity is accumulated"""
+    table = Mock()
+    table.scan.side_effect = [
+        {"Items": [{"pk": "a"}], "Count": 1, "ScannedCount": 10,
+         "ConsumedCapacity": {"CapacityUnits": 2.5}, "LastEvaluatedKey": {"pk": "a"}},
+        {"Items": [], "Count": 0, "ScannedCount": 5, "ConsumedCapacity": {"CapacityUnits": 1.0}},
+    ]
+    stats = ReadStats()
+
+    list(iter_scan(table, attributes=["pk", "status"], stats=stats,
+                   ExpressionAttributeNames={"#s": "sport"}))
+
+    kwargs = table.scan.call_args_list[0].kwargs
+    assert kwargs["ProjectionExpression"] == "#p0, #p1"
+    assert kwargs["ExpressionAttributeNames"] == {"#s": "sport", "#p0": "pk", "#p1": "status"}
+    assert kwargs["ReturnConsumedCapacity"] == "TOTAL"
+    assert (stats.pages, stats.items, stats.scanned, stats.capacity_units) == (2, 1, 15, 3.5)
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
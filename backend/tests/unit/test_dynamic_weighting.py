@@ -1,10 +1,18 @@
 """Unit tests for DynamicModelWeighting class."""
+from datetime import datetime, timedelta
 from decimal import Decimal
 from unittest.mock import Mock, patch
 
 import pytest
 
-from ml.dynamic_weighting import DynamicModelWeighting
+from ml.dynamic_weighting import DynamicModelWeighting, clear_weights_cache
+
+
+@pytest.fixture(autouse=True)
+def fresh_weights_cache():
+    clear_weights_cache()
+    yield
+    clear_weights_cache()
 
 
 def test_get_model_weights_with_data():
@@ -52,5 +60,81 @@ def test_get_model_weights_no_data():
         assert weights["momentum"] == pytest.approx(1 / 3)
 
 
+def test_get_model_weights_uses_fresh_record_and_memoizes():
+    """A fresh MODEL_WEIGHTS record answers without touching the GSI, once per process"""
+    table = Mock()
+    table.get_item.return_value = {"Item": {
+        "updated_at": datetime.utcnow().isoformat(),
+        "counters": {
+            "value": {"correct": Decimal("60"), "total": Decimal("100")},
+            "momentum": {"correct": Decimal("40"), "total": Decimal("100")},
+        },
+    }}
+    weighting = DynamicModelWeighting(table=table)
+
+    weights = weighting.get_model_weights("basketball_nba", "game", ["value", "momentum"])
+    weighting.get_model_weights("basketball_nba", "game", ["momentum", "value"])
+
+    assert weights == {"value": 1.0, "momentum": 0.0}
+    table.get_item.assert_called_once()
+    table.query.assert_not_called()
+
+
+def test_get_model_weights_falls_back_to_gsi_for_stale_record():
+    """A stale record is ignored and verified analyses are counted instead"""
+    table = Mock()
+    table.get_item.return_value = {"Item": {
+        "updated_at": (datetime.utcnow() - timedelta(days=2)).isoformat(),
+        "counters": {"value": {"correct": 60, "total": 100}},
+    }}
+    table.query.return_value = {"Items": [{"analysis_correct": True}] * 25}
+    weighting = DynamicModelWeighting(table=table)
+
+    weights = weighting.get_model_weights("basketball_nba", "game", ["value"])
+
+    assert weights == {"value": 1.0}
+    assert table.query.call_args.kwargs["IndexName"] == "VerifiedAnalysisGSI"
+
+
+def test_refresh_weights_sums_rollup_counters():
+    """The refresh job reads daily rollups and persists counters and weights"""
+    table = Mock()
+    table.query.return_value = {"Items": [
+        {"game_correct": Decimal("15"), "game_total": Decimal("20")},
+        {"game_correct": Decimal("5"), "game_total": Decimal("10")},
+    ]}
+    weighting = DynamicModelWeighting(table=table)
+
+    weights = weighting.refresh_weights("basketball_nba", "game", ["value"])
+
+    item = table.put_item.call_args.kwargs["Item"]
+    assert item["pk"] == "MODEL_WEIGHTS#basketball_nba#game"
+    assert item["sk"] == "LOOKBACK#90"
+    assert item["counters"] == {"value": {"correct": 20, "total": 30}}
+    assert weights == {"value": 1.0}
+    assert "IndexName" not in table.query.call_args.kwargs
+
+
+def test_refresh_weights_counts_verified_until_rollups_cover_window():
+    """Rollups that start inside the lookback window aren't used yet"""
+    table = Mock()
+
+    def query(**kwargs):
+        if kwargs.get("IndexName") == "VerifiedAnalysisGSI":
+            return {"Items": [{"analysis_correct": True}] * 15 + [{"analysis_correct": False}] * 15}
+        if kwargs.get("Limit") == 1:
+            return {"Items": []}  # No rollup on or before the window's first day
+        return {"Items": [{"game_correct": Decimal("3"), "game_total": Decimal("4")}]}
+
+    table.query.side_effect = query
+    weighting = DynamicModelWeighting(table=table)
+
+    weighting.refresh_weights("basketball_nba", "game", ["value"])
+
+    item = table.put_item.call_args.kwargs["Item"]
+    assert item["counters"] == {"value": {"correct": 15, "total": 30}}
+    assert [c.kwargs.get("Limit") for c in table.query.call_args_list] == [1, None]
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,94 @@
+"""Tests for BufferedBatchWriter"""
+
+from unittest.mock import MagicMock, patch
+
+from dynamo_batch_writer import BufferedBatchWriter
+
+
+def _table():
+    table = MagicMock()
+    table.name = "test-table"
+    table.meta.client.batch_write_item.return_value = {"UnprocessedItems": {}}
+    return table
+
+
+def _item(i, sk="consensus"):
+    return {"pk": f"ANALYSIS#{i}", "sk": sk, "prediction": "home"}
+
+
+def test_flushes_in_chunks_of_25():
+    table = _table()
+    writer = BufferedBatchWriter(table)
+
+    for i in range(60):
+        writer.put(_item(i))
+    assert table.meta.client.batch_write_item.call_count == 2
+
+    writer.flush()
+
+    calls = table.meta.client.batch_write_item.call_args_list
+    assert [len(c.kwargs["RequestItems"]["test-table"]) for c in calls] == [25, 25, 10]
+    assert writer.items_written == 60
+
+
+def test_deduplicates_by_pk_sk_last_write_wins():
+    table = _table()
+    writer = BufferedBatchWriter(table)
+
+    writer.put(_item(1))
+    writer.put({**_item(1), "prediction": "away"})
+    writer.flush()
+
+    requests = table.meta.client.batch_write_item.call_args.kwargs["RequestItems"]["test-table"]
+    assert len(requests) == 1
+    assert requests[0]["PutRequest"]["Item"]["prediction"] == "away"
+    assert writer.duplicates == 1
+
+
+@patch("dynamo_batch_writer.time.sleep")
+def test_retries_unprocessed_items(mock_sleep):
+    table = _table()
+    leftover = [{"PutRequest": {"Item": _item(2)}}]
+    table.meta.client.batch_write_item.side_effect = [
+        {"UnprocessedItems": {"test-table": leftover}},
+        {"UnprocessedItems": {}},
+    ]
+    writer = BufferedBatchWriter(table)
+
+    writer.put(_item(1))
+    writer.put(_item(2))
+    writer.flush()
+
+    second = table.meta.client.batch_write_item.call_args_list[1]
+    assert second.kwargs["RequestItems"] == {"test-table": leftover}
+    assert writer.items_written == 2
+    mock_sleep.assert_called_once()
+
+
+@patch("dynamo_batch_writer.time.sleep")
+def test_gives_up_after_max_retries(mock_sleep):
+    table = _table()
+    table.meta.client.batch_write_item.return_value = {
+        "UnprocessedItems": {"test-table": [{"PutRequest": {"Item": _item(1)}}]}
+    }
+    writer = BufferedBatchWriter(table, max_retries=2)
+
+    writer.put(_item(1))
+    writer.flush()
+
+    assert table.meta.client.batch_write_item.call_count == 3
+    assert writer.items_failed == 1
+    assert writer.items_written == 0
+
+
+@patch("dynamo_batch_writer.boto3")
+def test_emit_metrics_reports_flush_latency(mock_boto3):
+    writer = BufferedBatchWriter(_table(), metric_namespace="SportsAnalytics/Test")
+    writer.put(_item(1))
+    writer.flush()
+
+    writer.emit_metrics([{"Name": "Sport", "Value": "basketball_nba"}])
+
+    metrics = mock_boto3.client.return_value.put_metric_data.call_args.kwargs["MetricData"]
+    assert metrics[0]["MetricName"] == "BatchFlushLatency"
+    assert metrics[1]["Value"] == 1
@@ -2,13 +2,13 @@
 
 import os
 from decimal import Decimal
-from unittest.mock import Mock, patch
+from unittest.mock import MagicMock, Mock, patch
 
 import pytest
 
 os.environ["DYNAMODB_TABLE"] = "test-table"
 
-from elo_calculator import EloCalculator
+from elo_calculator import EloCalculator, EloRatingService
 
 
 @pytest.fixture
@@ -51,7 +51,7 @@ def test_calculate_expected_score_favorite(calculator):
 
 def test_update_ratings_home_win(calculator):
     """Test rating update for home win"""
-    calculator.table = Mock()
+    calculator.table = MagicMock()
     calculator.table.query.return_value = {"Items": []}
     
     new_home, new_away = calculator.update_ratings(
@@ -65,7 +65,7 @@ def test_update_ratings_home_win(calculator):
 
 def test_update_ratings_tie(calculator):
     """Test rating update for tie"""
-    calculator.table = Mock()
+    calculator.table = MagicMock()
     calculator.table.query.return_value = {"Items": []}
     
     new_home, new_away = calculator.update_ratings(
@@ -79,13 +79,58 @@ def test_update_ratings_tie(calculator):
 
 def test_update_ratings_stores_results(calculator):
     """Test that update_ratings stores to DynamoDB"""
-    calculator.table = Mock()
+    calculator.table = MagicMock()
     calculator.table.query.return_value = {"Items": []}
     
     calculator.update_ratings("basketball_nba", "Lakers", "Warriors", 110, 105)
     
-    # Should call put_item twice (once per team)
-    assert calculator.table.put_item.call_count == 2
+    # History record + LATEST pointer per team, through one batch writer
+    batch = calculator.table.batch_writer.return_value.__enter__.return_value
+    assert batch.put_item.call_count == 4
+    latest = [c.kwargs["Item"] for c in batch.put_item.call_args_list if c.kwargs["Item"]["sk"] == "LATEST"]
+    assert {i["gsi_sk"] for i in latest} == {"LAKERS", "WARRIORS"}
+    assert all(i["gsi_pk"] == "ELO#basketball_nba" for i in latest)
+
+
+def test_rating_service_loads_sport_snapshot_once():
+    """Test that a sport's ratings come from one paginated index read"""
+    table = Mock()
+    table.query.side_effect = [
+        {"Items": [{"gsi_sk": "LAKERS", "rating": Decimal("1620")}], "LastEvaluatedKey": {"pk": "x"}},
+        {"Items": [{"gsi_sk": "WARRIORS", "rating": Decimal("1480")}]},
+    ]
+    service = EloRatingService(table)
+
+    ratings = service.get_many("basketball_nba", ["Lakers", "Warriors"])
+    assert ratings == {"Lakers": 1620.0, "Warriors": 1480.0}
+    assert service.get("basketball_nba", "Lakers") == 1620.0
+    assert table.query.call_count == 2
+    assert table.query.call_args_list[0].kwargs["IndexName"] == "GenericQueryIndex"
+
+
+def test_rating_service_falls_back_for_teams_without_pointer():
+    """Test that teams missing from the snapshot are read once from history"""
+    table = Mock()
+    table.query.side_effect = [
+        {"Items": []},
+        {"Items": [{"rating": Decimal("1555")}]},
+    ]
+    service = EloRatingService(table)
+
+    assert service.get("basketball_nba", "Old Team") == 1555.0
+    assert service.get("basketball_nba", "Old Team") == 1555.0
+    assert table.query.call_count == 2
+
+
+def test_rating_service_snapshot_expires():
+    """Test that the snapshot is reloaded after its TTL"""
+    table = Mock()
+    table.query.return_value = {"Items": [{"gsi_sk": "LAKERS", "rating": Decimal("1600")}]}
+    service = EloRatingService(table, ttl_seconds=0)
+
+    service.get("basketball_nba", "Lakers")
+    service.get("basketball_nba", "Lakers")
+    assert table.query.call_count == 2
 
 
 if __name__ == "__main__":
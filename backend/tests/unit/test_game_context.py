@@ -0,0 +1,108 @@
+"""Tests for GameContext"""
+
+from unittest.mock import Mock
+
+import pytest
+
+from ml.game_context import GameContext
+from ml.models.ensemble import EnsembleModel
+from ml.models.value import ValueModel
+
+
+@pytest.fixture
+def context():
+    table = Mock()
+    table.name = "test-table"
+    elo = Mock()
+    elo.get_team_rating.side_effect = lambda sport, team: 1600 if team == "Boston Celtics" else 1450
+    elo.ratings.get_many.side_effect = lambda sport, teams: {
+        team: elo.get_team_rating(sport, team) for team in teams
+    }
+    fatigue = Mock()
+    fatigue.calculate_fatigue_score.return_value = {"fatigue_score": 10, "days_rest": 2}
+    return GameContext(table, elo_calculator=elo, fatigue_calculator=fatigue)
+
+
+def test_elo_rating_loaded_once(context):
+    assert context.get_elo_rating("basketball_nba", "Boston Celtics") == 1600
+    assert context.get_elo_rating("basketball_nba", "Boston Celtics") == 1600
+    assert context.elo_calculator.get_team_rating.call_count == 1
+    assert context.hits == 1
+
+
+def test_prefetch_warms_teams_once(context):
+    games = [
+        {"game_id": "g1", "sport": "basketball_nba", "home_team": "Boston Celtics",
+         "away_team": "Miami Heat", "commence_time": "2026-01-15T19:00:00Z"},
+        {"game_id": "g2", "sport": "basketball_nba", "home_team": "Miami Heat",
+         "away_team": "Boston Celtics", "commence_time": "2026-01-17T19:00:00Z"},
+    ]
+
+    context.prefetch(games)
+
+    context.elo_calculator.ratings.get_many.assert_called_once_with(
+        "basketball_nba", ["Boston Celtics", "Miami Heat"]
+    )
+    context.fatigue_calculator.load_schedule.assert_called_once_with(
+        "basketball_nba", "2026-01-01T19:00:00+00:00", "2026-01-17T19:00:00Z"
+    )
+    assert context.fatigue_calculator.calculate_fatigue_score.call_count == 4
+    assert context.get_elo_rating("basketball_nba", "Miami Heat") == 1450
+    assert context.elo_calculator.get_team_rating.call_count == 2
+
+
+def test_prefetch_batches_weather_for_outdoor_sports(context):
+    client = context.table.meta.client
+    client.batch_get_item.return_value = {
+        "Responses": {"test-table": [{"pk": "WEATHER#g1", "sk": "latest", "impact": "high"}]},
+        "UnprocessedKeys": {},
+    }
+
+    context.prefetch([
+        {"game_id": "g1", "sport": "americanfootball_nfl", "home_team": "A", "away_team": "B"},
+        {"game_id": "g2", "sport": "americanfootball_nfl", "home_team": "C", "away_team": "D"},
+    ])
+
+    client.batch_get_item.assert_called_once()
+    assert context.get_weather("g1")["impact"] == "high"
+    assert context.get_weather("g2") is None
+    context.table.get_item.assert_not_called()
+
+
+def test_prefetch_weather_backs_off_and_leaves_unread_keys_uncached(context, monkeypatch):
+    sleeps = []
+    monkeypatch.setattr("ml.game_context.time.sleep", sleeps.append)
+    client = context.table.meta.client
+    unprocessed = {"test-table": {"Keys": [{"pk": "WEATHER#g2", "sk": "latest"}]}}
+    client.batch_get_item.return_value = {"Responses": {}, "UnprocessedKeys": unprocessed}
+    context.table.get_item.return_value = {"Item": {"impact": "low"}}
+
+    context.prefetch([
+        {"game_id": "g2", "sport": "americanfootball_nfl", "home_team": "C", "away_team": "D"},
+    ])
+
+    assert client.batch_get_item.call_count == 5
+    assert len(sleeps) == 4
+    assert all(0 < delay <= 0.8 for delay in sleeps)
+    assert context.get_weather("g2") == {"impact": "low"}
+    context.table.get_item.assert_called_once()
+
+
+def test_head_to_head_shared_regardless_of_team_order(context):
+    context.table.query.return_value = {"Items": [{"winner": "A"}]}
+
+    context.get_head_to_head("basketball_nba", "A", "B")
+    context.get_head_to_head("basketball_nba", "B", "A")
+
+    assert context.table.query.call_count == 1
+
+
+def test_ensemble_sub_models_share_context(context):
+    model = EnsembleModel.__new__(EnsembleModel)
+    model.models = {"value": ValueModel.__new__(ValueModel), "other": Mock()}
+
+    model.set_context(context)
+
+    assert model.models["value"].context is context
+    model.models["other"].set_context.assert_called_once_with(context)
+    assert model.models["value"]._get_elo_rating("basketball_nba", "Boston Celtics") == 1600
@@ -9,7 +9,7 @@ from decimal import Decimal
 
 os.environ["DYNAMODB_TABLE"] = "test-table"
 
-from api.games import GamesHandler
+from api.games import GamesHandler, _catalog_cache
 
 
 class TestGamesHandler(unittest.TestCase):
@@ -19,6 +19,7 @@ class TestGamesHandler(unittest.TestCase):
     def setUp(self, mock_table):
         self.mock_table = mock_table
         self.handler = GamesHandler()
+        _catalog_cache.clear()
 
     def test_get_games_success(self):
         """Test getting games successfully"""
@@ -77,29 +78,48 @@ class TestGamesHandler(unittest.TestCase):
         self.assertEqual(result["statusCode"], 400)
 
     def test_get_sports(self):
-        """Test getting available sports"""
-        self.mock_table.scan.return_value = {
-            "Items": [
-                {"pk": "GAME#basketball_nba"},
-                {"pk": "GAME#americanfootball_nfl"}
-            ]
+        """Test getting available sports from the catalog record"""
+        self.mock_table.get_item.return_value = {
+            "Item": {"pk": "CATALOG", "sk": "ODDS", "sports": {"basketball_nba", "americanfootball_nfl"}}
         }
 
         result = self.handler.get_sports()
-        
+
         self.assertEqual(result["statusCode"], 200)
+        body = json.loads(result["body"])
+        self.assertEqual(body["sports"], ["americanfootball_nfl", "basketball_nba"])
+        self.mock_table.scan.assert_not_called()
 
     def test_get_bookmakers(self):
-        """Test getting available bookmakers"""
-        self.mock_table.scan.return_value = {
-            "Items": [
-                {"bookmakers": [{"key": "draftkings"}]}
-            ]
+        """Test getting available bookmakers from the catalog record"""
+        self.mock_table.get_item.return_value = {
+            "Item": {"pk": "CATALOG", "sk": "ODDS", "bookmakers": {"fanduel", "draftkings"}}
         }
 
         result = self.handler.get_bookmakers()
-        
+
         self.assertEqual(result["statusCode"], 200)
+        self.assertEqual(json.loads(result["body"])["bookmakers"], ["draftkings", "fanduel"])
+        self.mock_table.scan.assert_not_called()
+
+    def test_catalog_cached_between_requests(self):
+        """Sports and bookmakers share one cached catalog read"""
+        self.mock_table.get_item.return_value = {
+            "Item": {"sports": {"basketball_nba"}, "bookmakers": {"fanduel"}}
+        }
+
+        self.handler.get_sports()
+        self.handler.get_bookmakers()
+
+        self.mock_table.get_item.assert_called_once()
+
+    def test_get_sports_without_catalog_uses_supported_sports(self):
+        """Before the collector writes a catalog, fall back to configured sports"""
+        self.mock_table.get_item.return_value = {}
+
+        result = self.handler.get_sports()
+
+        self.assertIn("basketball_nba", json.loads(result["body"])["sports"])
 
     def test_route_request_games(self):
         """Test routing to games endpoint"""
@@ -6,7 +6,13 @@ from unittest.mock import Mock, patch
 
 import pytest
 
-from injury_collector import InjuryCollector, lambda_handler
+from injury_collector import InjuryCollector, RefCache, lambda_handler
+
+
+@pytest.fixture(autouse=True)
+def fresh_ref_cache():
+    with patch("injury_collector.ref_cache", RefCache()):
+        yield
 
 
 @pytest.fixture
@@ -73,7 +79,7 @@ def test_parse_injury_missing_details(collector):
     assert result["injury_type"] is None
 
 
-@patch("injury_collector.requests.get")
+@patch("injury_collector.requests.Session.get")
 def test_fetch_team_injuries(mock_get, collector):
     """Test fetching team injuries"""
     mock_response = Mock()
@@ -95,7 +101,7 @@ def test_fetch_team_injuries(mock_get, collector):
     assert injuries[0]["injury_id"] == "1"
 
 
-@patch("injury_collector.requests.get")
+@patch("injury_collector.requests.Session.get")
 def test_fetch_team_injuries_error(mock_get, collector):
     """Test handling errors when fetching injuries"""
     mock_get.side_effect = Exception("API error")
@@ -126,7 +132,7 @@ def test_store_injuries(mock_dynamodb, collector):
     assert len(item["injuries"]) == 2
 
 
-@patch("injury_collector.requests.get")
+@patch("injury_collector.requests.Session.get")
 def test_get_teams(mock_get, collector):
     """Test getting teams for a sport"""
     mock_response = Mock()
@@ -144,6 +150,91 @@ def test_get_teams(mock_get, collector):
     assert teams[0]["name"] == "Atlanta Hawks"
 
 
+@patch("injury_collector.requests.Session.get")
+def test_athlete_lookups_cached_across_injuries(mock_get, collector):
+    """Athlete and stats refs are fetched once and reused"""
+    athlete = Mock()
+    athlete.json.return_value = {
+        "displayName": "Trae Young",
+        "statistics": {"$ref": "http://api.espn.com/athletes/123/statistics"},
+    }
+    stats = Mock()
+    stats.json.return_value = {
+        "splits": {"categories": [{"name": "general", "stats": [{"name": "avgMinutes", "value": 34.5}]}]}
+    }
+    mock_get.side_effect = lambda url, **kwargs: stats if url.endswith("statistics") else athlete
+
+    injury = {"id": "1", "athlete": {"$ref": "http://api.espn.com/athletes/123"}}
+    first = collector._parse_injury(injury)
+    second = collector._parse_injury({**injury, "id": "2"})
+
+    assert first["player_name"] == second["player_name"] == "Trae Young"
+    assert second["avg_minutes"] == 34.5
+    assert mock_get.call_count == 2
+
+
+@patch("injury_collector.requests.Session.get")
+def test_failed_stats_fetch_is_not_cached(mock_get, collector):
+    """An athlete whose stats failed to load is fetched again next time"""
+    athlete = Mock()
+    athlete.json.return_value = {
+        "displayName": "Trae Young",
+        "statistics": {"$ref": "http://api.espn.com/athletes/123/statistics"},
+    }
+    stats = Mock()
+    stats.json.return_value = {
+        "splits": {"categories": [{"name": "general", "stats": [{"name": "avgMinutes", "value": 34.5}]}]}
+    }
+    stats_calls = []
+
+    def get(url, **kwargs):
+        if not url.endswith("statistics"):
+            return athlete
+        stats_calls.append(url)
+        if len(stats_calls) == 1:
+            raise Exception("Timeout")
+        return stats
+
+    mock_get.side_effect = get
+
+    injury = {"id": "1", "athlete": {"$ref": "http://api.espn.com/athletes/123"}}
+    first = collector._parse_injury(injury)
+    second = collector._parse_injury({**injury, "id": "2"})
+
+    assert first["avg_minutes"] == 0.0
+    assert second["avg_minutes"] == 34.5
+    assert len(stats_calls) == 2
+
+
+def test_ref_cache_expires():
+    """Entries past their TTL are dropped"""
+    cache = RefCache(ttl_seconds=0)
+    cache.put("ref", {"id": "1"})
+
+    assert cache.get("ref") is None
+
+
+@patch("injury_collector.requests.Session.get")
+def test_get_teams_fetches_refs_in_parallel(mock_get, collector):
+    """All team refs are resolved and returned in listing order"""
+    listing = Mock()
+    listing.json.return_value = {"items": [{"$ref": f"http://api.espn.com/teams/{i}"} for i in range(5)]}
+
+    def get(url, **kwargs):
+        if url.endswith("/teams"):
+            return listing
+        team = Mock()
+        team_id = url.rsplit("/", 1)[-1]
+        team.json.return_value = {"id": team_id, "displayName": f"Team {team_id}"}
+        return team
+
+    mock_get.side_effect = get
+
+    teams = collector._get_teams("basketball", "nba")
+
+    assert [t["id"] for t in teams] == ["0", "1", "2", "3", "4"]
+
+
 @patch.object(InjuryCollector, "_get_teams")
 @patch.object(InjuryCollector, "_fetch_team_injuries")
 @patch.object(InjuryCollector, "_store_injuries")
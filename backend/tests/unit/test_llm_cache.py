@@ -0,0 +1,61 @@
+"""Tests for the prompt-hash LLM response cache"""
+
+import json
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock
+
+from benny.llm_cache import LLMResponseCache
+
+
+def test_key_is_stable_and_sensitive_to_inputs():
+    key = LLMResponseCache.key("prompt", "model", 500)
+
+    assert key == LLMResponseCache.key("prompt\n", "model", 500)
+    assert key != LLMResponseCache.key("prompt 2", "model", 500)
+    assert key != LLMResponseCache.key("prompt", "other-model", 500)
+    assert key != LLMResponseCache.key("prompt", "model", 300)
+
+
+def test_put_sets_expiry_after_commence_time():
+    table = Mock()
+    cache = LLMResponseCache(table)
+
+    cache.put("abc", {"confidence": 0.7}, "2026-03-01T19:00:00Z")
+
+    item = table.put_item.call_args.kwargs["Item"]
+    assert item["pk"] == "LLM_CACHE#abc"
+    assert item["expires_at"] == "2026-03-01T20:00:00+00:00"
+    assert json.loads(item["result"]) == {"confidence": 0.7}
+
+
+def test_get_reads_unexpired_entry_once():
+    future = (datetime.now(timezone.utc) + timedelta(hours=2)).isoformat()
+    table = Mock()
+    table.get_item.return_value = {
+        "Item": {"result": json.dumps({"prediction": "Over"}), "expires_at": future}
+    }
+    cache = LLMResponseCache(table)
+
+    assert cache.get("abc") == {"prediction": "Over"}
+    assert cache.get("abc") == {"prediction": "Over"}
+    assert table.get_item.call_count == 1
+    assert cache.hits == 2
+
+
+def test_get_ignores_expired_entry():
+    past = (datetime.now(timezone.utc) - timedelta(minutes=1)).isoformat()
+    table = Mock()
+    table.get_item.return_value = {
+        "Item": {"result": json.dumps({"prediction": "Over"}), "expires_at": past}
+    }
+    cache = LLMResponseCache(table)
+
+    assert cache.get("abc") is None
+    assert cache.misses == 1
+
+
+def test_get_treats_read_errors_as_miss():
+    table = Mock()
+    table.get_item.side_effect = Exception("boom")
+
+    assert LLMResponseCache(table).get("abc") is None
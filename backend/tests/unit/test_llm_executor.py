@@ -0,0 +1,131 @@
+"""Tests for the shared Bedrock LLM executor"""
+
+import io
+import json
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+from botocore.exceptions import ClientError
+
+from benny.llm_executor import LLMExecutor, StubBedrockClient, TokenBucket
+
+
+def _response(text):
+    body = json.dumps({"content": [{"type": "text", "text": text}]})
+    return {"body": io.BytesIO(body.encode())}
+
+
+def _throttle():
+    return ClientError(
+        {"Error": {"Code": "ThrottlingException", "Message": "slow down"}}, "InvokeModel"
+    )
+
+
+def test_invoke_returns_text():
+    executor = LLMExecutor(StubBedrockClient(response_text="hello"), max_concurrency=2, requests_per_second=100)
+
+    assert executor.invoke("prompt", 100) == "hello"
+    assert executor.stats["calls"] == 1
+
+
+@patch("benny.llm_executor.time.sleep")
+def test_invoke_retries_throttling(mock_sleep):
+    client = Mock()
+    client.invoke_model.side_effect = [_throttle(), _throttle(), _response("ok")]
+    executor = LLMExecutor(client, max_concurrency=1, requests_per_second=100)
+
+    assert executor.invoke("prompt", 100) == "ok"
+    assert client.invoke_model.call_count == 3
+    assert executor.stats["retries"] == 2
+
+
+@patch("benny.llm_executor.time.sleep")
+def test_invoke_gives_up_after_max_retries(mock_sleep):
+    client = Mock()
+    client.invoke_model.side_effect = _throttle()
+    executor = LLMExecutor(client, max_concurrency=1, requests_per_second=100, max_retries=2)
+
+    with pytest.raises(ClientError):
+        executor.invoke("prompt", 100)
+    assert client.invoke_model.call_count == 3
+    assert executor.stats["failures"] == 1
+
+
+def test_invoke_does_not_retry_other_errors():
+    client = Mock()
+    client.invoke_model.side_effect = ValueError("bad request")
+    executor = LLMExecutor(client, max_concurrency=1, requests_per_second=100)
+
+    with pytest.raises(ValueError):
+        executor.invoke("prompt", 100)
+    assert client.invoke_model.call_count == 1
+
+
+def test_concurrency_is_bounded():
+    active = {"now": 0, "peak": 0}
+    lock = threading.Lock()
+
+    def invoke_model(modelId, body):
+        with lock:
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+        time.sleep(0.02)
+        with lock:
+            active["now"] -= 1
+        return _response("ok")
+
+    client = Mock()
+    client.invoke_model.side_effect = invoke_model
+    executor = LLMExecutor(client, max_concurrency=3, requests_per_second=1000)
+
+    results = executor.map_prompts([f"p{i}" for i in range(12)], 100)
+
+    assert results == ["ok"] * 12
+    assert active["peak"] <= 3
+    executor.shutdown()
+
+
+def test_stub_backend_throughput_scales_with_concurrency():
+    stub = StubBedrockClient(latency=0.05)
+    executor = LLMExecutor(stub, max_concurrency=8, requests_per_second=1000)
+
+    start = time.perf_counter()
+    executor.map_prompts(["p"] * 16, 100)
+    elapsed = time.perf_counter() - start
+
+    assert stub.calls == 16
+    # Serial would take 0.8s; eight workers should finish in about two rounds
+    assert elapsed < 0.5
+    executor.shutdown()
+
+
+
+def test_stub_backend_env_overrides_passed_client(monkeypatch):
+    monkeypatch.setenv("BENNY_LLM_BACKEND", "stub")
+    client = Mock()
+    executor = LLMExecutor(client, max_concurrency=1, requests_per_second=100)
+
+    assert isinstance(executor.client, StubBedrockClient)
+    assert '"reasoning": "stub"' in executor.invoke("prompt", 100)
+    client.invoke_model.assert_not_called()
+    executor.shutdown()
+
+def test_map_prompts_returns_none_for_failures():
+    client = Mock()
+    client.invoke_model.side_effect = [_response("ok"), ValueError("boom")]
+    executor = LLMExecutor(client, max_concurrency=1, requests_per_second=100)
+
+    assert executor.map_prompts(["a", "b"], 100) == ["ok", None]
+    executor.shutdown()
+
+
+def test_token_bucket_limits_rate():
+    bucket = TokenBucket(rate=50, capacity=1)
+
+    start = time.perf_counter()
+    for _ in range(6):
+        bucket.acquire()
+
+    assert time.perf_counter() - start >= 0.08
@@ -5,7 +5,9 @@ Unit tests for Model Performance Tracker
 import unittest
 from unittest.mock import Mock, patch
 
-from model_performance import ModelPerformanceTracker
+from decimal import Decimal
+
+from model_performance import ModelPerformanceTracker, _rollup_cache
 
 
 class TestModelPerformanceTracker(unittest.TestCase):
@@ -97,5 +99,62 @@ class TestModelPerformanceTracker(unittest.TestCase):
         self.assertAlmostEqual(roi, 0.2727, places=2)
 
 
+    def test_record_outcome_increments_daily_rollup(self):
+        """Verified predictions ADD to the day's rollup counters"""
+        table = Mock()
+        tracker = ModelPerformanceTracker(table=table)
+
+        tracker.record_outcome("consensus", "basketball_nba", "2026-01-15T19:00:00Z", True, 0.72, -110)
+
+        kwargs = table.update_item.call_args.kwargs
+        self.assertEqual(kwargs["Key"], {"pk": "MODEL_ROLLUP#consensus#basketball_nba", "sk": "DAY#2026-01-15"})
+        self.assertTrue(kwargs["UpdateExpression"].startswith("ADD "))
+        self.assertEqual(kwargs["ExpressionAttributeNames"]["#bt"], "bucket_0.7-0.8_total")
+        self.assertEqual(kwargs["ExpressionAttributeValues"][":correct"], 1)
+
+    def test_get_rollup_performance_sums_days_and_memoizes(self):
+        """Daily rollups are summed into the get_model_performance shape, once per process"""
+        _rollup_cache.clear()
+        table = Mock()
+        coverage = {"Items": [{"sk": "DAY#2025-12-01"}]}
+        table.query.side_effect = [coverage, {
+            "Items": [
+                {"pk": "MODEL_ROLLUP#value#basketball_nba", "sk": "DAY#2026-01-14", "total": Decimal("3"),
+                 "correct": Decimal("2"), "confidence_sum": Decimal("2.1"), "return_sum": Decimal("381.82"),
+                 "bucket_0.7-0.8_total": Decimal("3"), "bucket_0.7-0.8_correct": Decimal("2")},
+                {"pk": "MODEL_ROLLUP#value#basketball_nba", "sk": "DAY#2026-01-15", "total": Decimal("1"),
+                 "correct": Decimal("0"), "confidence_sum": Decimal("0.6"), "return_sum": Decimal("0"),
+                 "bucket_0.6-0.7_total": Decimal("1"), "bucket_0.6-0.7_correct": Decimal("0")},
+            ]
+        }]
+        tracker = ModelPerformanceTracker(table=table)
+
+        perf = tracker.get_rollup_performance("value", "basketball_nba", days=30)
+        tracker.get_rollup_performance("value", "basketball_nba", days=30)
+
+        self.assertEqual(perf["total_predictions"], 4)
+        self.assertEqual(perf["accuracy"], 0.5)
+        self.assertAlmostEqual(perf["avg_confidence"], 0.675)
+        self.assertEqual(perf["confidence_calibration"], {"0.6-0.7": 0.0, "0.7-0.8": 2 / 3})
+        self.assertAlmostEqual(perf["roi"], (381.82 - 400) / 400)
+        self.assertEqual(table.query.call_count, 2)
+
+    def test_get_rollup_performance_falls_back_until_rollups_cover_window(self):
+        """Without a rollup at or before the window start, the analysis query is used"""
+        _rollup_cache.clear()
+        table = Mock()
+        table.query.return_value = {"Items": []}
+        tracker = ModelPerformanceTracker(table=table)
+        full = {"total_predictions": 40, "accuracy": 0.6}
+
+        with patch.object(tracker, "get_model_performance", return_value=full) as fallback:
+            perf = tracker.get_rollup_performance("value", "basketball_nba", days=30)
+            tracker.get_rollup_performance("value", "basketball_nba", days=30)
+
+        self.assertIs(perf, full)
+        fallback.assert_called_once_with("value", "basketball_nba", days=30)
+        self.assertEqual(table.query.call_args.kwargs["Limit"], 1)
+
+
 if __name__ == "__main__":
     unittest.main()
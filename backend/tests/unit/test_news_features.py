@@ -7,16 +7,22 @@ from decimal import Decimal
 os.environ["DYNAMODB_TABLE"] = "test-table"
 
 from news_features import (  # noqa: E402
+    NewsIndex,
+    clear_news_index,
     get_news_sentiment,
     get_player_sentiment,
     get_team_sentiment,
     enrich_game_with_news,
+    team_aliases,
 )
 
 
 class TestNewsFeatures(unittest.TestCase):
     """Test news sentiment extraction"""
 
+    def setUp(self):
+        clear_news_index()
+
     @patch("news_features.table")
     def test_get_news_sentiment_no_news(self, mock_table):
         """Should return zeros when no news found"""
@@ -124,5 +130,95 @@ class TestNewsFeatures(unittest.TestCase):
         self.assertEqual(result["away_news_impact"], 0.0)
 
 
+    @patch("news_features.table")
+    def test_news_index_loaded_once_per_sport(self, mock_table):
+        """Repeated lookups share one partition read"""
+        mock_table.query.return_value = {
+            "Items": [{"headline": "Lakers rally", "impact": "low"}]
+        }
+
+        get_player_sentiment("basketball_nba", "LeBron James")
+        get_team_sentiment("basketball_nba", "Los Angeles Lakers")
+        get_team_sentiment("basketball_nba", "Boston Celtics")
+
+        mock_table.query.assert_called_once()
+
+    @patch("news_features.table")
+    def test_news_index_follows_pagination(self, mock_table):
+        """All pages of the news window are indexed"""
+        mock_table.query.side_effect = [
+            {"Items": [{"headline": "Celtics win"}], "LastEvaluatedKey": {"pk": "x"}},
+            {"Items": [{"headline": "Celtics lose"}]},
+        ]
+
+        result = get_news_sentiment("basketball_nba", ["Celtics"])
+
+        self.assertEqual(result["news_count"], 2)
+
+
+class TestNewsIndex(unittest.TestCase):
+    """Test the inverted news index"""
+
+    def setUp(self):
+        self.index = NewsIndex(
+            "basketball_nba",
+            [
+                {"headline": "LeBron James scores 40", "description": "", "impact": "high",
+                 "sentiment_positive": Decimal("0.9"), "sentiment_negative": Decimal("0.1")},
+                {"headline": "Lakers' bench struggles", "description": "James rested",
+                 "sentiment_positive": Decimal("0.2"), "sentiment_negative": Decimal("0.7")},
+                {"headline": "Celtics roll", "description": "Jaylen Brown dominant"},
+            ],
+        )
+
+    def test_matches_full_phrase_on_word_boundaries(self):
+        """Player names match as phrases, not loose tokens"""
+        articles = self.index.articles_for(["LeBron James"])
+
+        self.assertEqual([a["headline"] for a in articles], ["LeBron James scores 40"])
+
+    def test_matches_punctuated_nickname(self):
+        """Punctuation around names is ignored"""
+        self.assertEqual(len(self.index.articles_for(["Lakers"])), 1)
+
+    def test_team_aliases_include_nickname(self):
+        """Teams are looked up by full name and nickname"""
+        self.assertEqual(
+            team_aliases("basketball_nba", "Los Angeles Lakers"), ["Los Angeles Lakers", "Lakers"]
+        )
+        self.assertEqual(team_aliases("soccer_epl", "Manchester United"), ["Manchester United"])
+
+    def test_team_aliases_avoid_shared_nicknames(self):
+        """Nicknames shared by teams in the same sport are not used as aliases"""
+        self.assertEqual(
+            team_aliases("baseball_mlb", "Boston Red Sox"), ["Boston Red Sox", "Red Sox"]
+        )
+        self.assertEqual(
+            team_aliases("baseball_mlb", "Chicago White Sox"), ["Chicago White Sox", "White Sox"]
+        )
+        for sport in ("basketball_ncaab", "basketball_wncaab", "americanfootball_ncaaf"):
+            self.assertEqual(team_aliases(sport, "Kentucky Wildcats"), ["Kentucky Wildcats"])
+            self.assertEqual(team_aliases(sport, "Arizona Wildcats"), ["Arizona Wildcats"])
+
+    def test_white_sox_news_does_not_count_for_red_sox(self):
+        """A White Sox headline doesn't match the Red Sox"""
+        index = NewsIndex("baseball_mlb", [
+            {"headline": "White Sox ace lands on injured list", "sentiment_score": -0.8},
+        ])
+
+        self.assertEqual(index.articles_for(team_aliases("baseball_mlb", "Boston Red Sox")), [])
+        self.assertEqual(
+            len(index.articles_for(team_aliases("baseball_mlb", "Chicago White Sox"))), 1
+        )
+
+    def test_sentiment_aggregate_memoized(self):
+        """Aggregates are computed once per entity"""
+        first = self.index.sentiment(["LeBron James"])
+
+        self.assertIs(self.index.sentiment(["lebron james"]), first)
+        self.assertEqual(first["news_count"], 1)
+        self.assertEqual(first["impact_score"], 3.0)
+
+
 if __name__ == "__main__":
     unittest.main()
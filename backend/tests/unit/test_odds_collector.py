@@ -8,6 +8,7 @@ from odds_collector import (
     convert_floats_to_decimal,
     get_secret,
     lambda_handler,
+    outcomes_hash,
 )
 
 
@@ -101,11 +102,8 @@ class TestOddsCollector(unittest.TestCase):
 
         self.assertEqual(result, [{"id": "game1", "home_team": "Team A"}])
 
-    @patch("odds_collector.boto3.resource")
-    def test_store_odds(self, mock_boto3):
-        mock_boto3.return_value.Table.return_value = self.mock_table
-
-        odds_data = [
+    def _odds_data(self, price=1.5):
+        return [
             {
                 "id": "game1",
                 "home_team": "Team A",
@@ -114,33 +112,108 @@ class TestOddsCollector(unittest.TestCase):
                 "bookmakers": [
                     {
                         "key": "betmgm",
-                        "markets": [{"key": "h2h", "outcomes": [{"price": 1.5}]}],
+                        "markets": [{"key": "h2h", "outcomes": [{"name": "Team A", "price": price}]}],
                     }
                 ],
             }
         ]
 
+    def _store(self, mock_boto3, odds_data, existing=None):
+        mock_boto3.return_value.Table.return_value = self.mock_table
+        self.mock_table.name = "test-table"
+        client = self.mock_table.meta.client
+        client.batch_get_item.return_value = {
+            "Responses": {"test-table": existing or []},
+            "UnprocessedKeys": {},
+        }
+        client.batch_write_item.return_value = {"UnprocessedItems": {}}
+
         with patch.dict(
             "os.environ", {"ODDS_API_KEY": "test-key", "DYNAMODB_TABLE": "test-table"}
-        ):
+        ), patch("dynamo_batch_writer.boto3"):
             collector = OddsCollector()
-            collector.store_odds("americanfootball_nfl", odds_data)
-
-        self.mock_table.put_item.assert_called()
-        # Check that put_item was called with the correct data structure
-        call_args = self.mock_table.put_item.call_args_list
-        self.assertGreater(len(call_args), 0)  # At least one put_item call
-
-        # Check that the game data was stored
-        found_game_record = False
-        for call in call_args:
-            item = call[1]["Item"]  # Get the Item from kwargs
-            if item["pk"] == "GAME#game1" and "betmgm#h2h#LATEST" in item["sk"]:
-                found_game_record = True
-                self.assertEqual(item["sport"], "americanfootball_nfl")
-                break
-
-        self.assertTrue(found_game_record, "Game record not found in put_item calls")
+            counts = collector.store_odds("americanfootball_nfl", odds_data)
+
+        written = [
+            request["PutRequest"]["Item"]
+            for call in client.batch_write_item.call_args_list
+            for request in call.kwargs["RequestItems"]["test-table"]
+        ]
+        return counts, written
+
+    @patch("odds_collector.boto3.resource")
+    def test_store_odds(self, mock_boto3):
+        counts, written = self._store(mock_boto3, self._odds_data())
+
+        self.assertEqual(counts["changed"], 1)
+        self.mock_table.meta.client.batch_get_item.assert_called_once()
+        self.mock_table.put_item.assert_not_called()
+        self.assertEqual(len(written), 2)
+
+        latest = next(item for item in written if item["sk"] == "betmgm#h2h#LATEST")
+        self.assertEqual(latest["sport"], "americanfootball_nfl")
+        self.assertEqual(latest["active_bet_pk"], "GAME#americanfootball_nfl")
+        self.assertTrue(any(item["sk"].startswith("betmgm#h2h#2") for item in written))
+
+    @patch("odds_collector.time.sleep")
+    @patch("odds_collector.boto3.resource")
+    def test_store_odds_skips_markets_it_could_not_read(self, mock_boto3, mock_sleep):
+        key = {"pk": "GAME#game1", "sk": "betmgm#h2h#LATEST"}
+        self.mock_table.meta.client.batch_get_item.side_effect = lambda **kwargs: {
+            "Responses": {},
+            "UnprocessedKeys": {"test-table": {"Keys": [key]}},
+        }
+
+        counts, written = self._store(mock_boto3, self._odds_data())
+
+        self.assertEqual(self.mock_table.meta.client.batch_get_item.call_count, 5)
+        self.assertEqual(mock_sleep.call_count, 4)
+        self.assertEqual(counts["skipped"], 1)
+        self.assertEqual(counts["changed"], 0)
+        self.assertEqual(written, [])
+
+    @patch("odds_collector.boto3.resource")
+    def test_store_odds_skips_markets_when_read_fails(self, mock_boto3):
+        self.mock_table.meta.client.batch_get_item.side_effect = Exception("Throttled")
+
+        counts, written = self._store(mock_boto3, self._odds_data())
+
+        self.assertEqual(counts["skipped"], 1)
+        self.assertEqual(written, [])
+
+    @patch("odds_collector.boto3.resource")
+    def test_store_odds_unchanged_only_refreshes_latest(self, mock_boto3):
+        existing = {
+            "pk": "GAME#game1",
+            "sk": "betmgm#h2h#LATEST",
+            "outcomes": [{"name": "Team A", "price": Decimal("1.50")}],
+            "updated_at": "2024-12-31T00:00:00",
+        }
+
+        counts, written = self._store(mock_boto3, self._odds_data(), existing=[existing])
+
+        self.assertEqual(counts, {"changed": 0, "unchanged": 1, "skipped": 0, "failed": 0})
+        self.assertEqual(len(written), 1)
+        self.assertEqual(written[0]["sk"], "betmgm#h2h#LATEST")
+        self.assertNotEqual(written[0]["updated_at"], "2024-12-31T00:00:00")
+
+    @patch("odds_collector.boto3.resource")
+    def test_store_odds_records_new_catalog_values_once(self, mock_boto3):
+        with patch("odds_collector._catalog_seen", {"sports": set(), "bookmakers": set()}):
+            self._store(mock_boto3, self._odds_data())
+            self._store(mock_boto3, self._odds_data(price=1.7))
+
+        self.mock_table.update_item.assert_called_once()
+        values = self.mock_table.update_item.call_args.kwargs["ExpressionAttributeValues"]
+        self.assertEqual(values[":sports"], {"americanfootball_nfl"})
+        self.assertEqual(values[":bookmakers"], {"betmgm"})
+
+    def test_outcomes_hash_ignores_order_and_numeric_type(self):
+        a = [{"name": "A", "price": -110}, {"name": "B", "price": 1.5}]
+        b = [{"name": "B", "price": Decimal("1.50")}, {"name": "A", "price": Decimal("-110")}]
+
+        self.assertEqual(outcomes_hash(a), outcomes_hash(b))
+        self.assertNotEqual(outcomes_hash(a), outcomes_hash([{"name": "A", "price": -105}]))
 
 
 class TestLambdaHandler(unittest.TestCase):
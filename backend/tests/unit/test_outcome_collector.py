@@ -1,5 +1,8 @@
+import copy
 import os
 import sys
+import threading
+import time
 import unittest
 from decimal import Decimal
 from unittest.mock import Mock, MagicMock, patch
@@ -189,10 +192,9 @@ class TestOutcomeCollector(unittest.TestCase):
         mock_table = Mock()
         mock_boto3.resource.return_value.Table.return_value = mock_table
 
-        # Mock query to return item only for consensus/game combination
+        # Mock query to return the game's analyses from the per-game index
         def mock_query(**kwargs):
-            pk = kwargs.get("ExpressionAttributeValues", {}).get(":pk", "")
-            if "consensus" in pk and "game" in pk:
+            if kwargs.get("IndexName") == "GameIndex":
                 return {
                     "Items": [
                         {
@@ -222,11 +224,55 @@ class TestOutcomeCollector(unittest.TestCase):
 
         updates = collector._update_analysis_outcomes(game)
 
-        # Verify query and update were called
-        self.assertGreater(mock_table.query.call_count, 0)
-        self.assertEqual(mock_table.update_item.call_count, 1)
+        # One GameIndex query replaces the model x bet type x bookmaker fan-out
+        self.assertEqual(mock_table.query.call_count, 1)
+        condition = mock_table.query.call_args.kwargs["KeyConditionExpression"]
+        self.assertEqual(condition.get_expression()["values"][1], "ANALYSIS_BY_GAME#game123")
         self.assertEqual(updates, 1)
 
+        # One analysis update plus one performance rollup increment
+        keys = [c.kwargs["Key"] for c in mock_table.update_item.call_args_list]
+        self.assertEqual(keys, [
+            {"pk": "ANALYSIS#basketball_nba#fanduel#consensus#game", "sk": "consensus#game#LATEST"},
+            {"pk": "MODEL_ROLLUP#consensus#basketball_nba", "sk": f"DAY#{keys[1]['sk'][4:]}"},
+        ])
+
+    @patch("outcome_collector.EloCalculator")
+    @patch("outcome_collector.boto3")
+    def test_update_analysis_outcomes_uses_indexed_inverse(self, mock_boto3, mock_elo):
+        """INVERSE records returned by the index are verified without a get_item"""
+        mock_table = MagicMock()
+        mock_boto3.resource.return_value.Table.return_value = mock_table
+        base = {
+            "pk": "ANALYSIS#basketball_nba#game123#fanduel",
+            "analysis_type": "game",
+            "game_id": "game123",
+            "model": "value",
+            "sport": "basketball_nba",
+        }
+        mock_table.query.return_value = {"Items": [
+            {**base, "sk": "value#game#LATEST", "prediction": "Lakers"},
+            {**base, "sk": "value#game#INVERSE", "prediction": "Warriors"},
+        ]}
+
+        collector = OutcomeCollector("test-table", "test-key")
+        updates = collector._update_analysis_outcomes({
+            "id": "game123",
+            "sport": "basketball_nba",
+            "home_team": "Lakers",
+            "away_team": "Warriors",
+            "home_score": "120",
+            "away_score": "115",
+        })
+
+        self.assertEqual(updates, 2)
+        mock_table.get_item.assert_not_called()
+        inverse_update = next(
+            c.kwargs for c in mock_table.update_item.call_args_list
+            if c.kwargs["Key"]["sk"] == "value#game#INVERSE"
+        )
+        self.assertFalse(inverse_update["ExpressionAttributeValues"][":correct"])
+
     @patch("outcome_collector.EloCalculator")
     @patch("outcome_collector.requests.get")
     @patch("outcome_collector.boto3")
@@ -341,6 +387,138 @@ class TestOutcomeCollector(unittest.TestCase):
         self.assertEqual(collector._get_stat_value(stats, "rebounds"), 10)
         self.assertEqual(collector._get_stat_value(stats, "assists"), 8)
 
+    @patch("outcome_collector.EloCalculator")
+    @patch("outcome_collector.boto3")
+    def test_credit_bankroll_serializes_concurrent_games(self, mock_boto3, mock_elo):
+        """Concurrent credits to one version never read a stale balance"""
+        bankroll = {"amount": Decimal("100")}
+
+        def get_item(Key):
+            amount = bankroll["amount"]
+            time.sleep(0.001)
+            return {"Item": {"amount": amount}}
+
+        def put_item(Item):
+            if Item["sk"] == "BANKROLL":
+                bankroll["amount"] = Item["amount"]
+
+        mock_table = MagicMock()
+        mock_table.get_item.side_effect = get_item
+        mock_table.put_item.side_effect = put_item
+        mock_boto3.resource.return_value.Table.return_value = mock_table
+
+        collector = OutcomeCollector("test-table", "test-key")
+        threads = [
+            threading.Thread(target=collector._credit_bankroll, args=("BENNY", Decimal("5")))
+            for _ in range(10)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(bankroll["amount"], Decimal("150"))
+
+    @patch("outcome_collector.EloCalculator")
+    @patch("outcome_collector.boto3")
+    def test_collect_recent_outcomes_batches_inserts_and_reports_stages(self, mock_boto3, mock_elo):
+        """Outcome records go through batch_write_item and every stage is timed"""
+        mock_table = MagicMock()
+        mock_table.name = "test-table"
+        mock_table.query.return_value = {"Items": []}
+        mock_table.meta.client.batch_write_item.return_value = {"UnprocessedItems": {}}
+        mock_boto3.resource.return_value.Table.return_value = mock_table
+
+        games = [
+            {
+                "id": f"game{i}",
+                "sport": "basketball_nba",
+                "home_team": "Lakers",
+                "away_team": f"Team {i}",
+                "home_score": "110",
+                "away_score": "105",
+            }
+            for i in range(4)
+        ]
+        collector = OutcomeCollector("test-table", "test-key")
+        with patch.object(collector, "_get_completed_games", return_value=games):
+            results = collector.collect_recent_outcomes(days_back=1)
+
+        self.assertEqual(results["stored_outcomes"], 4)
+        self.assertEqual(results["updated_elo"], 4)
+        mock_table.put_item.assert_not_called()
+
+        batches = mock_table.meta.client.batch_write_item.call_args_list
+        written = [r["PutRequest"]["Item"]["pk"] for c in batches for r in c.kwargs["RequestItems"]["test-table"]]
+        self.assertEqual(len(written), 12)  # one OUTCOME + two TEAM_OUTCOME per game
+        self.assertEqual(collector.stage_counts["verify_analysis"], 4)
+
+        metrics = [
+            m for c in mock_boto3.client.return_value.put_metric_data.call_args_list
+            for m in c.kwargs["MetricData"]
+        ]
+        stages = {m["Dimensions"][0]["Value"] for m in metrics if m["MetricName"] == "StageLatency"}
+        self.assertTrue({"store_outcome", "settle_bets", "settle_parlays", "elo"} <= stages)
+
+    @patch("outcome_collector.EloCalculator")
+    @patch("outcome_collector.boto3")
+    def test_parlay_spanning_games_in_one_run_settles_every_leg(self, mock_boto3, mock_elo):
+        """Legs settled by different games in the same run don't overwrite each other"""
+        parlay = {
+            "pk": "BENNY",
+            "sk": "BET#p1",
+            "status": "pending",
+            "bet_type": "parlay",
+            "bet_amount": Decimal("10"),
+            "combined_decimal_odds": Decimal("3.5"),
+            "legs": [
+                {"game_id": f"game{i}", "prediction": "Lakers", "status": "pending"}
+                for i in range(4)
+            ],
+        }
+
+        def query(**kwargs):
+            values = kwargs.get("ExpressionAttributeValues", {})
+            if values.get(":pk") == "BENNY" and parlay["status"] == "pending":
+                items = [copy.deepcopy(parlay)]
+                time.sleep(0.01)  # Widen the read-modify-write window
+                return {"Items": items}
+            return {"Items": []}
+
+        def update_item(Key, ExpressionAttributeValues, **kwargs):
+            parlay["legs"] = ExpressionAttributeValues[":legs"]
+            parlay["status"] = ExpressionAttributeValues.get(":status", parlay["status"])
+
+        mock_table = MagicMock()
+        mock_table.query.side_effect = query
+        mock_table.update_item.side_effect = update_item
+        mock_boto3.resource.return_value.Table.return_value = mock_table
+
+        games = [
+            {
+                "id": f"game{i}",
+                "sport": "basketball_nba",
+                "home_team": "Lakers",
+                "away_team": f"Team {i}",
+                "home_score": "110",
+                "away_score": "105",
+            }
+            for i in range(4)
+        ]
+        collector = OutcomeCollector("test-table", "test-key")
+        with patch.object(collector, "_get_completed_games", return_value=games), \
+                patch.object(collector, "_store_outcome"), \
+                patch.object(collector, "_store_prop_outcomes", return_value=0), \
+                patch.object(collector, "_update_analysis_outcomes", return_value=0), \
+                patch.object(collector, "_settle_benny_bets"), \
+                patch.object(collector, "_archive_game_odds"), \
+                patch.object(collector, "_update_elo_ratings", return_value=True), \
+                patch.object(collector, "_credit_bankroll") as credit:
+            collector.collect_recent_outcomes(days_back=1)
+
+        self.assertEqual([leg["status"] for leg in parlay["legs"]], ["won"] * 4)
+        self.assertEqual(parlay["status"], "won")
+        credit.assert_called_once_with("BENNY", Decimal("35.0"), "parlays")
 
 if __name__ == "__main__":
     unittest.main()
@@ -121,6 +121,36 @@ class TestParlayEngine:
         # No player should appear in more than one parlay
         assert len(all_players) == len(set(all_players))
 
+    def test_prefers_highest_combined_ev(self):
+        opps = [
+            _make_leg("g1", "Player A", 0.90, odds=-400),  # factor 1.125
+            _make_leg("g2", "Player B", 0.75, odds=150),  # factor 1.875
+            _make_leg("g3", "Player C", 0.72, odds=120),  # factor 1.584
+        ]
+        parlays = ParlayEngine(max_legs=2).build_parlays(opps, max_parlays=1)
+        assert {l["player"] for l in parlays[0]["legs"]} == {"Player B", "Player C"}
+
+    def test_builds_four_leg_parlays(self):
+        opps = [_make_leg(f"g{i}", f"Player {i}", 0.80) for i in range(8)]
+        parlays = ParlayEngine(max_legs=4).build_parlays(opps, max_parlays=2)
+        assert [p["num_legs"] for p in parlays] == [4, 4]
+
+    def test_skips_sizes_without_enough_games(self):
+        opps = [_make_leg(f"g{i % 2}", f"Player {i}", 0.80) for i in range(6)]
+        parlays = ParlayEngine(max_legs=4).build_parlays(opps, max_parlays=5)
+        assert [p["num_legs"] for p in parlays] == [2, 2, 2]
+
+    def test_search_prunes_large_candidate_pools(self):
+        opps = [
+            _make_leg(f"g{i % 60}", f"Player {i}", 0.70 + (i % 20) / 100, odds=-110 + (i % 7) * 5)
+            for i in range(300)
+        ]
+        engine = ParlayEngine(max_legs=4)
+        parlays = engine.build_parlays(opps, max_parlays=10)
+        assert len(parlays) == 10
+        # C(300, 4) is ~330 million; the bound keeps the search tiny
+        assert engine.nodes_searched < 50_000
+
     def test_empty_opportunities(self):
         assert self.engine.build_parlays([]) == []
 
@@ -0,0 +1,91 @@
+"""Unit tests for the shared settled-bet snapshot"""
+import unittest
+from decimal import Decimal
+from unittest.mock import Mock
+
+from benny.settled_bets import SettledBets, SettledBetStore, clear_settled_bets, get_settled_bets
+
+
+def _bet(placed, status, amount="10", profit="9.09", sport="basketball_nba"):
+    return {
+        "sk": f"BET#{placed}#game1",
+        "status": status,
+        "sport": sport,
+        "bet_amount": Decimal(amount),
+        "profit": Decimal(profit),
+        "settled_at": placed if status != "pending" else None,
+    }
+
+
+class TestSettledBets(unittest.TestCase):
+
+    def test_from_items_keeps_settled_bets_as_floats(self):
+        bets = SettledBets.from_items([
+            _bet("2026-01-01T00:00:00", "won"),
+            _bet("2026-01-02T00:00:00", "lost", profit="-10"),
+            _bet("2026-01-03T00:00:00", "pending"),
+        ])
+
+        self.assertEqual(len(bets), 2)
+        self.assertEqual(bets.won, [True, False])
+        self.assertEqual(bets["bet_amount"], [10.0, 10.0])
+        self.assertAlmostEqual(bets.total("profit"), -0.91)
+
+    def test_upsert_replaces_by_sk(self):
+        bets = SettledBets.from_items([_bet("2026-01-01T00:00:00", "won")])
+
+        added = bets.upsert([_bet("2026-01-01T00:00:00", "lost", profit="-10")])
+
+        self.assertEqual(added, 0)
+        self.assertEqual(bets["status"], ["lost"])
+
+    def test_since_and_group_by(self):
+        bets = SettledBets.from_items([
+            _bet("2026-01-01T00:00:00", "won"),
+            _bet("2026-02-01T00:00:00", "won", sport="icehockey_nhl"),
+            _bet("2026-02-02T00:00:00", "lost"),
+        ])
+
+        recent = bets.since("settled_at", "2026-01-15")
+        by_sport = recent.group_by("sport")
+
+        self.assertEqual(len(recent), 2)
+        self.assertEqual(sorted(by_sport), ["basketball_nba", "icehockey_nhl"])
+        self.assertEqual(by_sport["basketball_nba"].rows()[0]["status"], "lost")
+
+
+class TestSettledBetStore(unittest.TestCase):
+
+    def setUp(self):
+        clear_settled_bets()
+
+    def test_refresh_reads_from_oldest_pending_bet(self):
+        table = Mock()
+        pending = _bet("2099-01-02T00:00:00", "pending")
+        table.query.return_value = {"Items": [_bet("2099-01-01T00:00:00", "won"), pending]}
+        store = SettledBetStore(table, "BENNY")
+
+        store.load()
+        self.assertEqual(store.floor, pending["sk"])
+
+        table.query.return_value = {"Items": [{**pending, "status": "lost", "profit": Decimal("-10")}]}
+        bets = store.load(max_age=0)
+
+        self.assertEqual(len(bets), 2)
+        condition = table.query.call_args.kwargs["KeyConditionExpression"]
+        self.assertEqual(condition.get_expression()["values"][1].get_expression()["operator"], "BETWEEN")
+        self.assertEqual(store.floor, pending["sk"])
+
+    def test_get_settled_bets_shares_one_read_per_table(self):
+        table = Mock()
+        table.query.return_value = {"Items": [_bet("2026-01-01T00:00:00", "won")]}
+
+        first = get_settled_bets(table, "BENNY_V3")
+        second = get_settled_bets(table, "BENNY_V3")
+
+        self.assertIs(first, second)
+        table.query.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
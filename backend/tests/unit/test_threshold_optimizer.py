@@ -2,7 +2,7 @@
 import unittest
 from unittest.mock import Mock
 from decimal import Decimal
-from benny.threshold_optimizer import ThresholdOptimizer
+from benny.threshold_optimizer import CONFIDENCE_GRID, EV_GRID, ThresholdOptimizer, expected_value
 
 
 class TestThresholdOptimizer(unittest.TestCase):
@@ -66,6 +66,7 @@ class TestThresholdOptimizer(unittest.TestCase):
                 "bet_amount": Decimal("10"),
                 "profit": Decimal(str(profit)),
                 "result": result,
+                "status": "won" if result == "win" else "lost",
                 "sport": "basketball_nba",
                 "market_key": "h2h"
             })
@@ -85,6 +86,69 @@ class TestThresholdOptimizer(unittest.TestCase):
         self.assertIn("optimal_min_ev", result["global"])
         self.assertIn("expected_roi", result["global"])
     
+    def test_ev_threshold_is_applied(self):
+        """Heavy favourites with negative EV are excluded by the EV threshold"""
+        bets = []
+        for i in range(10):
+            # 0.85 confidence at +120 is strong EV and wins
+            bets.append({"confidence": Decimal("0.85"), "odds": Decimal("120"), "status": "won",
+                         "bet_amount": Decimal("10"), "profit": Decimal("12")})
+            # 0.85 confidence at -900 is negative EV and loses
+            bets.append({"confidence": Decimal("0.85"), "odds": Decimal("-900"), "status": "lost",
+                         "bet_amount": Decimal("10"), "profit": Decimal("-10")})
+
+        result = self.optimizer._find_optimal_thresholds(bets)
+
+        # Same confidence, so only the EV threshold can separate them
+        self.assertEqual(result["sample_size"], 10)
+        self.assertAlmostEqual(result["expected_roi"], 1.2)
+
+    def test_grid_matches_brute_force(self):
+        """Suffix-sum scoring picks the same cell as refiltering per threshold pair"""
+        import random
+        rng = random.Random(3)
+        bets = []
+        for _ in range(120):
+            confidence = rng.uniform(0.5, 0.95)
+            odds = rng.choice([-150, -110, 120, 150])
+            won = rng.random() < confidence - 0.1
+            bets.append({"confidence": confidence, "odds": odds, "status": "won" if won else "lost",
+                         "bet_amount": 10, "profit": 8 if won else -10})
+
+        result = self.optimizer._find_optimal_thresholds(bets)
+
+        best = (-float("inf"), None)
+        for conf in CONFIDENCE_GRID:
+            for ev in EV_GRID:
+                passed = [b for b in bets if b["confidence"] >= conf
+                          and expected_value(b["confidence"], b["odds"]) >= ev]
+                if len(passed) < 5:
+                    continue
+                roi = sum(b["profit"] for b in passed) / sum(b["bet_amount"] for b in passed)
+                if roi > best[0]:
+                    best = (roi, (conf, ev))
+        self.assertAlmostEqual(result["expected_roi"], best[0])
+        self.assertEqual((result["optimal_min_confidence"], result["optimal_min_ev"]), best[1])
+
+    def test_optimize_thresholds_adds_bootstrap_interval(self):
+        """Chosen thresholds carry a bootstrap interval"""
+        bets = [
+            {"sk": f"BET#{i:03d}", "confidence": Decimal("0.60") + Decimal(i % 30) / 100,
+             "status": "won" if i % 30 > 12 else "lost", "bet_amount": Decimal("10"),
+             "profit": Decimal("9") if i % 30 > 12 else Decimal("-10"),
+             "sport": "basketball_nba", "market_key": "h2h"}
+            for i in range(60)
+        ]
+        self.mock_table.query.return_value = {"Items": bets}
+        optimizer = ThresholdOptimizer(self.mock_table, "BENNY", bootstrap_samples=20, seed=1)
+
+        result = optimizer.optimize_thresholds()
+
+        low, high = result["global"]["confidence_interval"]["min_confidence"]
+        self.assertLessEqual(low, result["global"]["optimal_min_confidence"])
+        self.assertGreaterEqual(high, result["global"]["optimal_min_confidence"])
+        self.assertIn("confidence_interval", result["by_sport"]["basketball_nba"])
+
     def test_save_optimal_thresholds(self):
         """Test saving thresholds to DynamoDB"""
         thresholds = {
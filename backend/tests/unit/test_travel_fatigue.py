@@ -53,6 +53,48 @@ class TestTravelFatigueCalculator(unittest.TestCase):
         self.assertIn("fatigue_score", result)
         self.assertIn("total_miles", result)
 
+    def test_distance_matrix_symmetric(self):
+        """Test precomputed distances match in both directions"""
+        there = self.calculator.calculate_distance("Miami Heat", "Seattle Kraken")
+        back = self.calculator.calculate_distance("Seattle Kraken", "Miami Heat")
+        self.assertEqual(there, back)
+        self.assertGreater(there, 2500)
+
+    def test_schedule_loaded_once_per_sport_window(self):
+        """Test fatigue for a slate reuses one schedule read"""
+        self.mock_table.query.return_value = {
+            "Items": [
+                {"pk": "GAME#g1", "home_team": "Boston Celtics", "away_team": "Los Angeles Lakers",
+                 "commence_time": "2026-02-18T19:00:00Z"},
+                {"pk": "GAME#g1", "home_team": "Boston Celtics", "away_team": "Los Angeles Lakers",
+                 "commence_time": "2026-02-18T19:00:00Z"},
+                {"pk": "GAME#g2", "home_team": "Miami Heat", "away_team": "Boston Celtics",
+                 "commence_time": "2026-02-10T19:00:00Z"},
+            ]
+        }
+        self.calculator.load_schedule("basketball_nba", "2026-02-06T00:00:00Z", "2026-02-21T00:00:00Z")
+
+        lakers = self.calculator.calculate_fatigue_score(
+            "Los Angeles Lakers", "basketball_nba", "2026-02-20T19:00:00Z"
+        )
+        celtics_games = self.calculator._get_recent_games(
+            "Boston Celtics", "basketball_nba", "2026-02-20T19:00:00Z"
+        )
+
+        self.assertEqual(self.mock_table.query.call_count, 1)
+        self.assertEqual(lakers["days_rest"], 2)
+        self.assertEqual(lakers["road_games"], 1)
+        self.assertEqual([g["pk"] for g in celtics_games], ["GAME#g1", "GAME#g2"])
+
+    def test_schedule_reloaded_outside_window(self):
+        """Test a date outside the loaded window triggers a new read"""
+        self.mock_table.query.return_value = {"Items": []}
+        self.calculator.load_schedule("basketball_nba", "2026-02-06T00:00:00Z", "2026-02-21T00:00:00Z")
+
+        self.calculator.calculate_fatigue_score("Miami Heat", "basketball_nba", "2026-03-20T19:00:00Z")
+
+        self.assertEqual(self.mock_table.query.call_count, 2)
+
 
 if __name__ == "__main__":
     unittest.main()
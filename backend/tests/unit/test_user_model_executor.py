@@ -5,6 +5,7 @@ import unittest
 from unittest.mock import Mock, patch
 
 from user_model_executor import (
+    FeatureStore,
     calculate_prediction,
     evaluate_head_to_head,
     evaluate_odds_movement,
@@ -13,6 +14,7 @@ from user_model_executor import (
     evaluate_recent_form,
     evaluate_rest_schedule,
     evaluate_team_stats,
+    handler,
     process_model,
 )
 from user_models import UserModel
@@ -720,5 +722,151 @@ class TestGetUpcomingBets(unittest.TestCase):
         self.assertEqual(len(bets), 0)
 
 
+class TestAsOfEvaluation(unittest.TestCase):
+    @patch("user_model_executor.bets_table")
+    def test_as_of_bounds_team_outcome_queries(self, mock_table):
+        mock_table.query.return_value = {"Items": []}
+
+        evaluate_recent_form({
+            "sport": "basketball_nba",
+            "home_team": "Lakers",
+            "away_team": "Warriors",
+            "as_of": "2024-01-05T19:00:00Z",
+        })
+
+        condition = mock_table.query.call_args.kwargs["KeyConditionExpression"]
+        sort_key = condition.get_expression()["values"][1]
+        self.assertEqual(sort_key.get_expression()["operator"], "<")
+        self.assertEqual(sort_key.get_expression()["values"][1], "2024-01-05T19:00:00Z")
+
+    @patch("user_model_executor.bets_table")
+    def test_failed_reads_are_reported_to_errors(self, mock_table):
+        mock_table.query.side_effect = Exception("ProvisionedThroughputExceededException")
+        game = {"sport": "basketball_nba", "home_team": "Lakers", "away_team": "Warriors", "errors": []}
+
+        self.assertEqual(evaluate_recent_form(game), 0.5)
+        self.assertEqual(len(game["errors"]), 1)
+
+        # No data is neutral too, but not an error
+        mock_table.query.side_effect = None
+        mock_table.query.return_value = {"Items": []}
+        game["errors"] = []
+        evaluate_recent_form(game)
+        self.assertEqual(game["errors"], [])
+
+    @patch("user_model_executor.bets_table")
+    def test_as_of_odds_movement_ignores_later_lines(self, mock_table):
+        def odds(sk, updated_at, home_price):
+            return {
+                "sk": sk, "bookmaker": "fanduel", "market_key": "h2h", "updated_at": updated_at,
+                "home_team": "Lakers", "away_team": "Warriors",
+                "outcomes": [{"name": "Lakers", "price": home_price}, {"name": "Warriors", "price": 100}],
+            }
+
+        mock_table.query.return_value = {"Items": [
+            odds("fanduel#h2h#2024-01-04T10:00:00", "2024-01-04T10:00:00", -110),
+            odds("fanduel#h2h#2024-01-05T10:00:00", "2024-01-05T10:00:00", -150),
+            odds("fanduel#h2h#2024-01-05T21:00:00", "2024-01-05T21:00:00", 300),  # in-game
+            odds("fanduel#h2h#LATEST", "2024-01-05T21:00:00", 300),
+        ]}
+
+        score = evaluate_odds_movement({"game_id": "g1", "as_of": "2024-01-05T19:00:00Z"})
+
+        # Home shortened from -110 to -150 before tip-off: sharp money on home
+        self.assertAlmostEqual(score, 0.9)
+
+
+class TestCustomDataEvaluation(unittest.TestCase):
+    def test_team_data_compares_numeric_columns(self):
+        from custom_data import CompiledDataset, compile_dataset
+        from user_model_executor import evaluate_custom_data
+
+        compiled = CompiledDataset(compile_dataset([
+            {"team": "Los Angeles Lakers", "off": 120, "def": 60, "coach": "JJ"},
+            {"team": "Golden State Warriors", "off": 80, "def": 60, "coach": "Steve"},
+        ], "team"))
+
+        with patch("custom_data.get_compiled_dataset", return_value=compiled) as mock_get:
+            score = evaluate_custom_data({
+                "user_id": "user123",
+                "dataset_id": "dataset_1",
+                "home_team": "Lakers",
+                "away_team": "Golden State Warriors",
+            })
+
+        mock_get.assert_called_once_with("user123", "dataset_1")
+        self.assertAlmostEqual(score, (0.6 + 0.5) / 2)
+
+
+class TestFeatureStore(unittest.TestCase):
+    def _model(self, model_id, weights):
+        model = Mock()
+        model.model_id = model_id
+        model.user_id = "user123"
+        model.sport = "basketball_nba"
+        model.bet_types = ["h2h", "spreads"]
+        model.status = "active"
+        model.min_confidence = 0.5
+        model.custom_datasets = []
+        model.data_sources = {
+            name: {"enabled": True, "weight": weight} for name, weight in weights.items()
+        }
+        return model
+
+    @patch("user_model_executor.ModelPrediction")
+    @patch("user_model_executor.UserModel.get")
+    @patch("user_model_executor.get_upcoming_bets")
+    def test_handler_evaluates_each_game_source_once(self, mock_get_bets, mock_get_model, mock_prediction):
+        """Models in one batch share game-level scores and the upcoming-bets read"""
+        game = {
+            "game_id": "game1",
+            "sport": "basketball_nba",
+            "home_team": "Lakers",
+            "away_team": "Warriors",
+            "commence_time": "2026-02-04T19:00:00Z",
+        }
+        mock_get_bets.return_value = [
+            {**game, "bet_type": "h2h", "market_key": "h2h"},
+            {**game, "bet_type": "spreads", "market_key": "spreads"},
+        ]
+        models = {
+            "m1": self._model("m1", {"team_stats": 1.0, "odds_movement": 1.0}),
+            "m2": self._model("m2", {"team_stats": 3.0}),
+        }
+        mock_get_model.side_effect = lambda user_id, model_id: models[model_id]
+        team_stats = Mock(return_value=0.8)
+        odds_movement = Mock(return_value=0.6)
+
+        with patch(
+            "user_model_executor.DATA_SOURCE_EVALUATORS",
+            {"team_stats": team_stats, "odds_movement": odds_movement},
+        ):
+            handler({"Records": [
+                {"messageId": "1", "body": '{"model_id": "m1", "user_id": "user123"}'},
+                {"messageId": "2", "body": '{"model_id": "m2", "user_id": "user123"}'},
+            ]}, None)
+
+        self.assertEqual(team_stats.call_count, 1)
+        self.assertEqual(odds_movement.call_count, 1)
+        mock_get_bets.assert_called_once()
+        confidences = sorted(round(c.kwargs["confidence"], 6) for c in mock_prediction.call_args_list)
+        self.assertEqual(confidences, [0.7, 0.7, 0.8, 0.8])
+
+    def test_player_sources_are_keyed_by_player(self):
+        store = FeatureStore()
+        evaluator = Mock(side_effect=lambda bet: 0.6 if bet["player_name"] == "A" else 0.4)
+        bets = [
+            {"game_id": "g1", "bet_type": "props", "player_name": name}
+            for name in ("A", "B", "A")
+        ]
+
+        with patch("user_model_executor.DATA_SOURCE_EVALUATORS", {"player_stats": evaluator}):
+            scores = [store.score("player_stats", bet) for bet in bets]
+
+        self.assertEqual(scores, [0.6, 0.4, 0.6])
+        self.assertEqual(evaluator.call_count, 2)
+        self.assertEqual(store.hits, 1)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -3,41 +3,44 @@ import json
 from unittest.mock import Mock, patch, MagicMock
 import pytest
 from user_model_queue_loader import handler, get_all_active_models, load_models_to_queue
+from user_models import ACTIVE_MODEL_SHARDS
 
 
 @patch('user_model_queue_loader.user_models_table')
 def test_get_all_active_models(mock_table):
-    """Test getting all active models"""
-    mock_table.scan.return_value = {
-        'Items': [
-            {'model_id': 'model1', 'status': 'active'},
-            {'model_id': 'model2', 'status': 'active'}
-        ]
+    """Test reading active models from every ActiveModelsIndex shard"""
+    mock_table.query.return_value = {
+        'Items': [{'model_id': 'model1', 'user_id': 'user1'}]
     }
-    
+
     models = get_all_active_models()
-    
-    assert len(models) == 2
-    assert models[0]['model_id'] == 'model1'
+
+    assert len(models) == ACTIVE_MODEL_SHARDS
+    assert mock_table.query.call_count == ACTIVE_MODEL_SHARDS
+    mock_table.scan.assert_not_called()
+    assert mock_table.query.call_args[1]['IndexName'] == 'ActiveModelsIndex'
 
 
 @patch('user_model_queue_loader.user_models_table')
 def test_get_all_active_models_pagination(mock_table):
-    """Test pagination when getting models"""
-    mock_table.scan.side_effect = [
-        {
-            'Items': [{'model_id': 'model1'}],
-            'LastEvaluatedKey': {'pk': 'key1'}
-        },
-        {
-            'Items': [{'model_id': 'model2'}]
-        }
-    ]
-    
+    """Test pagination within a shard"""
+    pages = {
+        'ACTIVE_MODEL#0': [
+            {'Items': [{'model_id': 'model1'}], 'LastEvaluatedKey': {'PK': 'key1'}},
+            {'Items': [{'model_id': 'model2'}]},
+        ]
+    }
+
+    def query(**kwargs):
+        shard = kwargs['KeyConditionExpression'].get_expression()['values'][1]
+        return pages.get(shard, [{'Items': []}]).pop(0)
+
+    mock_table.query.side_effect = query
+
     models = get_all_active_models()
-    
-    assert len(models) == 2
-    assert mock_table.scan.call_count == 2
+
+    assert [m['model_id'] for m in models] == ['model1', 'model2']
+    assert mock_table.query.call_count == ACTIVE_MODEL_SHARDS + 1
 
 
 @patch('user_model_queue_loader.sqs')
@@ -53,6 +56,24 @@ def test_load_models_to_queue(mock_sqs):
     assert mock_sqs.send_message_batch.called
 
 
+@patch('user_model_queue_loader.sqs')
+def test_load_models_to_queue_sends_batches_concurrently(mock_sqs):
+    """Test every batch is sent and a failed batch doesn't stop the rest"""
+    models = [{'model_id': f'model{i}', 'user_id': 'user1'} for i in range(35)]
+
+    def send(QueueUrl, Entries):
+        if Entries[0]['MessageBody'].startswith('{"model_id": "model10"'):
+            raise Exception("Throttled")
+        return {'Successful': [{'Id': e['Id']} for e in Entries]}
+
+    mock_sqs.send_message_batch.side_effect = send
+
+    sent = load_models_to_queue(models)
+
+    assert mock_sqs.send_message_batch.call_count == 4
+    assert sent == 25
+
+
 @patch('user_model_queue_loader.get_all_active_models')
 @patch('user_model_queue_loader.load_models_to_queue')
 def test_lambda_handler_success(mock_load, mock_get):
@@ -11,5 +11,92 @@ def test_module_imports():
     assert get_data_source_accuracy is not None
 
 
+def test_calculate_new_weights_prefers_sweep():
+    """Sweep weights replace the accuracy heuristic, keeping unswept sources"""
+    from user_model_weight_adjuster import calculate_new_weights
+
+    model = Mock()
+    model.data_sources = {
+        "team_stats": {"weight": 0.4},
+        "recent_form": {"weight": 0.4},
+        "player_stats": {"weight": 0.2},
+    }
+    sweep = {"weights": {"team_stats": 0.99, "recent_form": 0.01}}
+    accuracies = {"team_stats": 0.5, "recent_form": 0.9, "player_stats": None}
+
+    weights = calculate_new_weights(model, accuracies, sweep)
+
+    assert weights["team_stats"] == pytest.approx(0.99 / 1.24)
+    assert weights["recent_form"] == pytest.approx(0.05 / 1.24)
+    assert weights["player_stats"] == pytest.approx(0.2 / 1.24)
+
+
+def test_calculate_new_weights_without_sweep():
+    """Falls back to accuracy-proportional weights"""
+    from user_model_weight_adjuster import calculate_new_weights
+
+    model = Mock()
+    model.data_sources = {}
+
+    weights = calculate_new_weights(model, {"team_stats": 0.6, "recent_form": 0.4})
+
+    assert weights == pytest.approx({"team_stats": 0.6, "recent_form": 0.4})
+
+
+@patch("user_model_weight_adjuster.sweep_model_weights")
+@patch("user_model_weight_adjuster.get_data_source_accuracy", return_value=None)
+@patch("user_model_weight_adjuster.UserModel")
+def test_adjust_applies_sweep_min_confidence(mock_user_model, mock_accuracy, mock_sweep):
+    """The swept weights are saved with the min_confidence they were validated at"""
+    from user_model_weight_adjuster import adjust_model_weights
+
+    model = Mock(auto_adjust_weights=True, min_confidence=0.6)
+    model.data_sources = {
+        "team_stats": {"enabled": True, "weight": 0.5},
+        "recent_form": {"enabled": True, "weight": 0.5},
+    }
+    mock_user_model.get.return_value = model
+    mock_sweep.return_value = {
+        "weights": {"team_stats": 0.8, "recent_form": 0.2},
+        "min_confidence": 0.7,
+        "roi": 0.2, "volume": 40,
+        "holdout": {"roi": 0.1, "volume": 15},
+    }
+
+    adjust_model_weights("u1", "m1")
+
+    assert model.min_confidence == 0.7
+    assert model.data_sources["team_stats"]["weight"] == pytest.approx(0.8)
+    model.save.assert_called_once()
+
+
+@patch("backtest_engine.BacktestEngine")
+@patch("user_model_weight_adjuster.adjust_model_weights")
+@patch("user_model_weight_adjuster.query_active_models")
+def test_handler_adjusts_indexed_models(mock_query, mock_adjust, mock_engine):
+    """Handler reads auto-adjust models from the index and adjusts each one with one engine"""
+    from user_model_weight_adjuster import handler
+
+    mock_query.return_value = [
+        {"model_id": "m1", "user_id": "u1"},
+        {"model_id": "m2", "user_id": "u2"},
+        {"model_id": "m3", "user_id": "u3"},
+    ]
+
+    def adjust(user_id, model_id, engine):
+        if model_id == "m2":
+            raise Exception("boom")
+
+    mock_adjust.side_effect = adjust
+
+    result = handler({}, None)
+
+    mock_query.assert_called_once_with(auto_adjust_only=True)
+    assert mock_adjust.call_count == 3
+    mock_engine.assert_called_once_with()
+    assert {c.args[2] for c in mock_adjust.call_args_list} == {mock_engine.return_value}
+    assert result == {"statusCode": 200, "adjusted_models": 2}
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
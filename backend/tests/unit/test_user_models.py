@@ -56,6 +56,22 @@ class TestUserModel(unittest.TestCase):
         self.assertEqual(restored.model_id, model.model_id)
         self.assertEqual(restored.min_confidence, model.min_confidence)
 
+    def test_active_model_index_is_sparse(self):
+        """Only active models carry ActiveModelsIndex keys"""
+        model = UserModel(**self.valid_config, model_id="model_abc", auto_adjust_weights=True)
+
+        item = model.to_dynamodb()
+        self.assertRegex(item["active_model_pk"], r"^ACTIVE_MODEL#[0-7]$")
+        self.assertEqual(item["active_model_sk"], "AUTO#model_abc")
+
+        model.auto_adjust_weights = False
+        self.assertEqual(model.to_dynamodb()["active_model_sk"], "MANUAL#model_abc")
+        self.assertEqual(model.to_dynamodb()["active_model_pk"], item["active_model_pk"])
+
+        model.status = "paused"
+        self.assertNotIn("active_model_pk", model.to_dynamodb())
+        self.assertNotIn("active_model_sk", model.to_dynamodb())
+
 
 class TestModelPrediction(unittest.TestCase):
     def setUp(self):
@@ -0,0 +1,103 @@
+"""Unit tests for VarianceTracker and the Monte Carlo engine"""
+import unittest
+from decimal import Decimal
+from unittest.mock import Mock, patch
+
+from benny import monte_carlo
+from benny.variance_tracker import VarianceTracker
+
+
+def _bets(count, win_every=2):
+    bets = []
+    for i in range(count):
+        won = i % win_every == 0
+        bets.append({
+            "status": "won" if won else "lost",
+            "bet_amount": Decimal("5"),
+            "payout": Decimal("9.5") if won else Decimal("0"),
+            "profit": Decimal("4.5") if won else Decimal("-5"),
+        })
+    return bets
+
+
+class TestVarianceTracker(unittest.TestCase):
+
+    def setUp(self):
+        self.mock_table = Mock()
+        self.tracker = VarianceTracker(self.mock_table)
+
+    def test_requires_twenty_settled_bets(self):
+        self.mock_table.query.return_value = {"Items": _bets(10)}
+
+        result = self.tracker.run_simulation()
+
+        self.assertEqual(result, {"error": "Need 20+ settled bets", "bet_count": 10})
+
+    def test_run_simulation_reports_path_statistics(self):
+        self.mock_table.query.return_value = {"Items": _bets(40)}
+
+        result = self.tracker.run_simulation(simulations=500, seed=7)
+
+        self.assertEqual(result["simulations"], 500)
+        self.assertEqual(result["win_rate"], 0.5)
+        self.assertEqual(result["avg_payout_multiplier"], 1.9)
+        self.assertLessEqual(result["simulated_percentiles"]["p5"], result["simulated_percentiles"]["p95"])
+        self.assertGreater(result["max_drawdown_percentiles"]["p50"], 0)
+        self.assertTrue(0 <= result["risk_of_ruin"] <= 1)
+        self.assertLessEqual(result["longest_under_water_percentiles"]["p95"], 40)
+
+    @patch.object(monte_carlo, "HAS_NUMPY", False)
+    def test_python_engine_without_numpy(self):
+        self.mock_table.query.return_value = {"Items": _bets(20)}
+
+        result = self.tracker.run_simulation(seed=1)
+
+        self.assertEqual(result["engine"], "python")
+        self.assertEqual(result["simulations"], VarianceTracker.FALLBACK_SIMULATIONS)
+
+
+class TestSimulatePaths(unittest.TestCase):
+
+    def test_all_losses_ruin_a_small_bankroll(self):
+        paths = monte_carlo._simulate_python([10.0], [1.9], 0.0, 12, 3, 100.0, 1, 0)
+
+        self.assertEqual(paths["final_profit"], [-120.0] * 3)
+        self.assertEqual(paths["max_drawdown"], [120.0] * 3)
+        self.assertEqual(paths["ruined"], [True] * 3)
+        self.assertEqual(paths["longest_under_water"], [12] * 3)
+
+    def test_all_wins_never_go_under_water(self):
+        paths = monte_carlo._simulate_python([10.0], [2.0], 1.0, 5, 2, 100.0, 1, 0)
+
+        self.assertEqual(paths["final_profit"], [50.0, 50.0])
+        self.assertEqual(paths["bets_under_water"], [0, 0])
+        self.assertEqual(paths["max_drawdown"], [0.0, 0.0])
+
+    @unittest.skipUnless(monte_carlo.HAS_NUMPY, "numpy not installed")
+    def test_numpy_engine_matches_python_engine(self):
+        args = ([5.0, 10.0], [1.9, 2.5], 0.5, 30, 4000, 100.0, 3)
+        fast = monte_carlo._simulate_numpy(*args, 1000)
+        slow = monte_carlo._simulate_python(*args, 0)
+
+        for name in monte_carlo.PATH_STATS:
+            fast_mean = float(fast[name].mean())
+            slow_mean = sum(float(v) for v in slow[name]) / len(slow[name])
+            self.assertAlmostEqual(fast_mean, slow_mean, delta=max(1.0, abs(slow_mean) * 0.1))
+
+    def test_shares(self):
+        self.assertEqual(monte_carlo.share_at_most([1.0, 2.0, 3.0, 4.0], 2.0), 0.5)
+        self.assertEqual(monte_carlo.share_true([True, False, False, False]), 0.25)
+
+    @patch.object(monte_carlo, "HAS_NUMPY", False)
+    def test_shares_without_numpy(self):
+        self.assertEqual(monte_carlo.share_at_most([1.0, 2.0, 3.0, 4.0], 2.0), 0.5)
+        self.assertEqual(monte_carlo.share_true([True, False, False, False]), 0.25)
+
+    def test_percentiles_nearest_rank(self):
+        result = monte_carlo.percentiles(list(range(100)))
+
+        self.assertEqual(result, {"p5": 5.0, "p25": 25.0, "p50": 50.0, "p75": 75.0, "p95": 95.0})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,15 +2,68 @@
 Travel distance and fatigue calculator for teams
 """
 import os
+import threading
 import boto3
-from datetime import datetime, timedelta
-from typing import Dict, Optional, List
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional, List, Tuple
 from decimal import Decimal
 from math import radians, cos, sin, asin, sqrt
 
+
+def _parse_time(value: str) -> datetime:
+    dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+def _haversine_miles(loc1: Tuple[float, float], loc2: Tuple[float, float]) -> float:
+    lat1, lon1, lat2, lon2 = map(radians, [loc1[0], loc1[1], loc2[0], loc2[1]])
+    dlat = lat2 - lat1
+    dlon = lon2 - lon1
+    a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
+    c = 2 * asin(sqrt(a))
+    return round(3956 * c, 1)  # Earth radius in miles
+
+
+class ScheduleIndex:
+    """A sport's games over a date window, indexed by team (newest first)"""
+
+    def __init__(self, sport: str, start: datetime, end: datetime, items: List[Dict]):
+        self.sport = sport
+        self.start = start
+        self.end = end
+        self.by_team: Dict[str, List[Tuple[datetime, Dict]]] = {}
+
+        # Odds items repeat per bookmaker/market, keep one record per game
+        games = {}
+        for item in items:
+            game_key = item.get('pk') or (item.get('home_team'), item.get('away_team'), item.get('commence_time'))
+            if game_key not in games and item.get('commence_time'):
+                games[game_key] = item
+
+        for game in games.values():
+            played_at = _parse_time(game['commence_time'])
+            for team in (game.get('home_team'), game.get('away_team')):
+                if team:
+                    self.by_team.setdefault(team, []).append((played_at, game))
+        for team_games in self.by_team.values():
+            team_games.sort(key=lambda entry: entry[0], reverse=True)
+
+    def covers(self, start: datetime, end: datetime) -> bool:
+        return self.start <= start and end <= self.end
+
+    def recent_games(self, team: str, start: datetime, before: datetime, limit: int = 10) -> List[Dict]:
+        return [
+            game for played_at, game in self.by_team.get(team, [])
+            if start <= played_at < before
+        ][:limit]
+
+
 class TravelFatigueCalculator:
     def __init__(self):
         self.table = boto3.resource('dynamodb').Table(os.environ['DYNAMODB_TABLE'])
+        self._schedules: Dict[str, ScheduleIndex] = {}
+        self._schedule_lock = threading.Lock()
+        self._distance_matrix = None
         
         # Team home city coordinates (lat, lon)
         self.team_locations = {
@@ -170,24 +223,20 @@ class TravelFatigueCalculator:
     
     def calculate_distance(self, team1: str, team2: str) -> float:
         """Calculate distance between two teams in miles using Haversine formula"""
-        loc1 = self.team_locations.get(team1)
-        loc2 = self.team_locations.get(team2)
-        
-        if not loc1 or not loc2:
-            return 0.0
-        
-        lat1, lon1 = loc1
-        lat2, lon2 = loc2
-        
-        # Haversine formula
-        lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
-        dlat = lat2 - lat1
-        dlon = lon2 - lon1
-        a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
-        c = 2 * asin(sqrt(a))
-        miles = 3956 * c  # Earth radius in miles
-        
-        return round(miles, 1)
+        if self._distance_matrix is None:
+            self._distance_matrix = self._build_distance_matrix()
+        return self._distance_matrix.get((team1, team2), 0.0)
+
+    def _build_distance_matrix(self) -> Dict[Tuple[str, str], float]:
+        """Precompute distances between every pair of known teams"""
+        teams = list(self.team_locations.items())
+        matrix = {}
+        for i, (team1, loc1) in enumerate(teams):
+            for team2, loc2 in teams[i:]:
+                miles = _haversine_miles(loc1, loc2)
+                matrix[(team1, team2)] = miles
+                matrix[(team2, team1)] = miles
+        return matrix
     
     def calculate_fatigue_score(self, team: str, sport: str, game_date: str) -> Dict:
         """Calculate fatigue score based on recent travel and rest"""
@@ -269,28 +318,48 @@ class TravelFatigueCalculator:
             'impact': impact
         }
     
+    def load_schedule(self, sport: str, start_date: str, end_date: str) -> ScheduleIndex:
+        """Load every game for a sport between two dates into a team schedule index"""
+        start = _parse_time(start_date)
+        end = _parse_time(end_date)
+
+        items = []
+        query_kwargs = {
+            'IndexName': 'ActiveBetsIndexV2',
+            'KeyConditionExpression': 'active_bet_pk = :pk AND commence_time BETWEEN :start AND :end',
+            'ExpressionAttributeValues': {
+                ':pk': f'GAME#{sport}',
+                ':start': start.isoformat(),
+                ':end': end_date
+            },
+            'ProjectionExpression': 'pk, home_team, away_team, commence_time',
+        }
+        while True:
+            response = self.table.query(**query_kwargs)
+            items.extend(response.get('Items', []))
+            last_key = response.get('LastEvaluatedKey')
+            if not last_key:
+                break
+            query_kwargs['ExclusiveStartKey'] = last_key
+
+        index = ScheduleIndex(sport, start, end, items)
+        self._schedules[sport] = index
+        return index
+
     def _get_recent_games(self, team: str, sport: str, before_date: str, lookback_days: int = 14) -> List[Dict]:
-        """Get team's recent games from DynamoDB"""
+        """Get team's recent games from the sport's schedule index"""
         try:
-            cutoff = (datetime.fromisoformat(before_date.replace('Z', '+00:00')) - timedelta(days=lookback_days)).isoformat()
-            
-            response = self.table.query(
-                IndexName='ActiveBetsIndexV2',
-                KeyConditionExpression='active_bet_pk = :pk AND commence_time BETWEEN :start AND :end',
-                ExpressionAttributeValues={
-                    ':pk': f'GAME#{sport}',
-                    ':start': cutoff,
-                    ':end': before_date
-                },
-                ScanIndexForward=False
-            )
-            
-            team_games = []
-            for item in response.get('Items', []):
-                if item.get('home_team') == team or item.get('away_team') == team:
-                    team_games.append(item)
-            
-            return team_games[:10]
+            before = _parse_time(before_date)
+            cutoff = before - timedelta(days=lookback_days)
+
+            index = self._schedules.get(sport)
+            if index is None or not index.covers(cutoff, before):
+                with self._schedule_lock:
+                    index = self._schedules.get(sport)
+                    if index is None or not index.covers(cutoff, before):
+                        index = self.load_schedule(sport, cutoff.isoformat(), before_date)
+
+            return index.recent_games(team, cutoff, before)
             
         except Exception as e:
             print(f"Error getting recent games: {e}")
@@ -3,7 +3,9 @@ User Model Executor - Processes user models from SQS queue and generates predict
 """
 import json
 import os
-from typing import Dict, List
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
 
 import boto3
 
@@ -13,6 +15,35 @@ dynamodb = boto3.resource("dynamodb")
 BETS_TABLE = os.environ.get("BETS_TABLE", "carpool-bets-v2-dev")
 bets_table = dynamodb.Table(BETS_TABLE)
 
+ALL_BET_TYPES = ["h2h", "spreads", "totals", "props"]
+PLAYER_SOURCES = ("player_stats", "player_injury")
+FEATURE_WORKERS = 8  # Concurrent data-source evaluations when prefetching features
+
+
+def _before(condition, game_data: Dict, sort_key: str = "sk"):
+    """
+    Limit a key condition to records before game_data["as_of"], if set.
+
+    Backtests set as_of to the game's commence_time so evaluators only see data
+    that existed when the game started.
+    """
+    from boto3.dynamodb.conditions import Key
+
+    as_of = game_data.get("as_of")
+    return condition & Key(sort_key).lt(as_of) if as_of else condition
+
+
+def _record_error(game_data: Dict, error: Exception):
+    """
+    Note a failure an evaluator is about to hide behind its neutral 0.5.
+
+    Only callers that pass an `errors` list (backtest snapshots) see these, so
+    a failed read isn't mistaken for "no data".
+    """
+    errors = game_data.get("errors")
+    if errors is not None:
+        errors.append(str(error))
+
 
 def evaluate_team_stats(game_data: Dict) -> float:
     """
@@ -31,12 +62,12 @@ def evaluate_team_stats(game_data: Dict) -> float:
     try:
         # Query recent stats for both teams (last game)
         home_response = bets_table.query(
-            KeyConditionExpression=Key("pk").eq(f"TEAM_STATS#{sport}#{home_team}"),
+            KeyConditionExpression=_before(Key("pk").eq(f"TEAM_STATS#{sport}#{home_team}"), game_data),
             ScanIndexForward=False,
             Limit=1,
         )
         away_response = bets_table.query(
-            KeyConditionExpression=Key("pk").eq(f"TEAM_STATS#{sport}#{away_team}"),
+            KeyConditionExpression=_before(Key("pk").eq(f"TEAM_STATS#{sport}#{away_team}"), game_data),
             ScanIndexForward=False,
             Limit=1,
         )
@@ -79,6 +110,7 @@ def evaluate_team_stats(game_data: Dict) -> float:
 
     except Exception as e:
         logger.error(f"evaluate_team_stats error for {home_team} vs {away_team}: {e}")
+        _record_error(game_data, e)
         return 0.5  # Fallback to neutral
 
 
@@ -106,6 +138,13 @@ def evaluate_odds_movement(game_data: Dict) -> float:
         )
 
         items = response.get("Items", [])
+        as_of = game_data.get("as_of")
+        if as_of:
+            # Snapshots written before as_of; the last one stands in for LATEST
+            items = [
+                item for item in items
+                if not item.get("sk", "").endswith("#LATEST") and item.get("updated_at", "") < as_of
+            ]
         if len(items) < 2:
             logger.info(f"evaluate_odds_movement: Not enough data for {game_id}")
             return 0.5  # Need at least 2 data points
@@ -125,6 +164,8 @@ def evaluate_odds_movement(game_data: Dict) -> float:
                 latest_odds = item
             elif not opening_odds:  # First historical record
                 opening_odds = item
+            elif as_of and item.get("bookmaker") == opening_odds.get("bookmaker"):
+                latest_odds = item
 
         if not opening_odds or not latest_odds:
             logger.info(f"evaluate_odds_movement: Missing opening or latest odds for {game_id}")
@@ -169,6 +210,7 @@ def evaluate_odds_movement(game_data: Dict) -> float:
 
     except Exception as e:
         logger.error(f"evaluate_odds_movement error for {game_id}: {e}")
+        _record_error(game_data, e)
         return 0.5
 
 
@@ -194,13 +236,13 @@ def evaluate_recent_form(game_data: Dict) -> float:
     try:
         # Query recent outcomes for both teams using TEAM_OUTCOME records
         home_outcomes = bets_table.query(
-            KeyConditionExpression=Key("pk").eq(f"TEAM_OUTCOME#{sport}#{home_team}"),
+            KeyConditionExpression=_before(Key("pk").eq(f"TEAM_OUTCOME#{sport}#{home_team}"), game_data),
             ScanIndexForward=False,  # Most recent first
             Limit=5,
         )
 
         away_outcomes = bets_table.query(
-            KeyConditionExpression=Key("pk").eq(f"TEAM_OUTCOME#{sport}#{away_team}"),
+            KeyConditionExpression=_before(Key("pk").eq(f"TEAM_OUTCOME#{sport}#{away_team}"), game_data),
             ScanIndexForward=False,  # Most recent first
             Limit=5,
         )
@@ -240,6 +282,7 @@ def evaluate_recent_form(game_data: Dict) -> float:
 
     except Exception as e:
         logger.error(f"evaluate_recent_form error for {home_team} vs {away_team}: {e}")
+        _record_error(game_data, e)
         return 0.5
 
 
@@ -270,13 +313,13 @@ def evaluate_rest_schedule(game_data: Dict) -> float:
 
         # Query last game for both teams
         home_outcomes = bets_table.query(
-            KeyConditionExpression=Key("pk").eq(f"TEAM_OUTCOME#{sport}#{home_team}"),
+            KeyConditionExpression=_before(Key("pk").eq(f"TEAM_OUTCOME#{sport}#{home_team}"), game_data),
             ScanIndexForward=False,  # Most recent first
             Limit=1,
         )
 
         away_outcomes = bets_table.query(
-            KeyConditionExpression=Key("pk").eq(f"TEAM_OUTCOME#{sport}#{away_team}"),
+            KeyConditionExpression=_before(Key("pk").eq(f"TEAM_OUTCOME#{sport}#{away_team}"), game_data),
             ScanIndexForward=False,  # Most recent first
             Limit=1,
         )
@@ -309,6 +352,7 @@ def evaluate_rest_schedule(game_data: Dict) -> float:
 
     except Exception as e:
         logger.error(f"evaluate_rest_schedule error for {home_team} vs {away_team}: {e}")
+        _record_error(game_data, e)
         return 0.5
 
 
@@ -343,7 +387,7 @@ def evaluate_head_to_head(game_data: Dict) -> float:
         # Query historical matchups using H2HIndex
         response = bets_table.query(
             IndexName="H2HIndex",
-            KeyConditionExpression=Key("h2h_pk").eq(h2h_pk),
+            KeyConditionExpression=_before(Key("h2h_pk").eq(h2h_pk), game_data, "h2h_sk"),
             ScanIndexForward=False,  # Most recent first
             Limit=10,
         )
@@ -367,6 +411,7 @@ def evaluate_head_to_head(game_data: Dict) -> float:
 
     except Exception as e:
         logger.error(f"evaluate_head_to_head error for {home_team} vs {away_team}: {e}")
+        _record_error(game_data, e)
         return 0.5
 
 
@@ -453,7 +498,7 @@ def evaluate_custom_data(game_data: Dict) -> float:
     Returns normalized score 0-1 based on custom dataset values
     """
     try:
-        from custom_data import CustomDataset
+        from custom_data import get_compiled_dataset
 
         user_id = game_data.get("user_id")
         dataset_id = game_data.get("dataset_id")
@@ -461,43 +506,28 @@ def evaluate_custom_data(game_data: Dict) -> float:
         if not user_id or not dataset_id:
             return 0.5
 
-        # Load dataset
-        dataset = CustomDataset.get(user_id, dataset_id)
-        if not dataset:
-            return 0.5
-
-        # Get dataset from S3
-        data = dataset.get_data()
-        if not data:
+        # Compiled (name-indexed, columnar) dataset, cached across bets and invocations
+        dataset = get_compiled_dataset(user_id, dataset_id)
+        if not dataset or not len(dataset):
             return 0.5
 
         # Handle based on data type
         if dataset.data_type == "player":
-            return _evaluate_player_data(data, game_data)
+            return _evaluate_player_data(dataset, game_data)
         else:  # team
-            return _evaluate_team_data(data, game_data)
+            return _evaluate_team_data(dataset, game_data)
 
     except Exception as e:
         print(f"Error evaluating custom data: {e}")
         return 0.5
 
 
-def _evaluate_team_data(data: List[Dict], game_data: Dict) -> float:
+def _evaluate_team_data(data, game_data: Dict) -> float:
     """Evaluate team-based custom data"""
-    home_team = game_data.get("home_team", "").lower()
-    away_team = game_data.get("away_team", "").lower()
-
-    home_row = None
-    away_row = None
-
-    for row in data:
-        team_name = row.get("team", "").lower()
-        if home_team in team_name or team_name in home_team:
-            home_row = row
-        if away_team in team_name or team_name in away_team:
-            away_row = row
+    home_row = data.find(game_data.get("home_team", ""))
+    away_row = data.find(game_data.get("away_team", ""))
 
-    if not home_row or not away_row:
+    if home_row is None or away_row is None:
         return 0.5
 
     # Compare all numeric columns
@@ -505,18 +535,15 @@ def _evaluate_team_data(data: List[Dict], game_data: Dict) -> float:
     away_score = 0
     count = 0
 
-    for key, value in home_row.items():
-        if key == "team":
-            continue
-        try:
-            home_val = float(value)
-            away_val = float(away_row.get(key, 0))
-            if home_val + away_val > 0:
-                home_score += home_val / (home_val + away_val)
-                away_score += away_val / (home_val + away_val)
-                count += 1
-        except (ValueError, TypeError):
+    for values in data.columns.values():
+        home_val = values[home_row]
+        away_val = values[away_row]
+        if home_val is None or away_val is None:
             continue
+        if home_val + away_val > 0:
+            home_score += home_val / (home_val + away_val)
+            away_score += away_val / (home_val + away_val)
+            count += 1
 
     if count == 0:
         return 0.5
@@ -526,34 +553,23 @@ def _evaluate_team_data(data: List[Dict], game_data: Dict) -> float:
     return home_score / total if total > 0 else 0.5
 
 
-def _evaluate_player_data(data: List[Dict], game_data: Dict) -> float:
+def _evaluate_player_data(data, game_data: Dict) -> float:
     """Evaluate player-based custom data for props"""
-    player_name = game_data.get("player_name", "").lower()
+    player_name = game_data.get("player_name", "")
     prop_line = game_data.get("prop_line")
 
     if not player_name or prop_line is None:
         return 0.5
 
     # Find player in dataset
-    player_row = None
-    for row in data:
-        row_player = row.get("player", "").lower()
-        if player_name in row_player or row_player in player_name:
-            player_row = row
-            break
-
-    if not player_row:
+    player_row = data.find(player_name)
+    if player_row is None:
         return 0.5
 
     # Average all numeric values and compare to prop line
-    numeric_values = []
-    for key, value in player_row.items():
-        if key == "player":
-            continue
-        try:
-            numeric_values.append(float(value))
-        except (ValueError, TypeError):
-            continue
+    numeric_values = [
+        values[player_row] for values in data.columns.values() if values[player_row] is not None
+    ]
 
     if not numeric_values:
         return 0.5
@@ -576,10 +592,15 @@ def _evaluate_player_data(data: List[Dict], game_data: Dict) -> float:
 DATA_SOURCE_EVALUATORS["custom_data"] = evaluate_custom_data
 
 
-def calculate_prediction(model: UserModel, game_data: Dict) -> Dict:
+def calculate_prediction(
+    model: UserModel, game_data: Dict, features: Optional["FeatureStore"] = None
+) -> Dict:
     """
     Calculate prediction using model configuration
     Returns: {prediction, confidence, reasoning} or None if below threshold
+
+    With a FeatureStore, data-source scores come from (and fill) its cache, so
+    only the weighting is done per model.
     """
     total_score = 0
     total_weight = 0
@@ -595,7 +616,7 @@ def calculate_prediction(model: UserModel, game_data: Dict) -> Dict:
             continue
 
         # Get normalized score (0-1) from data source
-        score = evaluator(game_data)
+        score = features.score(source_name, game_data) if features else evaluator(game_data)
         weight = float(config.get("weight", 0))
 
         source_scores[source_name] = score
@@ -618,7 +639,10 @@ def calculate_prediction(model: UserModel, game_data: Dict) -> Dict:
         }
 
         # Evaluate using custom data evaluator
-        score = evaluate_custom_data(game_data_with_dataset)
+        if features:
+            score = features.score("custom_data", game_data_with_dataset)
+        else:
+            score = evaluate_custom_data(game_data_with_dataset)
 
         source_scores[f"custom_{dataset_id[:8]}"] = score
         total_score += score * weight
@@ -729,10 +753,80 @@ def get_upcoming_bets(sport: str, bet_types: List[str]) -> List[Dict]:
     return bets
 
 
-def process_model(model_id: str, user_id: str):
+def _feature_key(source: str, data: Dict) -> tuple:
+    """The fields a data source's score depends on"""
+    if source in PLAYER_SOURCES:
+        return (source, data.get("bet_type"), data.get("sport"), data.get("player_name"))
+    if source == "custom_data":
+        return (
+            source, data.get("user_id"), data.get("dataset_id"), data.get("home_team"),
+            data.get("away_team"), data.get("player_name"), data.get("prop_line"),
+        )
+    # Game-level sources only look at the matchup, whatever the market
+    return (
+        source, data.get("sport"), data.get("game_id"), data.get("home_team"),
+        data.get("away_team"), data.get("commence_time"),
+    )
+
+
+class FeatureStore:
+    """
+    Data-source scores and upcoming bets shared by every model in one invocation.
+
+    Each (game, data source) score is evaluated once, however many users'
+    models enable that source, and upcoming bets are read once per sport.
+    """
+
+    def __init__(self):
+        self._scores: Dict[tuple, float] = {}
+        self._bets: Dict[str, List[Dict]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def upcoming_bets(self, sport: str, bet_types: List[str]) -> List[Dict]:
+        with self._lock:
+            bets = self._bets.get(sport)
+        if bets is None:
+            bets = get_upcoming_bets(sport, ALL_BET_TYPES)
+            with self._lock:
+                self._bets[sport] = bets
+        return [bet for bet in bets if bet.get("bet_type") in bet_types]
+
+    def score(self, source: str, data: Dict) -> float:
+        key = _feature_key(source, data)
+        with self._lock:
+            if key in self._scores:
+                self.hits += 1
+                return self._scores[key]
+            self.misses += 1
+        value = DATA_SOURCE_EVALUATORS[source](data)
+        with self._lock:
+            self._scores[key] = value
+        return value
+
+    def prefetch(self, bets: Iterable[Dict], sources: Iterable[str]):
+        """Evaluate uncached scores for `bets` concurrently"""
+        pending = {}
+        sources = [s for s in sources if s in DATA_SOURCE_EVALUATORS]
+        with self._lock:
+            for bet in bets:
+                for source in sources:
+                    key = _feature_key(source, bet)
+                    if key not in self._scores:
+                        pending.setdefault(key, (source, bet))
+        if not pending:
+            return
+        with ThreadPoolExecutor(max_workers=FEATURE_WORKERS) as executor:
+            list(executor.map(lambda job: self.score(*job), pending.values()))
+
+
+def process_model(model_id: str, user_id: str, features: Optional[FeatureStore] = None):
     """
     Process a single user model - generate predictions for upcoming bets
     """
+    features = features or FeatureStore()
+
     # Load model configuration
     model = UserModel.get(user_id, model_id)
     if not model or model.status != "active":
@@ -740,13 +834,16 @@ def process_model(model_id: str, user_id: str):
         return
 
     # Get upcoming bets for this sport and bet types
-    bets = get_upcoming_bets(model.sport, model.bet_types)
+    bets = features.upcoming_bets(model.sport, model.bet_types)
+    features.prefetch(
+        bets, [name for name, config in model.data_sources.items() if config.get("enabled")]
+    )
 
     predictions_created = 0
     for bet in bets:
         # Calculate prediction using game-level evaluators
         # (Props use game context - team stats, rest, etc. affect player performance)
-        result = calculate_prediction(model, bet)
+        result = calculate_prediction(model, bet, features)
         if not result:
             print(
                 f"Skipped {bet['bet_type']} {bet.get('player_name', bet['game_id'])}: low confidence"
@@ -782,6 +879,7 @@ def handler(event, context):
     print(f"Processing {len(event['Records'])} messages")
 
     failed_items = []
+    features = FeatureStore()  # Shared by every model in this batch
 
     for record in event["Records"]:
         try:
@@ -793,13 +891,15 @@ def handler(event, context):
             print(f"Processing model: {model_id}")
 
             # Process the model
-            process_model(model_id, user_id)
+            process_model(model_id, user_id, features)
 
         except Exception as e:
             print(f"Error processing message: {str(e)}")
             # Add to failed items for partial batch failure
             failed_items.append({"itemIdentifier": record["messageId"]})
 
+    print(f"Feature store: {features.misses} scores evaluated, {features.hits} reused")
+
     # Return partial batch failure response
     if failed_items:
         return {"batchItemFailures": failed_items}
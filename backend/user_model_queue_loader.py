@@ -3,9 +3,12 @@ User Model Queue Loader - Loads active user models into SQS queue for execution
 """
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 import boto3
 
+from user_models import query_active_models
+
 dynamodb = boto3.resource("dynamodb")
 sqs = boto3.client("sqs")
 
@@ -13,41 +16,48 @@ USER_MODELS_TABLE = os.environ.get(
     "USER_MODELS_TABLE", "Dev-UserModels-UserModelsTable"
 )
 MODEL_EXECUTION_QUEUE_URL = os.environ.get("MODEL_EXECUTION_QUEUE_URL")
+SEND_WORKERS = 8  # Concurrent send_message_batch calls
 
 user_models_table = dynamodb.Table(USER_MODELS_TABLE)
 
 
 def get_all_active_models():
     """
-    Scan for all active user models
+    Read all active user models from the sparse ActiveModelsIndex
     """
-    models = []
-
-    # Scan table for active models
-    response = user_models_table.scan(
-        FilterExpression="#status = :active",
-        ExpressionAttributeNames={"#status": "status"},
-        ExpressionAttributeValues={":active": "active"},
-    )
-
-    models.extend(response.get("Items", []))
-
-    # Handle pagination
-    while "LastEvaluatedKey" in response:
-        response = user_models_table.scan(
-            FilterExpression="#status = :active",
-            ExpressionAttributeNames={"#status": "status"},
-            ExpressionAttributeValues={":active": "active"},
-            ExclusiveStartKey=response["LastEvaluatedKey"],
+    return query_active_models(user_models_table)
+
+
+def _send_batch(batch):
+    """Send one SQS batch; returns the number of messages accepted"""
+    entries = [
+        {
+            "Id": str(idx),
+            "MessageBody": json.dumps(
+                {"model_id": model["model_id"], "user_id": model["user_id"]}
+            ),
+        }
+        for idx, model in enumerate(batch)
+    ]
+
+    try:
+        response = sqs.send_message_batch(
+            QueueUrl=MODEL_EXECUTION_QUEUE_URL, Entries=entries
         )
-        models.extend(response.get("Items", []))
+    except Exception as e:
+        print(f"Failed to send batch of {len(entries)} messages: {e}")
+        return 0
+
+    failed = len(response.get("Failed", []))
+    if failed > 0:
+        print(f"Failed to send {failed} messages")
 
-    return models
+    return len(response.get("Successful", []))
 
 
 def load_models_to_queue(models):
     """
-    Load models into SQS queue in batches
+    Load models into SQS queue in batches, sending batches concurrently
     """
     if not models:
         print("No active models to process")
@@ -55,36 +65,10 @@ def load_models_to_queue(models):
 
     # Send messages in batches of 10 (SQS limit)
     batch_size = 10
-    total_sent = 0
-
-    for i in range(0, len(models), batch_size):
-        batch = models[i : i + batch_size]
-
-        entries = []
-        for idx, model in enumerate(batch):
-            entries.append(
-                {
-                    "Id": str(idx),
-                    "MessageBody": json.dumps(
-                        {"model_id": model["model_id"], "user_id": model["user_id"]}
-                    ),
-                }
-            )
-
-        # Send batch to SQS
-        response = sqs.send_message_batch(
-            QueueUrl=MODEL_EXECUTION_QUEUE_URL, Entries=entries
-        )
-
-        successful = len(response.get("Successful", []))
-        failed = len(response.get("Failed", []))
-
-        total_sent += successful
-
-        if failed > 0:
-            print(f"Failed to send {failed} messages")
+    batches = [models[i : i + batch_size] for i in range(0, len(models), batch_size)]
 
-    return total_sent
+    with ThreadPoolExecutor(max_workers=SEND_WORKERS) as executor:
+        return sum(executor.map(_send_batch, batches))
 
 
 def handler(event, context):
@@ -3,17 +3,21 @@ User Model Weight Adjuster - Adjusts data source weights based on performance
 Runs weekly to optimize user models that have auto_adjust_weights enabled
 """
 import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from datetime import datetime, timedelta
-from typing import Dict
+from typing import Any, Dict, Optional
 
 import boto3
 from boto3.dynamodb.conditions import Key
 
-from user_models import UserModel
+from user_models import UserModel, query_active_models
 
 dynamodb = boto3.resource("dynamodb")
 BETS_TABLE = os.environ.get("BETS_TABLE", "carpool-bets-v2-dev")
 bets_table = dynamodb.Table(BETS_TABLE)
+ADJUST_WORKERS = 4  # Each adjustment runs a backtest sweep
+SWEEP_DAYS = 90  # The sweep validates on the most recent 30% of this window
 
 
 def get_data_source_accuracy(
@@ -55,16 +59,63 @@ def get_data_source_accuracy(
     return correct / len(source_predictions)
 
 
+def sweep_model_weights(
+    user_id: str, model_id: str, model: UserModel, days: int = SWEEP_DAYS, engine=None
+) -> Optional[Dict[str, Any]]:
+    """
+    Backtest weight configurations for the model over the last N days
+    Returns the sweep's recommended configuration (weights and min_confidence),
+    or None when no configuration beat the current one on the held-out games.
+    Pass a shared BacktestEngine so models in one sport reuse its snapshots
+    """
+    if engine is None:
+        from backtest_engine import BacktestEngine
+
+        engine = BacktestEngine()
+
+    end = datetime.utcnow()
+    start = end - timedelta(days=days)
+    try:
+        result = engine.run_weight_sweep(
+            user_id,
+            model_id,
+            model.to_dynamodb(),
+            start.isoformat(),
+            end.isoformat(),
+            store=False,
+        )
+    except Exception as e:
+        print(f"Model {model_id}: weight sweep failed: {e}")
+        return None
+    return result.get("recommended")
+
+
 def calculate_new_weights(
-    model: UserModel, source_accuracies: Dict[str, float]
+    model: UserModel,
+    source_accuracies: Dict[str, float],
+    sweep: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, float]:
     """
     Calculate new weights based on source accuracies
-    Uses performance-based scaling with minimum weight floor
+    Uses the backtest sweep's recommended weights when available (the caller
+    applies its min_confidence too), otherwise performance-based scaling, with
+    a minimum weight floor either way
     """
     new_weights = {}
     min_weight = 0.05  # Minimum 5% weight to keep sources active
 
+    if sweep and sweep.get("weights"):
+        swept = sweep["weights"]
+        for source_name in source_accuracies:
+            if source_name in swept:
+                new_weights[source_name] = max(min_weight, swept[source_name])
+            else:
+                # Not backtestable (no evaluator); keep existing weight
+                current_weight = model.data_sources.get(source_name, {}).get("weight", 0)
+                new_weights[source_name] = float(current_weight)
+        total_weight = sum(new_weights.values())
+        return {k: v / total_weight for k, v in new_weights.items()} if total_weight > 0 else {}
+
     # Calculate total accuracy-weighted score
     total_score = sum(acc for acc in source_accuracies.values() if acc is not None)
 
@@ -91,7 +142,7 @@ def calculate_new_weights(
     return new_weights
 
 
-def adjust_model_weights(user_id: str, model_id: str):
+def adjust_model_weights(user_id: str, model_id: str, engine=None):
     """
     Adjust weights for a single user model based on recent performance
     """
@@ -118,12 +169,28 @@ def adjust_model_weights(user_id: str, model_id: str):
             f"  {source_name}: {accuracy:.2%}" if accuracy else f"  {source_name}: N/A"
         )
 
-    # Calculate new weights
-    new_weights = calculate_new_weights(model, source_accuracies)
+    # Calculate new weights, preferring the best backtested configuration
+    sweep = sweep_model_weights(user_id, model_id, model, engine=engine)
+    if sweep:
+        print(
+            f"  Sweep: {sweep['roi']:+.1%} ROI over {sweep['volume']} bets, "
+            f"{sweep['holdout']['roi']:+.1%} over {sweep['holdout']['volume']} held-out bets "
+            f"at min_confidence {sweep['min_confidence']:.0%}"
+        )
+    new_weights = calculate_new_weights(model, source_accuracies, sweep)
     if not new_weights:
         print(f"Model {model_id}: insufficient data for adjustment")
         return
 
+    # The swept weights were chosen and validated at this threshold
+    if sweep:
+        if sweep["min_confidence"] != model.min_confidence:
+            print(
+                f"Model {model_id}: min_confidence {model.min_confidence:.0%} → "
+                f"{sweep['min_confidence']:.0%}"
+            )
+        model.min_confidence = sweep["min_confidence"]
+
     # Update model weights
     changes = []
     for source_name, new_weight in new_weights.items():
@@ -141,6 +208,21 @@ def adjust_model_weights(user_id: str, model_id: str):
         print(f"Model {model_id}: No significant weight changes")
 
 
+def _adjust(model_keys: Dict[str, Any], engine=None) -> bool:
+    """Adjust one indexed model; returns False when it failed"""
+    user_id = model_keys.get("user_id")
+    model_id = model_keys.get("model_id")
+    if not user_id or not model_id:
+        return False
+    try:
+        print(f"\nAdjusting model: {model_id} (user: {user_id})")
+        adjust_model_weights(user_id, model_id, engine)
+        return True
+    except Exception as e:
+        print(f"Error adjusting model {model_id}: {e}")
+        return False
+
+
 def handler(event, context):
     """
     Lambda handler - adjusts weights for all user models with auto-adjustment enabled
@@ -148,37 +230,16 @@ def handler(event, context):
     """
     print("Starting user model weight adjustment")
 
-    # Scan for all user models with auto_adjust_weights=true
-    response = bets_table.scan(
-        FilterExpression="begins_with(pk, :prefix) AND auto_adjust_weights = :true",
-        ExpressionAttributeValues={":prefix": "USER_MODEL#", ":true": True},
-    )
-
-    models = response.get("Items", [])
+    # Active auto-adjust models from the sparse ActiveModelsIndex
+    models = query_active_models(auto_adjust_only=True)
     print(f"Found {len(models)} models with auto-adjustment enabled")
 
-    adjusted_count = 0
-    for item in models:
-        try:
-            # Extract user_id and model_id from pk/sk
-            pk = item.get("pk", "")
-            sk = item.get("sk", "")
+    # One engine for every model, so each sport's feature snapshots are built once
+    from backtest_engine import BacktestEngine
 
-            # pk format: USER_MODEL#{user_id}
-            # sk format: MODEL#{model_id}
-            user_id = pk.split("#")[1] if "#" in pk else ""
-            model_id = sk.split("#")[1] if "#" in sk else ""
-
-            if not user_id or not model_id:
-                continue
-
-            print(f"\nAdjusting model: {model_id} (user: {user_id})")
-            adjust_model_weights(user_id, model_id)
-            adjusted_count += 1
-
-        except Exception as e:
-            print(f"Error adjusting model {item.get('pk')}: {e}")
-            continue
+    engine = BacktestEngine()
+    with ThreadPoolExecutor(max_workers=ADJUST_WORKERS) as executor:
+        adjusted_count = sum(executor.map(partial(_adjust, engine=engine), models))
 
     print(f"\nCompleted: Adjusted {adjusted_count} models")
 
@@ -3,6 +3,8 @@ User Models - Data models and DynamoDB operations for user-defined betting model
 """
 import os
 import uuid
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from decimal import Decimal
 from typing import Any, Dict, List, Optional
@@ -10,6 +12,8 @@ from typing import Any, Dict, List, Optional
 import boto3
 from boto3.dynamodb.conditions import Key
 
+from dao import iter_query
+
 dynamodb = boto3.resource("dynamodb", region_name="us-east-1")
 USER_MODELS_TABLE = os.environ.get("USER_MODELS_TABLE", "Dev-UserModels-UserModels")
 MODEL_PREDICTIONS_TABLE = os.environ.get(
@@ -19,6 +23,15 @@ MODEL_PREDICTIONS_TABLE = os.environ.get(
 user_models_table = dynamodb.Table(USER_MODELS_TABLE)
 model_predictions_table = dynamodb.Table(MODEL_PREDICTIONS_TABLE)
 
+# Sparse index of active models: only active models carry active_model_pk, so
+# jobs that run over them read O(active models) instead of scanning the table.
+# Models are spread over shards that are read in parallel; changing the shard
+# count needs scripts/backfill_active_model_index.py.
+ACTIVE_MODELS_INDEX = "ActiveModelsIndex"
+ACTIVE_MODEL_SHARDS = 8
+AUTO_ADJUST_PREFIX = "AUTO#"  # active_model_sk prefix for auto_adjust_weights models
+MANUAL_PREFIX = "MANUAL#"
+
 
 def convert_floats_to_decimal(obj: Any) -> Any:
     """Recursively convert floats to Decimal for DynamoDB"""
@@ -31,6 +44,43 @@ def convert_floats_to_decimal(obj: Any) -> Any:
     return obj
 
 
+def active_model_index(model_id: str, status: str, auto_adjust_weights: bool) -> Dict[str, str]:
+    """ActiveModelsIndex keys for a model, or {} when it isn't active"""
+    if status != "active":
+        return {}
+    shard = zlib.crc32(model_id.encode("utf-8")) % ACTIVE_MODEL_SHARDS
+    prefix = AUTO_ADJUST_PREFIX if auto_adjust_weights else MANUAL_PREFIX
+    return {
+        "active_model_pk": f"ACTIVE_MODEL#{shard}",
+        "active_model_sk": f"{prefix}{model_id}",
+    }
+
+
+def query_active_models(
+    table=None, auto_adjust_only: bool = False, workers: int = ACTIVE_MODEL_SHARDS
+) -> List[Dict[str, Any]]:
+    """
+    Model keys (model_id, user_id) for every active model, read from
+    ActiveModelsIndex with one paginated query per shard in parallel
+    """
+    table = table or user_models_table
+
+    def read_shard(shard: int) -> List[Dict[str, Any]]:
+        condition = Key("active_model_pk").eq(f"ACTIVE_MODEL#{shard}")
+        if auto_adjust_only:
+            condition = condition & Key("active_model_sk").begins_with(AUTO_ADJUST_PREFIX)
+        return list(iter_query(
+            table,
+            attributes=["model_id", "user_id"],
+            IndexName=ACTIVE_MODELS_INDEX,
+            KeyConditionExpression=condition,
+        ))
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        shards = list(executor.map(read_shard, range(ACTIVE_MODEL_SHARDS)))
+    return [model for shard in shards for model in shard]
+
+
 class UserModel:
     """User-defined betting model"""
 
@@ -66,7 +116,7 @@ class UserModel:
 
     def to_dynamodb(self) -> Dict:
         """Convert to DynamoDB item"""
-        return {
+        item = {
             "PK": f"USER#{self.user_id}",
             "SK": f"MODEL#{self.model_id}",
             "GSI1PK": f"USER#{self.user_id}",
@@ -85,6 +135,8 @@ class UserModel:
             "created_at": self.created_at,
             "updated_at": self.updated_at,
         }
+        item.update(active_model_index(self.model_id, self.status, self.auto_adjust_weights))
+        return item
 
     @classmethod
     def from_dynamodb(cls, item: Dict) -> "UserModel":
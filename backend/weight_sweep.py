@@ -0,0 +1,142 @@
+"""Vectorized weight and min_confidence sweep for user-model backtests"""
+import bisect
+import random
+from typing import Dict, List, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy ships in the Lambda bundle
+    np = None
+
+HAS_NUMPY = np is not None
+MIN_CONFIDENCE_GRID = (0.5, 0.55, 0.6, 0.65, 0.7, 0.75, 0.8, 0.85, 0.9, 0.95)
+WIN_RETURN = 0.9091  # Profit per $1 staked on a win at -110, as in BacktestEngine metrics
+# user_model_executor.calculate_prediction's no-bet band
+PICK_HOME_ABOVE = 0.55
+PICK_AWAY_BELOW = 0.45
+RESULT_COLUMNS = ("config", "min_confidence", "volume", "correct", "accuracy", "roi")
+
+
+def random_weights(sources: int, count: int, seed: Optional[int] = None) -> List[List[float]]:
+    """`count` weight vectors drawn uniformly from the simplex, each summing to 1"""
+    if HAS_NUMPY:
+        return np.random.default_rng(seed).dirichlet(np.ones(sources), size=count).tolist()
+    rng = random.Random(seed)
+    vectors = []
+    for _ in range(count):
+        draws = [rng.expovariate(1.0) for _ in range(sources)]
+        total = sum(draws)
+        vectors.append([d / total for d in draws])
+    return vectors
+
+
+def sweep(
+    scores: Sequence[Sequence[float]],
+    home_won: Sequence[bool],
+    away_won: Sequence[bool],
+    weights: Sequence[Sequence[float]],
+    thresholds: Sequence[float] = MIN_CONFIDENCE_GRID,
+) -> Dict[str, list]:
+    """
+    Metrics for every (weight vector, min_confidence) pair.
+
+    `scores` is a games x sources matrix of 0-1 source scores (above 0.5
+    favours home) and `weights` a configs x sources matrix. The decision rule
+    is user_model_executor.calculate_prediction's: confidence is the weighted
+    average score, nothing is bet below min_confidence, and the pick is home
+    above PICK_HOME_ABOVE and away below PICK_AWAY_BELOW. A draw loses either
+    pick.
+
+    Returns one row per pair as columns (see RESULT_COLUMNS). Uses a single
+    NumPy matrix product when available, otherwise a pure-Python loop with
+    the same results.
+    """
+    engine = _sweep_numpy if HAS_NUMPY else _sweep_python
+    return engine(scores, home_won, away_won, weights, thresholds)
+
+
+def pareto_front(results: Dict[str, list]) -> List[int]:
+    """
+    Rows not dominated on accuracy, ROI and volume (all maximized).
+
+    Rows with identical metrics collapse to the first one. At flat -110
+    pricing ROI moves with accuracy, so in practice this is the
+    accuracy/volume trade-off.
+    """
+    unique: Dict[tuple, int] = {}
+    for row, point in enumerate(zip(results["accuracy"], results["roi"], results["volume"])):
+        unique.setdefault(tuple(float(v) for v in point), row)
+
+    # Any dominating point sorts before the points it dominates
+    front: List[tuple] = []
+    rows = []
+    for point in sorted(unique, key=lambda p: (p[2], p[0], p[1]), reverse=True):
+        if any(all(f >= p for f, p in zip(kept, point)) for kept in front):
+            continue
+        front.append(point)
+        rows.append(unique[point])
+    return rows
+
+
+def _sweep_numpy(scores, home_won, away_won, weights, thresholds):
+    scores = np.asarray(scores, dtype=np.float64)
+    weights = np.asarray(weights, dtype=np.float64)
+    home_won = np.asarray(home_won, dtype=bool)
+    away_won = np.asarray(away_won, dtype=bool)
+
+    # configs x games weighted-average confidence
+    confidence = (weights @ scores.T) / weights.sum(axis=1, keepdims=True)
+    pick_home = confidence > PICK_HOME_ABOVE
+    decisive = pick_home | (confidence < PICK_AWAY_BELOW)
+    correct = np.where(pick_home, home_won, away_won) & decisive
+
+    configs = np.arange(len(weights))
+    columns = {name: [] for name in RESULT_COLUMNS}
+    for threshold in thresholds:
+        bets = decisive & (confidence >= threshold)
+        volume = bets.sum(axis=1)
+        won = (bets & correct).sum(axis=1)
+        staked = np.maximum(volume, 1)
+
+        columns["config"].append(configs)
+        columns["min_confidence"].append(np.full(len(weights), float(threshold)))
+        columns["volume"].append(volume)
+        columns["correct"].append(won)
+        columns["accuracy"].append(np.where(volume > 0, won / staked, 0.0))
+        columns["roi"].append(np.where(volume > 0, (won * (1 + WIN_RETURN) - volume) / staked, 0.0))
+
+    return {name: np.concatenate(chunks).tolist() for name, chunks in columns.items()}
+
+
+def _sweep_python(scores, home_won, away_won, weights, thresholds):
+    per_config = []
+    for vector in weights:
+        total_weight = sum(vector)
+        bets = []  # (confidence, correct) for each game outside the no-bet band
+        for row, home, away in zip(scores, home_won, away_won):
+            confidence = sum(s * w for s, w in zip(row, vector)) / total_weight
+            if confidence > PICK_HOME_ABOVE:
+                bets.append((confidence, home))
+            elif confidence < PICK_AWAY_BELOW:
+                bets.append((confidence, away))
+        bets.sort()
+        confidences = [c for c, _ in bets]
+        # wins_from[i] = correct picks among bets[i:]
+        wins_from = [0] * (len(bets) + 1)
+        for i in range(len(bets) - 1, -1, -1):
+            wins_from[i] = wins_from[i + 1] + bool(bets[i][1])
+        per_config.append((confidences, wins_from))
+
+    columns = {name: [] for name in RESULT_COLUMNS}
+    for threshold in thresholds:
+        for config, (confidences, wins_from) in enumerate(per_config):
+            start = bisect.bisect_left(confidences, threshold)
+            volume = len(confidences) - start
+            won = wins_from[start]
+            columns["config"].append(config)
+            columns["min_confidence"].append(float(threshold))
+            columns["volume"].append(volume)
+            columns["correct"].append(won)
+            columns["accuracy"].append(won / volume if volume else 0.0)
+            columns["roi"].append((won * (1 + WIN_RETURN) - volume) / volume if volume else 0.0)
+    return columns
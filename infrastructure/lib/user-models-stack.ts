@@ -40,6 +40,15 @@ export class UserModelsStack extends cdk.Stack {
       projectionType: dynamodb.ProjectionType.ALL,
     });
 
+    // Sparse GSI of active models (sharded) for the queue loader and weight adjuster
+    this.userModelsTable.addGlobalSecondaryIndex({
+      indexName: 'ActiveModelsIndex',
+      partitionKey: { name: 'active_model_pk', type: dynamodb.AttributeType.STRING },
+      sortKey: { name: 'active_model_sk', type: dynamodb.AttributeType.STRING },
+      projectionType: dynamodb.ProjectionType.INCLUDE,
+      nonKeyAttributes: ['model_id', 'user_id'],
+    });
+
     // Model Predictions Table
     this.modelPredictionsTable = new dynamodb.Table(this, 'ModelPredictionsTable', {
       tableName: `${id}-ModelPredictions`,
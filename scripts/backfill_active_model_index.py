@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Backfill the sparse active-model index (ActiveModelsIndex on the UserModels table).
+
+Models saved before UserModel.to_dynamodb set active_model_pk are invisible to
+the queue loader and weight adjuster, which now read active models from the
+index instead of scanning. This sets the index keys on active models and
+removes stale keys from paused ones. Also rerun after changing
+ACTIVE_MODEL_SHARDS.
+"""
+
+import argparse
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+import boto3
+
+from dao import iter_scan
+from user_models import active_model_index
+
+
+def backfill_segment(table, segment: int, total_segments: int, dry_run: bool) -> int:
+    """Re-key one parallel-scan segment's models; returns records updated"""
+    updated = 0
+    for item in iter_scan(
+        table,
+        attributes=["PK", "SK", "model_id", "status", "auto_adjust_weights",
+                    "active_model_pk", "active_model_sk"],
+        Segment=segment,
+        TotalSegments=total_segments,
+        FilterExpression="begins_with(SK, :prefix)",
+        ExpressionAttributeValues={":prefix": "MODEL#"},
+    ):
+        keys = active_model_index(
+            item["model_id"], item.get("status", "active"), bool(item.get("auto_adjust_weights"))
+        )
+        current = {k: item[k] for k in ("active_model_pk", "active_model_sk") if k in item}
+        if keys == current:
+            continue
+
+        if not dry_run:
+            try:
+                if keys:
+                    table.update_item(
+                        Key={"PK": item["PK"], "SK": item["SK"]},
+                        UpdateExpression="SET active_model_pk = :apk, active_model_sk = :ask",
+                        ExpressionAttributeValues={
+                            ":apk": keys["active_model_pk"],
+                            ":ask": keys["active_model_sk"],
+                        },
+                    )
+                else:
+                    table.update_item(
+                        Key={"PK": item["PK"], "SK": item["SK"]},
+                        UpdateExpression="REMOVE active_model_pk, active_model_sk",
+                    )
+            except Exception as e:
+                print(f"  ❌ Error: {item['PK']}/{item['SK']}: {e}")
+                continue
+        updated += 1
+    return updated
+
+
+def backfill(environment: str, dry_run: bool = True, segments: int = 4):
+    dynamodb = boto3.resource("dynamodb", region_name="us-east-1")
+    prefix = "Dev-" if environment == "dev" else ""
+    table = dynamodb.Table(f"{prefix}UserModels-UserModels")
+
+    print(f"🔍 Scanning {table.name} for models with missing or stale index keys ({segments} segments)...")
+
+    with ThreadPoolExecutor(max_workers=segments) as executor:
+        counts = list(executor.map(
+            lambda segment: backfill_segment(table, segment, segments, dry_run), range(segments)
+        ))
+
+    print(f"\n📊 Models {'to re-key' if dry_run else 're-keyed'}: {sum(counts)}")
+    if dry_run:
+        print("\n⚠️  DRY RUN - No changes made. Run with --execute to apply.")
+    else:
+        print("\n✅ Backfill complete!")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill ActiveModelsIndex keys on user models")
+    parser.add_argument("environment", choices=["dev", "beta", "prod"], help="Environment to backfill")
+    parser.add_argument("--execute", action="store_true", help="Actually write (default is dry run)")
+    parser.add_argument("--segments", type=int, default=4, help="Parallel scan segments")
+
+    args = parser.parse_args()
+    backfill(args.environment, dry_run=not args.execute, segments=args.segments)
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Backfill the per-game analysis index (GameIndex, ANALYSIS_BY_GAME#{game_id}).
+
+Analyses written before AnalysisResult.to_dynamodb_item set game_index_pk are
+invisible to outcome verification, which now finds a game's analyses with one
+GameIndex query. This adds the index keys to existing LATEST and INVERSE records.
+"""
+
+import argparse
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+import boto3
+
+from dao import iter_scan
+from ml.types import analysis_game_index
+
+
+def backfill_segment(table, segment: int, total_segments: int, dry_run: bool) -> int:
+    """Index one parallel-scan segment's unindexed analyses; returns records updated"""
+    updated = 0
+    for item in iter_scan(
+        table,
+        attributes=["pk", "sk", "game_id"],
+        Segment=segment,
+        TotalSegments=total_segments,
+        FilterExpression="begins_with(pk, :prefix) AND attribute_exists(game_id) "
+                         "AND attribute_not_exists(game_index_pk) "
+                         "AND (contains(sk, :latest) OR contains(sk, :inverse))",
+        ExpressionAttributeValues={
+            ":prefix": "ANALYSIS#",
+            ":latest": "#LATEST",
+            ":inverse": "#INVERSE",
+        },
+    ):
+        keys = analysis_game_index(item)
+        if not dry_run:
+            try:
+                table.update_item(
+                    Key={"pk": item["pk"], "sk": item["sk"]},
+                    UpdateExpression="SET game_index_pk = :gpk, game_index_sk = :gsk",
+                    ExpressionAttributeValues={
+                        ":gpk": keys["game_index_pk"],
+                        ":gsk": keys["game_index_sk"],
+                    },
+                )
+            except Exception as e:
+                print(f"  ❌ Error: {item['pk']}/{item['sk']}: {e}")
+                continue
+        updated += 1
+        if updated % 1000 == 0:
+            print(f"  Segment {segment}: {updated} analyses so far...")
+    return updated
+
+
+def backfill(environment: str, dry_run: bool = True, segments: int = 4):
+    dynamodb = boto3.resource("dynamodb", region_name="us-east-1")
+    table = dynamodb.Table(f"carpool-bets-v2-{environment}")
+
+    print(f"🔍 Scanning {environment} for analyses missing the per-game index ({segments} segments)...")
+
+    with ThreadPoolExecutor(max_workers=segments) as executor:
+        counts = list(executor.map(
+            lambda segment: backfill_segment(table, segment, segments, dry_run), range(segments)
+        ))
+
+    print(f"\n📊 Analyses {'to index' if dry_run else 'indexed'}: {sum(counts)}")
+    if dry_run:
+        print("\n⚠️  DRY RUN - No changes made. Run with --execute to apply.")
+    else:
+        print("\n✅ Backfill complete!")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill ANALYSIS_BY_GAME GameIndex keys")
+    parser.add_argument("environment", choices=["dev", "beta", "prod"], help="Environment to backfill")
+    parser.add_argument("--execute", action="store_true", help="Actually write (default is dry run)")
+    parser.add_argument("--segments", type=int, default=4, help="Parallel scan segments")
+
+    args = parser.parse_args()
+    backfill(args.environment, dry_run=not args.execute, segments=args.segments)